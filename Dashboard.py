@@ -1,26 +1,32 @@
 # dashboard_defense_israel_avance.py
-import streamlit as st
-import pandas as pd
 import numpy as np
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from functools import partial
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse Stratégique Avancée - Israël",
-    page_icon="🇮🇱",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+from data_cache import DATA_CACHE
+from defense_core import DefenseIsraelModel
+from downsampling import PIXEL_BUDGET, downsample
+from figure_cache import FIGURE_CACHE
+from figure_diff import FigureLedger, enable_reference_cache
+from geospatial import MAILLES_KM, PAS_KM, range_circle, sites_fingerprint
+from instrumentation import METRICS_FILE_ENV, Instrumentation, instrument_methods
+from live_feed import EVENT_TYPES, LIVE_FEED_ENV, get_feed
+from rendering import SECTION_STORE, SectionRenderer, live_slots, section_timeout, shared_executor, st
+from scenario_engine import SCENARIO_PAR_DEFAUT, SCENARIOS, SERIES_SCENARIO
+from simulation_engine import FREQUENCES, HORIZON_PAR_DEFAUT, MODEL_VERSION
+from snapshot_bundle import get_bundle
+from templates import card
 
 # CSS personnalisé avancé
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -92,369 +98,75 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-class DefenseIsraelDashboardAvance:
-    def __init__(self):
-        self.branches_options = self.define_branches_options()
-        self.programmes_options = self.define_programmes_options()
-        self.military_capabilities = self.define_military_capabilities()
-        self.alliance_projects = self.define_alliance_projects()
-        
-    def define_branches_options(self):
-        return [
-            "Israël - Vue d'Ensemble", "Forces de Défense Israéliennes (Tsahal)", 
-            "Force Aérienne Israélienne", "Forces Terrestres", 
-            "Marine Israélienne", "Renseignement Militaire (Aman)",
-            "Alliances Stratégiques", "Coopérations Sécuritaires"
-        ]
-    
-    def define_programmes_options(self):
-        return [
-            "Défense Anti-Missile (Dôme de Fer)", "Supériorité Aérienne", 
-            "Renseignement Électronique", "Guerre Cyber Offensive",
-            "Forces Spéciales", "Armement de Précision",
-            "Coopération Régionale"
-        ]
-    
-    def define_military_capabilities(self):
-        return {
-            "Forces de Défense Israéliennes (Tsahal)": {
-                "budget": 24.3,
-                "personnel": 646.5,
-                "reservistes": 465,
-                "divisions": 12,
-                "equipements": "Merkava IV, Namer, Spike Missiles",
-                "technologies": "Systèmes C4I, Drones, IA militaire"
-            },
-            "Force Aérienne Israélienne": {
-                "budget": 8.7,
-                "personnel": 34,
-                "avions_combat": 362,
-                "helicopteres": 125,
-                "drones": 250,
-                "equipements": "F-35I Adir, F-16I Sufa, F-15I Ra'am",
-                "technologies": "Systèmes EW avancés, Cyber-défense aérienne"
-            },
-            "Forces Terrestres": {
-                "budget": 6.2,
-                "personnel": 133,
-                "chars": 2600,
-                "vehicules_blindes": 10000,
-                "artillerie": 600,
-                "equipements": "Chars Merkava, VCI Namer, Artillerie autonome",
-                "technologies": "Systèmes de combat numériques, Drones tactiques"
-            },
-            "Marine Israélienne": {
-                "budget": 2.8,
-                "personnel": 9.5,
-                "corvettes": 7,
-                "sous_marins": 6,
-                "patrouilleurs": 45,
-                "equipements": "Classe Sa'ar 6, Classe Dolphin",
-                "technologies": "Missiles navals Gabriel, Systèmes anti-missiles"
-            },
-            "Renseignement Militaire (Aman)": {
-                "budget": 4.5,
-                "personnel": 7,
-                "capacites": "SIGINT, IMINT, HUMINT, CYBINT",
-                "unites": "Unit 8200, Unit 504, Yaman",
-                "technologies": "Cyber-renseignement, IA analytique"
-            }
-        }
-    
-    def define_alliance_projects(self):
-        return {
-            "Coopération USA-Israël": {"pays": "États-Unis", "type": "Soutien militaire", "statut": "Actif", "financement": "3.8 Md$/an"},
-            "Dôme de Fer": {"pays": "Israël/USA", "type": "Défense anti-missile", "statut": "Opérationnel", "interceptions": "90%+"},
-            "Arrow System": {"pays": "Israël/USA", "type": "Defense missile balistique", "statut": "Opérationnel", "portee": "Haute altitude"},
-            "Exercice Juniper Cobra": {"pays": "USA/Israël", "type": "Exercice conjoint", "statut": "Biannuel", "effectifs": "5000+"},
-            "Accords d'Abraham": {"pays": "EAU/Bahreïn/Maroc/Soudan", "type": "Normalisation", "statut": "Actif", "domaines": "Sécurité, Économie"},
-            "Coopération Grèce-Chypre": {"pays": "Grèce/Chypre", "type": "Partage gaz/security", "statut": "Renforcement", "exercices": "Trident"}
-        }
-    
-    def generate_advanced_data(self, selection):
-        """Génère des données avancées et détaillées pour Israël"""
-        annees = list(range(2000, 2028))
-        
-        config = self.get_advanced_config(selection)
-        
-        data = {
-            'Annee': annees,
-            'Budget_Defense_Mds': self.simulate_advanced_budget(annees, config),
-            'Personnel_Milliers': self.simulate_advanced_personnel(annees, config),
-            'PIB_Militaire_Pourcent': self.simulate_military_gdp_percentage(annees),
-            'Exercices_Militaires': self.simulate_advanced_exercises(annees, config),
-            'Readiness_Operative': self.simulate_advanced_readiness(annees),
-            'Capacite_Dissuasion': self.simulate_advanced_deterrence(annees),
-            'Temps_Mobilisation_Jours': self.simulate_advanced_mobilization(annees),
-            'Exercices_Conjoints': self.simulate_joint_exercises(annees),
-            'Developpement_Technologique': self.simulate_tech_development(annees),
-            'Capacite_Aerienne': self.simulate_air_capacity(annees),
-            'Couverture_AD': self.simulate_air_defense_coverage(annees),
-            'Cooperation_Alliances': self.simulate_alliance_cooperation(annees),
-            'Cyber_Capabilities': self.simulate_cyber_capabilities(annees),
-            'Production_Armements': self.simulate_weapon_production(annees)
-        }
-        
-        # Données spécifiques aux programmes
-        if 'defense_missile' in config.get('priorites', []):
-            data.update({
-                'Interceptions_Dome_Fer': self.simulate_iron_dome_interceptions(annees),
-                'Couverture_Defense_Missile': self.simulate_missile_defense_coverage(annees),
-                'Systemes_AD_Deployes': self.simulate_ad_systems(annees)
-            })
-        
-        if 'renseignement' in config.get('priorites', []):
-            data.update({
-                'Capacites_SIGINT': self.simulate_sigint_capabilities(annees),
-                'Operations_Cyber': self.simulate_cyber_operations(annees),
-                'Alertes_Prevention': self.simulate_early_warning(annees)
-            })
-        
-        if 'innovation' in config.get('priorites', []):
-            data.update({
-                'Recherche_Defense': self.simulate_defense_research(annees),
-                'Technologies_Emergentes': self.simulate_emerging_tech(annees),
-                'Exportations_Armes': self.simulate_weapon_exports(annees)
-            })
-        
-        if 'alliances' in config.get('priorites', []):
-            data.update({
-                'Exercices_USA': self.simulate_us_exercises(annees),
-                'Partenariats_Strategiques': self.simulate_strategic_partnerships(annees),
-                'Cooperation_Regionale': self.simulate_regional_cooperation(annees)
-            })
-        
-        return pd.DataFrame(data), config
-    
-    def get_advanced_config(self, selection):
-        """Configuration avancée avec plus de détails pour Israël"""
-        configs = {
-            "Israël - Vue d'Ensemble": {
-                "type": "puissance_regionale_avancee",
-                "budget_base": 24.3,
-                "personnel_base": 646.5,
-                "exercices_base": 85,
-                "priorites": ["defense_missile", "renseignement", "innovation", "cyber", "alliances", "precision"],
-                "doctrines": ["Dissuasion qualitative", "Défense active", "Frappe préemptive"],
-                "objectifs": "Maintien de l'avantage qualitatif et sécurité nationale"
-            },
-            "Force Aérienne Israélienne": {
-                "type": "suprematie_aerienne_regionale",
-                "budget_base": 8.7,
-                "personnel_base": 34,
-                "priorites": ["avions_5e_gen", "drones", "cyber_aerien", "renseignement"],
-                "capacites": ["F-35I Adir, F-16I Sufa", "Flotte de drones avancés", "Guerre électronique"],
-                "doctrine": "Qualitative Military Edge"
-            },
-            "Renseignement Militaire (Aman)": {
-                "type": "excellence_renseignement",
-                "budget_base": 4.5,
-                "personnel_base": 7,
-                "priorites": ["cyberint", "sigint", "humint", "analyse_ia"],
-                "capacites": ["Unit 8200", "Cyber-renseignement", "Surveillance régionale"],
-                "doctrine": "Prévention et anticipation"
-            },
-            "Alliances Stratégiques": {
-                "type": "cooperation_internationale",
-                "budget_base": 3.8,
-                "priorites": ["cooperation_usa", "normalisation_arabe", "partenariats_technologiques"],
-                "projets": ["Dôme de Fer", "Arrow System", "Exercices conjoints"],
-                "objectifs": "Renforcement des alliances stratégiques"
-            }
-        }
-        
-        return configs.get(selection, {
-            "type": "branche_militaire",
-            "personnel_base": 100,
-            "exercices_base": 20,
-            "priorites": ["defense_generique"]
-        })
-    
-    def simulate_advanced_budget(self, annees, config):
-        """Simulation avancée du budget avec variations géopolitiques"""
-        budget_base = config.get('budget_base', 24.3)
-        budgets = []
-        for annee in annees:
-            base = budget_base * (1 + 0.035 * (annee - 2000))
-            # Variations selon événements géopolitiques
-            if 2000 <= annee <= 2005:  # Seconde Intifada
-                base *= 1.15
-            elif 2006 <= annee <= 2007:  # Guerre du Liban
-                base *= 1.20
-            elif 2008 <= annee <= 2009:  # Opération Plomb Durci
-                base *= 1.18
-            elif 2012 <= annee <= 2014:  # Opérations diverses
-                base *= 1.12
-            elif annee >= 2020:  # Normalisation et nouvelles menaces
-                base *= 1.25
-            budgets.append(base)
-        return budgets
-    
-    def simulate_advanced_personnel(self, annees, config):
-        """Simulation avancée des effectifs"""
-        personnel_base = config.get('personnel_base', 646.5)
-        return [personnel_base * (1 + 0.008 * (annee - 2000)) for annee in annees]
-    
-    def simulate_military_gdp_percentage(self, annees):
-        """Pourcentage du PIB consacré à la défense"""
-        return [6.5 + 0.05 * (annee - 2000) for annee in annees]
-    
-    def simulate_advanced_exercises(self, annees, config):
-        """Exercices militaires avec saisonnalité"""
-        base = config.get('exercices_base', 85)
-        return [base + 3 * (annee - 2000) + 5 * np.sin(2 * np.pi * (annee - 2000)/4) for annee in annees]
-    
-    def simulate_advanced_readiness(self, annees):
-        """Préparation opérationnelle avancée"""
-        readiness = []
-        for annee in annees:
-            base = 92  # Départ très élevé
-            if annee >= 2006:  # Post-guerre du Liban
-                base += 3
-            if annee >= 2014:  # Expérience Gaza
-                base += 2
-            if annee >= 2020:  # Nouvelles doctrines
-                base += 3
-            readiness.append(min(base, 98))
-        return readiness
-    
-    def simulate_advanced_deterrence(self, annees):
-        """Capacité de dissuasion avancée"""
-        deterrence = []
-        for annee in annees:
-            base = 88  # Départ élevé
-            if annee >= 2007:
-                base += 3  # Frappe syrienne
-            if annee >= 2010:
-                base += 4  # Cyber capacités
-            if annee >= 2020:
-                base += 3  # F-35 et nouvelles capacités
-            deterrence.append(min(base, 95))
-        return deterrence
-    
-    def simulate_advanced_mobilization(self, annees):
-        """Temps de mobilisation avancé"""
-        return [max(48 - 1.2 * (annee - 2000), 24) for annee in annees]
-    
-    def simulate_joint_exercises(self, annees):
-        """Exercices conjoints avec alliés"""
-        exercises = []
-        for annee in annees:
-            if annee < 2005:
-                exercises.append(15)
-            elif annee < 2010:
-                exercises.append(25 + (annee - 2005))
-            else:
-                exercises.append(35 + 2 * (annee - 2010))
-        return exercises
-    
-    def simulate_tech_development(self, annees):
-        """Développement technologique global"""
-        return [min(85 + 1.8 * (annee - 2000), 96) for annee in annees]
-    
-    def simulate_air_capacity(self, annees):
-        """Capacité aérienne globale"""
-        return [min(90 + 1.2 * (annee - 2000), 97) for annee in annees]
-    
-    def simulate_air_defense_coverage(self, annees):
-        """Couverture de défense anti-aérienne"""
-        return [min(75 + 2.0 * (annee - 2000), 95) for annee in annees]
-    
-    def simulate_alliance_cooperation(self, annees):
-        """Coopération avec alliances"""
-        return [min(70 + 1.5 * (annee - 2000), 90) for annee in annees]
-    
-    def simulate_cyber_capabilities(self, annees):
-        """Capacités cybernétiques"""
-        return [min(90 + 1.5 * (annee - 2000), 98) for annee in annees]
-    
-    def simulate_weapon_production(self, annees):
-        """Production d'armements (indice)"""
-        return [min(75 + 1.8 * (annee - 2000), 92) for annee in annees]
-    
-    def simulate_us_exercises(self, annees):
-        """Exercices avec USA"""
-        return [min(20 + 1.5 * (annee - 2000), 45) for annee in annees]
-    
-    def simulate_strategic_partnerships(self, annees):
-        """Partenariats stratégiques"""
-        return [min(50 + 2.0 * (annee - 2000), 85) for annee in annees]
-    
-    def simulate_regional_cooperation(self, annees):
-        """Coopération régionale"""
-        return [min(20 + 3.0 * (annee - 2020), 65) for annee in annees if annee >= 2020] + [10] * (2020 - min(annees))
-    
-    def simulate_iron_dome_interceptions(self, annees):
-        """Taux d'interception Dôme de Fer"""
-        return [min(75 + 2.5 * (annee - 2011), 95) for annee in annees if annee >= 2011] + [0] * (2011 - min(annees))
-    
-    def simulate_missile_defense_coverage(self, annees):
-        """Couverture défense missile"""
-        return [min(60 + 2.0 * (annee - 2000), 90) for annee in annees]
-    
-    def simulate_ad_systems(self, annees):
-        """Systèmes de défense anti-missile déployés"""
-        return [min(5 + 0.8 * (annee - 2000), 25) for annee in annees]
-    
-    def simulate_sigint_capabilities(self, annees):
-        """Capacités SIGINT"""
-        return [min(85 + 1.5 * (annee - 2000), 96) for annee in annees]
-    
-    def simulate_cyber_operations(self, annees):
-        """Opérations cyber offensives"""
-        return [min(80 + 2.0 * (annee - 2000), 95) for annee in annees]
-    
-    def simulate_early_warning(self, annees):
-        """Alertes précoces réussies"""
-        return [min(75 + 1.5 * (annee - 2000), 92) for annee in annees]
-    
-    def simulate_defense_research(self, annees):
-        """Recherche défense"""
-        return [min(88 + 1.2 * (annee - 2000), 96) for annee in annees]
-    
-    def simulate_emerging_tech(self, annees):
-        """Technologies émergentes"""
-        return [min(85 + 1.8 * (annee - 2000), 95) for annee in annees]
+
+def configure_page():
+    """Configuration de la page et CSS, appliqués au lancement (pas à l'import)"""
+    st.set_page_config(
+        page_title="Analyse Stratégique Avancée - Israël",
+        page_icon="🇮🇱",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    # Graphiques inchangés réémis par référence, même sous 10 Ko (une fois par processus)
+    enable_reference_cache()
+
+
+# Contrôles sans effet sur le contenu des sections (exclus de la clé partagée)
+UI_CONTROLS = {'lazy_tabs', 'show_performance', 'live_source', 'live_cadence'}
+
+
+def normalize_controls(controls):
+    """Clé canonique d'un état de sidebar : contrôles de contenu, triés"""
+    return tuple(sorted((cle, valeur) for cle, valeur in controls.items() if cle not in UI_CONTROLS))
+
+
+@instrument_methods(create_='section', display_='section')
+class DefenseIsraelDashboardAvance(DefenseIsraelModel):
+    """Interface Streamlit du dashboard, construite sur le noyau de simulation"""
     
-    def simulate_weapon_exports(self, annees):
-        """Exportations d'armes (milliards USD)"""
-        return [min(3 + 0.5 * (annee - 2000), 12.5) for annee in annees]
+    def __init__(self, data_source=None, snapshot=True):
+        super().__init__(data_source)
+        # Bundle précalculé servi au démarrage à froid, s'il est à jour
+        if snapshot:
+            self.snapshot = get_bundle(self.data_source)
     
-    def display_advanced_header(self):
+    def display_advanced_header(self, debut=2000, fin=2027):
         """En-tête avancé avec plus d'informations"""
         st.markdown('<h1 class="main-header">🇮🇱 ANALYSE STRATÉGIQUE AVANCÉE - ISRAËL</h1>', 
                    unsafe_allow_html=True)
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.markdown("""
+            st.markdown(card("""
             <div style='text-align: center; background: linear-gradient(135deg, #0038B8, #FFFFFF, #0038B8); 
             padding: 1rem; border-radius: 10px; color: #0038B8; margin: 1rem 0;'>
             <h3>🛡️ TSVAH - EXCELLENCE MILITAIRE ET TECHNOLOGIQUE</h3>
-            <p><strong>Analyse multidimensionnelle des capacités de défense et de la stratégie régionale (2000-2027)</strong></p>
+            <p><strong>Analyse multidimensionnelle des capacités de défense et de la stratégie régionale ({}-{})</strong></p>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(debut, fin), unsafe_allow_html=True)
+    
+    def define_analysis_modes(self):
+        """Modes d'analyse : libellé du sélecteur (``None`` si fixe) et sélections proposées"""
+        return {
+            "Vue d'Ensemble Israël": ("Niveau d'analyse:", self.branches_options),
+            "Analyse par Branche": ("Branche militaire:", ["Forces de Défense Israéliennes (Tsahal)", "Force Aérienne Israélienne", "Forces Terrestres", "Marine Israélienne", "Renseignement Militaire (Aman)"]),
+            "Alliances Stratégiques": ("Programme stratégique:", self.programmes_options),
+            "Scénarios Sécuritaires": (None, ["Scénarios Sécuritaires"]),
+        }
     
     def create_advanced_sidebar(self):
         """Sidebar avancé avec plus d'options"""
         st.sidebar.markdown("## 🎛️ PANEL DE CONTRÔLE AVANCÉ")
         
         # Sélection du type d'analyse
-        type_analyse = st.sidebar.radio(
-            "Mode d'analyse:",
-            ["Vue d'Ensemble Israël", "Analyse par Branche", "Alliances Stratégiques", "Scénarios Sécuritaires"]
-        )
+        modes = self.define_analysis_modes()
+        type_analyse = st.sidebar.radio("Mode d'analyse:", list(modes))
         
-        if type_analyse == "Vue d'Ensemble Israël":
-            selection = st.sidebar.selectbox("Niveau d'analyse:", self.branches_options)
-        elif type_analyse == "Analyse par Branche":
-            selection = st.sidebar.selectbox("Branche militaire:", ["Forces de Défense Israéliennes (Tsahal)", "Force Aérienne Israélienne", "Forces Terrestres", "Marine Israélienne", "Renseignement Militaire (Aman)"])
-        elif type_analyse == "Alliances Stratégiques":
-            selection = st.sidebar.selectbox("Programme stratégique:", self.programmes_options)
-        else:
-            selection = "Scénarios Sécuritaires"
+        libelle, options = modes[type_analyse]
+        selection = st.sidebar.selectbox(libelle, options) if libelle else options[0]
         
         # Options avancées
         st.sidebar.markdown("### 🔧 OPTIONS AVANCÉES")
@@ -462,10 +174,36 @@ class DefenseIsraelDashboardAvance:
         show_alliances = st.sidebar.checkbox("Analyse des alliances", value=True)
         show_technical = st.sidebar.checkbox("Détails techniques", value=True)
         threat_assessment = st.sidebar.checkbox("Évaluation des menaces", value=True)
+        show_sensitivity = st.sidebar.checkbox("Analyse de sensibilité", value=True,
+                                               help="Perturbations un à la fois et indices de Sobol des paramètres")
+        lazy_tabs = st.sidebar.checkbox("Rendu à la demande (section active)", value=True,
+                                        help="Seule la section affichée est calculée, puis mise en cache")
         
         # Paramètres de simulation
         st.sidebar.markdown("### ⚙️ PARAMÈTRES DE SIMULATION")
-        scenario = st.sidebar.selectbox("Scénario:", ["Statut Quo Sécuritaire", "Conflit Régional Majeur", "Escalade Nord", "Opération Préemptive"])
+        scenario = st.sidebar.selectbox("Scénario:", list(SCENARIOS))
+        horizon = st.sidebar.slider("Horizon:", 2000, 2035, HORIZON_PAR_DEFAUT)
+        frequence = st.sidebar.selectbox("Résolution temporelle:", list(FREQUENCES),
+                                         help="Les graphiques sont réduits à la largeur d'affichage")
+        pas_carte = st.sidebar.selectbox("Maille de la carte des menaces (km):", MAILLES_KM,
+                                         index=MAILLES_KM.index(PAS_KM),
+                                         help="Portées calculées par haversine sur chaque case de la grille")
+        enveloppe_actuelle = round(sum(self.define_response_budgets().values()), 1)
+        enveloppe_reponse = st.sidebar.slider("Enveloppe de réponse (Md$):", 10.0, 40.0, enveloppe_actuelle, 0.1,
+                                              help="Budget réparti entre domaines pour minimiser le risque attendu")
+        
+        # Base des accords : filtres et pagination exécutés par le catalogue SQLite
+        st.sidebar.markdown("### 🤝 BASE DES ACCORDS")
+        filtres_accords, page_accords = self.create_alliance_filters()
+        
+        # Flux temps réel (panneau rafraîchi seul, sans rerun des onglets)
+        st.sidebar.markdown("### 🔴 TEMPS RÉEL")
+        live_source = st.sidebar.text_input("Flux d'événements:", value=os.environ.get(LIVE_FEED_ENV, ''),
+                                            help="tail:journal.jsonl, replay:journal.jsonl@10, tcp://127.0.0.1:9000")
+        live_cadence = st.sidebar.slider("Rafraîchissement (s):", 1, 10, 2)
+        
+        show_performance = st.sidebar.checkbox("⏱️ Performance", value=False,
+                                               help="Temps, mémoire et payload de chaque section du rerun")
         
         return {
             'selection': selection,
@@ -474,7 +212,18 @@ class DefenseIsraelDashboardAvance:
             'show_alliances': show_alliances,
             'show_technical': show_technical,
             'threat_assessment': threat_assessment,
-            'scenario': scenario
+            'show_sensitivity': show_sensitivity,
+            'lazy_tabs': lazy_tabs,
+            'show_performance': show_performance,
+            'scenario': scenario,
+            'horizon': tuple(horizon),
+            'frequence': frequence,
+            'enveloppe_reponse': enveloppe_reponse,
+            'pas_carte': pas_carte,
+            'filtres_accords': filtres_accords,
+            'page_accords': page_accords,
+            'live_source': live_source.strip(),
+            'live_cadence': live_cadence
         }
     
     def display_strategic_metrics(self, df, config):
@@ -482,59 +231,62 @@ class DefenseIsraelDashboardAvance:
         st.markdown('<h3 class="section-header">🎯 TABLEAU DE BORD STRATÉGIQUE ISRAËL</h3>', 
                    unsafe_allow_html=True)
         
-        derniere_annee = df['Annee'].max()
-        data_actuelle = df[df['Annee'] == derniere_annee].iloc[0]
-        data_2000 = df[df['Annee'] == 2000].iloc[0]
+        if config.get('series_observees'):
+            st.caption("📥 Données observées : " + ", ".join(config['series_observees'])
+                       + " (séries restantes simulées)")
+        
+        data_actuelle = df.iloc[-1]
+        data_debut = df.iloc[0]
         
         # Première ligne de métriques
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.markdown("""
+            st.markdown(card("""
             <div class="metric-card">
-                <h4>💰 BUDGET DÉFENSE 2027</h4>
+                <h4>💰 BUDGET DÉFENSE {}</h4>
                 <h2>{:.1f} Md$</h2>
                 <p>📈 {:.1f}% du PIB israélien</p>
             </div>
-            """.format(data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
+            """).render(int(data_actuelle['Annee']), data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
             unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
+            st.markdown(card("""
             <div class="metric-card">
                 <h4>👥 EFFECTIFS TOTAUX</h4>
                 <h2>{:,.0f}K</h2>
                 <p>⚔️ + {:.0f}K réservistes</p>
             </div>
-            """.format(data_actuelle['Personnel_Milliers'], 465), 
+            """).render(data_actuelle['Personnel_Milliers'], 465), 
             unsafe_allow_html=True)
         
         with col3:
-            st.markdown("""
+            st.markdown(card("""
             <div class="idf-card">
                 <h4>🛡️ DÔME DE FER</h4>
                 <h2>{:.1f}%</h2>
                 <p>🚀 Taux d'interception</p>
             </div>
-            """.format(data_actuelle.get('Interceptions_Dome_Fer', 0)), 
+            """).render(data_actuelle.get('Interceptions_Dome_Fer', 0)), 
             unsafe_allow_html=True)
         
         with col4:
-            st.markdown("""
+            st.markdown(card("""
             <div class="alliance-card">
                 <h4>🤝 COOPÉRATION USA</h4>
                 <h2>{:.0f}%</h2>
                 <p>🇺🇸 3.8 Md$/an d'aide militaire</p>
             </div>
-            """.format(data_actuelle['Cooperation_Alliances']), 
+            """).render(data_actuelle['Cooperation_Alliances']), 
             unsafe_allow_html=True)
         
         # Deuxième ligne de métriques
         col5, col6, col7, col8 = st.columns(4)
         
         with col5:
-            reduction_temps = ((data_2000['Temps_Mobilisation_Jours'] - data_actuelle['Temps_Mobilisation_Jours']) / 
-                             data_2000['Temps_Mobilisation_Jours']) * 100
+            reduction_temps = ((data_debut['Temps_Mobilisation_Jours'] - data_actuelle['Temps_Mobilisation_Jours']) / 
+                             data_debut['Temps_Mobilisation_Jours']) * 100
             st.metric(
                 "⏱️ Temps Mobilisation",
                 f"{data_actuelle['Temps_Mobilisation_Jours']:.1f} jours",
@@ -542,8 +294,8 @@ class DefenseIsraelDashboardAvance:
             )
         
         with col6:
-            croissance_aerienne = ((data_actuelle['Capacite_Aerienne'] - data_2000['Capacite_Aerienne']) / 
-                               data_2000['Capacite_Aerienne']) * 100
+            croissance_aerienne = ((data_actuelle['Capacite_Aerienne'] - data_debut['Capacite_Aerienne']) / 
+                               data_debut['Capacite_Aerienne']) * 100
             st.metric(
                 "✈️ Puissance Aérienne",
                 f"{data_actuelle['Capacite_Aerienne']:.1f}%",
@@ -552,8 +304,8 @@ class DefenseIsraelDashboardAvance:
         
         with col7:
             if 'Couverture_Defense_Missile' in df.columns:
-                croissance_defense = ((data_actuelle['Couverture_Defense_Missile'] - data_2000.get('Couverture_Defense_Missile', 60)) / 
-                                   data_2000.get('Couverture_Defense_Missile', 60)) * 100
+                croissance_defense = ((data_actuelle['Couverture_Defense_Missile'] - data_debut.get('Couverture_Defense_Missile', 60)) / 
+                                   data_debut.get('Couverture_Defense_Missile', 60)) * 100
                 st.metric(
                     "🎯 Couverture Anti-Missile",
                     f"{data_actuelle['Couverture_Defense_Missile']:.1f}%",
@@ -564,8 +316,11 @@ class DefenseIsraelDashboardAvance:
             st.metric(
                 "📊 Préparation Opérationnelle",
                 f"{data_actuelle['Readiness_Operative']:.1f}%",
-                f"+{(data_actuelle['Readiness_Operative'] - data_2000['Readiness_Operative']):.1f}%"
+                f"+{(data_actuelle['Readiness_Operative'] - data_debut['Readiness_Operative']):.1f}%"
             )
+        
+        # Indicateurs du flux temps réel (rafraîchis seuls, hors cache)
+        st.live_slot('metriques')
     
     def create_comprehensive_analysis(self, df, config):
         """Analyse complète multidimensionnelle"""
@@ -585,15 +340,16 @@ class DefenseIsraelDashboardAvance:
             
             for i, (cap, nom, couleur) in enumerate(zip(capacites, noms, couleurs)):
                 if cap in df.columns:
+                    x, y = downsample(df['Annee'], df[cap], PIXEL_BUDGET)
                     fig.add_trace(go.Scatter(
-                        x=df['Annee'], y=df[cap],
+                        x=x, y=y,
                         mode='lines', name=nom,
                         line=dict(color=couleur, width=4),
                         hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>"
                     ))
             
             fig.update_layout(
-                title="📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES ISRAËL (2000-2027)",
+                title=f"📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES ISRAËL ({int(df['Annee'].iloc[0])}-{int(df['Annee'].iloc[-1])})",
                 xaxis_title="Année",
                 yaxis_title="Niveau de Capacité (%)",
                 height=500,
@@ -601,6 +357,8 @@ class DefenseIsraelDashboardAvance:
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
             )
             st.plotly_chart(fig, use_container_width=True)
+            # Tendances du flux temps réel sous la courbe annuelle
+            st.live_slot('tendance')
         
         with col2:
             # Analyse des capacités technologiques
@@ -623,8 +381,9 @@ class DefenseIsraelDashboardAvance:
                 fig = make_subplots(specs=[[{"secondary_y": True}]])
                 
                 for i, (data, nom) in enumerate(zip(tech_data, tech_names)):
+                    x, y = downsample(df['Annee'], data, PIXEL_BUDGET)
                     fig.add_trace(
-                        go.Scatter(x=df['Annee'], y=data, name=nom,
+                        go.Scatter(x=x, y=y, name=nom,
                                  line=dict(width=4)),
                         secondary_y=(i > 0)
                     )
@@ -635,8 +394,38 @@ class DefenseIsraelDashboardAvance:
                     template="plotly_white"
                 )
                 st.plotly_chart(fig, use_container_width=True)
+        
+        # Projections Monte Carlo du scénario sélectionné (fan charts)
+        scenario = config.get('scenario', SCENARIO_PAR_DEFAUT)
+        # Bandes calculées directement à la résolution d'affichage
+        bands = self.generate_scenario_bands(df, config, max_points=PIXEL_BUDGET)
+        
+        fig = make_subplots(rows=2, cols=2, subplot_titles=list(SERIES_SCENARIO.values()))
+        for k, serie in enumerate(SERIES_SCENARIO):
+            row, col = k // 2 + 1, k % 2 + 1
+            fig.add_trace(go.Scatter(x=bands['Annee'], y=bands[f'{serie}_P95'],
+                                     line=dict(width=0), showlegend=False, hoverinfo='skip'),
+                          row=row, col=col)
+            fig.add_trace(go.Scatter(x=bands['Annee'], y=bands[f'{serie}_P5'],
+                                     fill='tonexty', fillcolor='rgba(0, 56, 184, 0.2)',
+                                     line=dict(width=0), name='Intervalle P5-P95',
+                                     legendgroup='bande', showlegend=(k == 0)),
+                          row=row, col=col)
+            fig.add_trace(go.Scatter(x=bands['Annee'], y=bands[f'{serie}_P50'],
+                                     line=dict(color='#0038B8', width=3), name='Médiane (P50)',
+                                     legendgroup='mediane', showlegend=(k == 0)),
+                          row=row, col=col)
+        
+        fig.update_layout(
+            title=f"🎲 PROJECTIONS MONTE CARLO - {scenario.upper()} "
+                  f"({self.scenario_engine.n_trajectories:,} trajectoires)",
+            height=650,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.05, xanchor="right", x=1)
+        )
+        st.plotly_chart(fig, use_container_width=True)
     
-    def create_regional_analysis(self, df, config):
+    def create_regional_analysis(self, df, config, pas_km=PAS_KM):
         """Analyse régionale avancée"""
         st.markdown('<h3 class="section-header">🌍 ENVIRONNEMENT RÉGIONAL ISRAËL</h3>', 
                    unsafe_allow_html=True)
@@ -645,7 +434,7 @@ class DefenseIsraelDashboardAvance:
         
         with col1:
             # Architecture sécuritaire régionale
-            st.markdown("""
+            st.markdown(card("""
             <div class="idf-card">
                 <h4>🏛️ ARCHITECTURE SÉCURITAIRE RÉGIONALE</h4>
                 <p><strong>Alliances:</strong> Soutien américain inconditionnel, Accords d'Abraham</p>
@@ -653,10 +442,10 @@ class DefenseIsraelDashboardAvance:
                 <p><strong>Défenses:</strong> Dôme de Fer, Arrow, David's Sling, Barrière souterraine</p>
                 <p><strong>Stratégie:</strong> Dissuasion qualitative, frappes préemptives, défense active</p>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
             
             # Analyse des relations régionales
-            st.markdown("""
+            st.markdown(card("""
             <div class="alliance-card">
                 <h4>🌐 DYNAMIQUES RÉGIONALES</h4>
                 <p><strong>Alliés:</strong> USA, Émirats Arabes Unis, Bahreïn, Grèce, Chypre</p>
@@ -664,41 +453,71 @@ class DefenseIsraelDashboardAvance:
                 <p><strong>Neutres/Complexes:</strong> Jordanie, Égypte, Arabie Saoudite</p>
                 <p><strong>Organisations:</strong> MENA, coopération gazière Est-Méditerranée</p>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
         
         with col2:
             # Cartographie des menaces
-            threats_data = {
-                'Menace': ['Iran Nucléaire', 'Hezbollah (Roquettes)', 'Hamas (Gaza)', 
-                          'Syrie (Conventionnel)', 'Cyber Attaques', 'Terrorisme'],
-                'Distance_km': [1000, 120, 60, 70, 0, 0],
-                'Capacite_Ennemie': [9, 8, 7, 6, 9, 6],
-                'Niveau_Alerte': [9, 8, 7, 5, 8, 6]
-            }
-            threats_df = pd.DataFrame(threats_data)
+            threats = self.registry['menaces_regionales']
+            layout = dict(title="🎯 CARTOGRAPHIE DES MENACES RÉGIONALES", height=400)
             
-            fig = px.scatter(threats_df, x='Distance_km', y='Capacite_Ennemie',
-                           size='Niveau_Alerte', color='Menace',
-                           title="🎯 CARTOGRAPHIE DES MENACES RÉGIONALES",
-                           size_max=30)
-            fig.update_layout(height=400)
+            def build_threat_map():
+                threats_df = threats.frame()
+                fig = px.scatter(threats_df, x='Distance_km', y='Capacite_Ennemie',
+                               size='Niveau_Alerte', color='Menace',
+                               size_max=30)
+                return fig.update_layout(**layout)
+            
+            fig = FIGURE_CACHE.get_or_build('regional.threat_map', threats.digest, layout, build_threat_map)
             st.plotly_chart(fig, use_container_width=True)
             
             # Systèmes de défense
-            defense_data = {
-                'Système': ['Dôme de Fer', 'Arrow 2/3', "David's Sling", 'Barrière Gaza', 'Barrière Liban'],
-                'Portée_km': [70, 100, 300, 0, 0],
-                'Taux_Interception': [90, 90, 90, 95, 95],
-                'Année_Déploiement': [2011, 2000, 2017, 2021, 2018]
-            }
-            defense_df = pd.DataFrame(defense_data)
+            defense_systems = self.registry['systemes_defense']
+            layout = dict(title="🛡️ SYSTÈMES DE DÉFENSE ISRAÉLIENS", height=300)
+            
+            def build_defense_systems():
+                defense_df = defense_systems.frame()
+                fig = px.bar(defense_df, x='Système', y='Taux_Interception',
+                            color='Taux_Interception',
+                            color_continuous_scale='blues')
+                return fig.update_layout(**layout)
             
-            fig = px.bar(defense_df, x='Système', y='Taux_Interception',
-                        title="🛡️ SYSTÈMES DE DÉFENSE ISRAÉLIENS",
-                        color='Taux_Interception',
-                        color_continuous_scale='blues')
-            fig.update_layout(height=300)
+            fig = FIGURE_CACHE.get_or_build('regional.defense_systems', defense_systems.digest, layout, build_defense_systems)
             st.plotly_chart(fig, use_container_width=True)
+        
+        self.create_threat_coverage_map(pas_km)
+    
+    def create_threat_coverage_map(self, pas_km=PAS_KM):
+        """Carte de couverture : batteries superposées aux portées des menaces"""
+        couverture = self.simulate_threat_coverage(pas_km)
+        lat_min, lat_max, lon_min, lon_max = couverture['zone']
+        # Grille propre à la maille et au fichier de sites : figure construite au rendu, hors FIGURE_CACHE
+        fig = go.Figure(go.Heatmap(z=couverture['defense'], x=couverture['longitudes'],
+                                   y=couverture['latitudes'], colorscale='Blues',
+                                   colorbar=dict(title='Batteries'), name='Couverture'))
+        # Un contour de portée par menace (cercles séparés par None)
+        lancements = couverture['lancements']
+        for menace, sites in lancements.groupby('Groupe', sort=False):
+            lats, lons = [], []
+            for _, site in sites.iterrows():
+                cercle = range_circle(site['Latitude'], site['Longitude'], site['Portée_km'])
+                lats.extend([*cercle[0], None])
+                lons.extend([*cercle[1], None])
+            fig.add_trace(go.Scatter(x=lons, y=lats, mode='lines', name=menace,
+                                     line=dict(dash='dash', width=2)))
+        defenses = couverture['defenses']
+        fig.add_trace(go.Scatter(x=defenses['Longitude'], y=defenses['Latitude'], mode='markers',
+                                 text=defenses['Site'] + ' • ' + defenses['Groupe'], name='Batteries',
+                                 marker=dict(symbol='triangle-up', size=9, color='#ff7f0e')))
+        fig.update_layout(title="🗺️ COUVERTURE DÉFENSIVE ET PORTÉE DES MENACES", height=600,
+                          xaxis=dict(title='Longitude', range=[lon_min, lon_max]),
+                          yaxis=dict(title='Latitude', range=[lat_min, lat_max], scaleanchor='x',
+                                     scaleratio=1 / np.cos(np.radians((lat_min + lat_max) / 2))))
+        st.plotly_chart(fig, use_container_width=True)
+        
+        recouvrement = couverture['recouvrement']
+        st.dataframe(recouvrement.round(1), use_container_width=True, hide_index=True)
+        st.caption(f"{couverture['cellules']:,} cases de {pas_km:g} km × {couverture['sites']:,} sites, "
+                   f"couverture calculée en {couverture['duree_ms']:.0f} ms")
     
     def create_branch_analysis(self, df, config):
         """Analyse des capacités par branche"""
@@ -709,28 +528,22 @@ class DefenseIsraelDashboardAvance:
         
         with col1:
             # Contributions des branches
-            contributions_data = []
-            for branche, data in self.military_capabilities.items():
-                contributions_data.append({
-                    'Branche': branche,
-                    'Budget (Md$)': data['budget'],
-                    'Personnel (K)': data['personnel'],
-                    'Équipements Principaux': data.get('equipements', 'Non spécifié'),
-                    'Technologies': data.get('technologies', 'Non spécifié')
-                })
+            capacites = self.military_capabilities
+            layout = dict(title="💰 RÉPARTITION BUDGÉTAIRE PAR BRANCHE", height=400)
             
-            contributions_df = pd.DataFrame(contributions_data)
+            def build_branch_budget():
+                contributions_df = capacites.frame().rename(columns={'branche': 'Branche', 'budget': 'Budget (Md$)'})
+                fig = px.bar(contributions_df, x='Branche', y='Budget (Md$)',
+                            color='Budget (Md$)',
+                            color_continuous_scale='blues')
+                return fig.update_layout(**layout)
             
-            fig = px.bar(contributions_df, x='Branche', y='Budget (Md$)',
-                        title="💰 RÉPARTITION BUDGÉTAIRE PAR BRANCHE",
-                        color='Budget (Md$)',
-                        color_continuous_scale='blues')
-            fig.update_layout(height=400)
+            fig = FIGURE_CACHE.get_or_build('branches.budget', capacites.digest, layout, build_branch_budget)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Spécialisations stratégiques
-            st.markdown("""
+            st.markdown(card("""
             <div class="airforce-card">
                 <h4>🎯 SPÉCIALISATIONS STRATÉGIQUES</h4>
                 <p><strong>Force Aérienne:</strong> Supériorité aérienne régionale, frappes de précision</p>
@@ -739,23 +552,22 @@ class DefenseIsraelDashboardAvance:
                 <p><strong>Marine:</strong> Contrôle gaz offshore, défense côtière, sous-marins stratégiques</p>
                 <p><strong>Forces Spéciales:</strong> Opérations discrètes, contre-terrorisme</p>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
             
             # Avantages comparatifs
-            advantages_data = {
-                'Domaine': ['Renseignement Cyber', 'Force Aérienne', 'Défense Anti-Missile', 
-                           'Forces Spéciales', 'Guerre Électronique', 'Drones', 'Précision'],
-                'Score_Israel': [10, 9, 10, 9, 10, 9, 10],
-                'Score_Voisins': [4, 6, 3, 5, 4, 5, 4]  # Meilleurs voisins
-            }
-            advantages_df = pd.DataFrame(advantages_data)
+            advantages = self.registry['avantages']
+            layout = dict(title="📊 AVANTAGES COMPARATIFS STRATÉGIQUES (0-10)",
+                          barmode='group', height=400)
             
-            fig = go.Figure(data=[
-                go.Bar(name='Israël', x=advantages_df['Domaine'], y=advantages_df['Score_Israel']),
-                go.Bar(name='Meilleurs Voisins', x=advantages_df['Domaine'], y=advantages_df['Score_Voisins'])
-            ])
-            fig.update_layout(title="📊 AVANTAGES COMPARATIFS STRATÉGIQUES (0-10)",
-                             barmode='group', height=400)
+            def build_advantages():
+                advantages_df = advantages.frame()
+                fig = go.Figure(data=[
+                    go.Bar(name='Israël', x=advantages_df['Domaine'], y=advantages_df['Score_Israel']),
+                    go.Bar(name='Meilleurs Voisins', x=advantages_df['Domaine'], y=advantages_df['Score_Voisins'])
+                ])
+                return fig.update_layout(**layout)
+            
+            fig = FIGURE_CACHE.get_or_build('branches.advantages', advantages.digest, layout, build_advantages)
             st.plotly_chart(fig, use_container_width=True)
     
     def create_technical_analysis(self, df, config):
@@ -767,49 +579,44 @@ class DefenseIsraelDashboardAvance:
         
         with col1:
             # Analyse des systèmes d'armes avancés
-            systems_data = {
-                'Système': ['F-35I Adir', 'Dôme de Fer', 'Arrow 3', 'Merkava IV', 
-                           'Classe Sa\'ar 6', 'Système Trophy', 'Eitan APC'],
-                'Portée/Puissance': [2200, 70, 2400, 0, 0, 0, 0],
-                'Branche': ['Air Force', 'Défense', 'Défense', 'Armée', 'Marine', 'Armée', 'Armée'],
-                'Statut': ['Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Développement']
-            }
-            systems_df = pd.DataFrame(systems_data)
+            systems = self.registry['systemes_armes']
+            layout = dict(title="🚀 SYSTÈMES D'ARMES AVANCÉS D'ISRAËL", height=500)
             
-            fig = px.scatter(systems_df, x='Portée/Puissance', y='Branche', 
-                           size='Portée/Puissance', color='Branche',
-                           hover_name='Système',
-                           title="🚀 SYSTÈMES D'ARMES AVANCÉS D'ISRAËL",
-                           size_max=30)
-            fig.update_layout(height=500)
+            def build_weapon_systems():
+                systems_df = systems.frame()
+                fig = px.scatter(systems_df, x='Portée/Puissance', y='Branche', 
+                               size='Portée/Puissance', color='Branche',
+                               hover_name='Système',
+                               size_max=30)
+                return fig.update_layout(**layout)
+            
+            fig = FIGURE_CACHE.get_or_build('technical.weapon_systems', systems.digest, layout, build_weapon_systems)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Analyse de la supériorité technologique
-            superiority_data = {
-                'Domaine': ['Défense Anti-Missile', 'Drones de Combat', 'Guerre Cyber', 
-                          'Renseignement SIGINT', 'Guerre Électronique', 'Armes de Précision'],
-                'Avance_Annees': [15, 10, 8, 12, 10, 8],
-                'Exportations_Mds': [2.5, 1.2, 1.8, 0.9, 0.7, 3.2]
-            }
-            superior_df = pd.DataFrame(superiority_data)
+            superiority = self.registry['superiorite']
+            layout = dict(title="📈 SUPÉRIORITÉ TECHNOLOGIQUE ET EXPORTATIONS",
+                          yaxis2=dict(title='Exportations (Md$)', overlaying='y', side='right'),
+                          height=500)
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Avance (années)', x=superior_df['Domaine'], 
-                                y=superior_df['Avance_Annees'],
-                                marker_color='#0038B8'))
-            fig.add_trace(go.Scatter(name='Exportations (Md$)', x=superior_df['Domaine'], 
-                                   y=superior_df['Exportations_Mds'],
-                                   yaxis='y2', mode='lines+markers',
-                                   line=dict(color='#FFFFFF', width=3)))
+            def build_superiority():
+                superior_df = superiority.frame()
+                fig = go.Figure()
+                fig.add_trace(go.Bar(name='Avance (années)', x=superior_df['Domaine'], 
+                                    y=superior_df['Avance_Annees'],
+                                    marker_color='#0038B8'))
+                fig.add_trace(go.Scatter(name='Exportations (Md$)', x=superior_df['Domaine'], 
+                                       y=superior_df['Exportations_Mds'],
+                                       yaxis='y2', mode='lines+markers',
+                                       line=dict(color='#FFFFFF', width=3)))
+                return fig.update_layout(**layout)
             
-            fig.update_layout(title="📈 SUPÉRIORITÉ TECHNOLOGIQUE ET EXPORTATIONS",
-                             yaxis2=dict(title='Exportations (Md$)', overlaying='y', side='right'),
-                             height=500)
+            fig = FIGURE_CACHE.get_or_build('technical.superiority', superiority.digest, layout, build_superiority)
             st.plotly_chart(fig, use_container_width=True)
             
             # Innovations en cours
-            st.markdown("""
+            st.markdown(card("""
             <div class="alliance-card">
                 <h4>🚀 INNOVATIONS TECHNOLOGIQUES EN COURS</h4>
                 <p><strong>IA Militaire:</strong> Systèmes autonomes, analyse prédictive</p>
@@ -818,7 +625,7 @@ class DefenseIsraelDashboardAvance:
                 <p><strong>Espace:</strong> Satellites Ofek, surveillance régionale</p>
                 <p><strong>Robotique:</strong> Systèmes autonomes de combat</p>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
     
     def create_alliance_analysis(self, config):
         """Analyse des alliances stratégiques"""
@@ -829,27 +636,22 @@ class DefenseIsraelDashboardAvance:
         
         with col1:
             # Réseau d'alliances
-            alliance_data = {
-                'Alliance': ['USA-Israël', 'Accords Abraham (EAU)', 'Accords Abraham (Bahreïn)', 
-                            'Grèce-Israël', 'Chypre-Israël', 'Coopération Jordanienne',
-                            'Coopération Égyptienne', 'Inde-Israël'],
-                'Niveau_Coopération': [10, 7, 6, 8, 8, 6, 5, 8],  # sur 10
-                'Année_Début': [1948, 2020, 2020, 2010, 2010, 1994, 1979, 1992],
-                'Domaines': ['Militaire', 'Économie/Sécurité', 'Économie/Sécurité', 'Énergie/Sécurité', 
-                           'Énergie/Sécurité', 'Sécurité/Eau', 'Sécurité/Gaz', 'Militaire/Techno']
-            }
-            alliance_df = pd.DataFrame(alliance_data)
+            alliances = self.registry['reseau_alliances']
+            layout = dict(title="🌐 RÉSEAU D'ALLIANCES STRATÉGIQUES", height=400)
             
-            fig = px.scatter(alliance_df, x='Année_Début', y='Niveau_Coopération',
-                           size='Niveau_Coopération', color='Domaines',
-                           title="🌐 RÉSEAU D'ALLIANCES STRATÉGIQUES",
-                           size_max=30)
-            fig.update_layout(height=400)
+            def build_alliance_network():
+                alliance_df = alliances.frame()
+                fig = px.scatter(alliance_df, x='Année_Début', y='Niveau_Coopération',
+                               size='Niveau_Coopération', color='Domaines',
+                               size_max=30)
+                return fig.update_layout(**layout)
+            
+            fig = FIGURE_CACHE.get_or_build('alliances.network', alliances.digest, layout, build_alliance_network)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Avantages des alliances
-            st.markdown("""
+            st.markdown(card("""
             <div class="alliance-card">
                 <h4>🏆 AVANTAGES STRATÉGIQUES DES ALLIANCES</h4>
                 <p><strong>Soutien américain:</strong> 3.8 Md$/an d'aide militaire</p>
@@ -858,63 +660,55 @@ class DefenseIsraelDashboardAvance:
                 <p><strong>Exercices conjoints:</strong> Juniper Cobra avec USA</p>
                 <p><strong>Renseignement partagé:</strong> Collaboration Five Eyes étendue</p>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
             
             # Domaines de coopération future
-            future_coop_data = {
-                'Domaine': ['Défense Anti-Missile Régionale', 'Guerre Cyber Collective', 
-                           'Surveillance Spatiale', 'Guerre Électronique',
-                           'Renseignement Artificiel', 'Exercices Conjoints Avancés'],
-                'Potentiel': [8, 9, 7, 8, 9, 8]  # sur 10
-            }
-            future_coop_df = pd.DataFrame(future_coop_data)
+            future_coop = self.registry['cooperation_future']
+            layout = dict(title="🔮 POTENTIEL DE COOPÉRATION FUTURE", height=300)
+            
+            def build_future_cooperation():
+                future_coop_df = future_coop.frame()
+                fig = px.bar(future_coop_df, x='Domaine', y='Potentiel',
+                            color='Potentiel',
+                            color_continuous_scale='blues')
+                return fig.update_layout(**layout)
             
-            fig = px.bar(future_coop_df, x='Domaine', y='Potentiel',
-                        title="🔮 POTENTIEL DE COOPÉRATION FUTURE",
-                        color='Potentiel',
-                        color_continuous_scale='blues')
-            fig.update_layout(height=300)
+            fig = FIGURE_CACHE.get_or_build('alliances.future', future_coop.digest, layout, build_future_cooperation)
             st.plotly_chart(fig, use_container_width=True)
     
-    def create_threat_assessment(self, df, config):
+    def create_threat_assessment(self, df, config, enveloppe=None):
         """Évaluation avancée des menaces"""
         st.markdown('<h3 class="section-header">⚠️ ÉVALUATION STRATÉGIQUE DES MENACES</h3>', 
                    unsafe_allow_html=True)
         
+        # Répartition optimale de l'enveloppe de réponse (préparation et efficacités)
+        # Figures dépendant de l'enveloppe (curseur) : construites au rendu, hors FIGURE_CACHE
+        reponse = self.simulate_threat_response(enveloppe)
+        
         col1, col2 = st.columns(2)
         
         with col1:
             # Matrice des menaces avancées
-            threats_data = {
-                'Type de Menace': ['Iran Nucléaire', 'Hezbollah (Liban)', 'Hamas (Gaza)', 
-                                 'Syrie (Conventionnel)', 'Guerre Cyber Iranienne',
-                                 'Terrorisme Transfrontalier', 'Crise Jérusalem',
-                                 'Prolifération Missiles'],
-                'Probabilité': [0.7, 0.8, 0.9, 0.6, 0.8, 0.7, 0.5, 0.8],
-                'Impact': [0.9, 0.8, 0.7, 0.6, 0.7, 0.6, 0.8, 0.7],
-                'Niveau_Preparation': [0.9, 0.8, 0.9, 0.7, 0.8, 0.9, 0.6, 0.8]
-            }
-            threats_df = pd.DataFrame(threats_data)
-            
+            threats_df = reponse['menaces']
             fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
                            size='Niveau_Preparation', color='Type de Menace',
-                           title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
                            size_max=30)
-            fig.update_layout(height=500)
+            fig.update_layout(title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT", height=500)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Allocation optimale par domaine
+            allocation_df = reponse['allocation']
+            fig = go.Figure(data=[
+                go.Bar(name='Répartition actuelle', x=allocation_df['Domaine'], y=allocation_df['Budget actuel (Md$)']),
+                go.Bar(name='Répartition optimale', x=allocation_df['Domaine'], y=allocation_df['Budget optimal (Md$)'])
+            ])
+            fig.update_layout(title=f"💰 ALLOCATION OPTIMALE ({reponse['enveloppe']:.1f} Md$)",
+                              barmode='group', height=300)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Capacités de réponse par domaine
-            response_data = {
-                'Scénario': ['Frappe Iranienne', 'Attaque Hezbollah', 'Escalade Gaza', 
-                           'Conflit Syrie', 'Cyber Attaque Majeure', 'Crise Multifront'],
-                'Force_Aerienne': [0.9, 0.8, 0.9, 0.8, 0.3, 0.8],
-                'Defense_Anti_Missile': [0.8, 0.9, 0.9, 0.7, 0.2, 0.8],
-                'Cybersécurité': [0.7, 0.6, 0.5, 0.4, 0.9, 0.6],
-                'Forces_Terrestres': [0.4, 0.7, 0.6, 0.5, 0.2, 0.7]
-            }
-            response_df = pd.DataFrame(response_data)
-            
+            response_df = reponse['reponses']
             fig = go.Figure(data=[
                 go.Bar(name='Force Aérienne', x=response_df['Scénario'], y=response_df['Force_Aerienne']),
                 go.Bar(name='Défense Anti-Missile', x=response_df['Scénario'], y=response_df['Defense_Anti_Missile']),
@@ -922,11 +716,15 @@ class DefenseIsraelDashboardAvance:
                 go.Bar(name='Forces Terrestres', x=response_df['Scénario'], y=response_df['Forces_Terrestres'])
             ])
             fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR DOMAINE",
-                             barmode='group', height=500)
+                              barmode='group', height=500)
             st.plotly_chart(fig, use_container_width=True)
+            
+            reduction = 1 - reponse['risque'] / reponse['risque_actuel']
+            st.metric("Risque attendu (répartition optimale)", f"{reponse['risque']:.3f}",
+                      f"{-reduction:.1%} vs répartition actuelle", delta_color="inverse")
         
         # Recommandations stratégiques
-        st.markdown("""
+        st.markdown(card("""
         <div class="alliance-card">
             <h4>🎯 RECOMMANDATIONS STRATÉGIQUES ISRAËL</h4>
             <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -938,98 +736,307 @@ class DefenseIsraelDashboardAvance:
                 <div><strong>• Préparation multifront:</strong> Plans de contingence nord/sud</div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """).render(), unsafe_allow_html=True)
+    
+    def create_sensitivity_analysis(self, df, config):
+        """Sensibilité des métriques de tête aux paramètres de la configuration"""
+        st.markdown('<h3 class="section-header">🎚️ ANALYSE DE SENSIBILITÉ DES PARAMÈTRES</h3>', 
+                   unsafe_allow_html=True)
+        
+        sensibilite = self.simulate_sensitivity(df, config)
+        oat, sobol = sensibilite['oat'], sensibilite['sobol']
+        metriques = list(dict.fromkeys(oat['Métrique']))
+        
+        # Figures propres à la configuration : construites au rendu, hors FIGURE_CACHE
+        # Tornado : écart de chaque métrique pour un paramètre à -20 % / +20 %
+        fig = make_subplots(rows=2, cols=2, subplot_titles=metriques, horizontal_spacing=0.2)
+        for i, metrique in enumerate(metriques):
+            lignes = oat[oat['Métrique'] == metrique]
+            lignes = lignes.assign(Amplitude=(lignes['Haut'] - lignes['Bas']).abs())
+            lignes = lignes[lignes['Amplitude'] > 1e-9].sort_values('Amplitude')
+            position = dict(row=i // 2 + 1, col=i % 2 + 1)
+            fig.add_trace(go.Bar(name='-20 %', y=lignes['Paramètre'], x=lignes['Bas'],
+                                 orientation='h', marker_color='#d62728'), **position)
+            fig.add_trace(go.Bar(name='+20 %', y=lignes['Paramètre'], x=lignes['Haut'],
+                                 orientation='h', marker_color='#0038B8'), **position)
+        fig.update_layout(title="🌪️ TORNADO - EFFET D'UNE VARIATION DE ±20 % PAR PARAMÈTRE",
+                          barmode='overlay', height=650, showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Indices de Sobol totaux (interactions comprises)
+            indices = sobol.pivot(index='Paramètre', columns='Métrique', values='ST')
+            indices = indices.loc[list(dict.fromkeys(sobol['Paramètre'])), metriques]
+            fig = px.imshow(indices.clip(0, 1).round(3), text_auto=True, zmin=0, zmax=1,
+                            color_continuous_scale='Blues', aspect='auto')
+            fig.update_layout(title="🧮 INDICES DE SOBOL TOTAUX (ST)", height=450)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            # Premier ordre vs total : l'écart mesure les interactions
+            st.dataframe(sobol[sobol['ST'] > 1e-6].round(3), use_container_width=True, hide_index=True)
+            st.caption(f"{sensibilite['evaluations']:,} évaluations du modèle par lots, "
+                       f"paramètres uniformes à ±20 % autour de la configuration")
     
-    def create_alliance_database(self):
+    def create_alliance_database(self, filtres=(), page=1):
         """Base de données des alliances stratégiques"""
         st.markdown('<h3 class="section-header">🤝 BASE DE DONNÉES DES ALLIANCES STRATÉGIQUES</h3>', 
                    unsafe_allow_html=True)
         
-        alliance_data = []
-        for nom, specs in self.alliance_projects.items():
-            alliance_data.append({
-                'Projet': nom,
-                'Pays Participants': specs['pays'],
-                'Type': specs['type'],
-                'Statut': specs['statut'],
-                'Détails': specs.get('financement', specs.get('interceptions', specs.get('portee', 'N/A')))
-            })
-        
-        alliance_df = pd.DataFrame(alliance_data)
+        # Une page et des agrégats lus dans le catalogue, jamais le catalogue entier
+        vue = self.generate_alliance_view(filtres, page)
+        if not vue['correspondants']:
+            st.info(f"Aucun accord ne correspond aux filtres ({vue['total']:,} accords au catalogue).")
+            return
         
         # Affichage interactif
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig = px.treemap(alliance_df, path=['Type', 'Projet'],
-                            title="🤝 CARTE DES ALLIANCES STRATÉGIQUES",
+            # Une feuille par (type, statut) : taille fixe quel que soit le nombre d'accords.
+            # Agrégats propres aux filtres : figure construite au rendu, hors FIGURE_CACHE
+            alliance_df = vue['agregats'].fillna('N/A').rename(
+                columns={'type': 'Type', 'statut': 'Statut', 'accords': 'Accords'})
+            fig = px.treemap(alliance_df, path=['Type', 'Statut'], values='Accords',
                             color='Type')
-            fig.update_layout(height=500)
+            fig.update_layout(title="🤝 CARTE DES ALLIANCES STRATÉGIQUES", height=500)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            st.markdown("""
-            <div class="alliance-card">
-                <h4>📋 PROJETS STRATÉGIQUES</h4>
-            """, unsafe_allow_html=True)
-            
-            for projet in alliance_data:
-                st.markdown(f"""
+            st.caption(f"{vue['correspondants']:,} accords sur {vue['total']:,} • "
+                       f"page {vue['page']}/{vue['pages']}")
+            # Page courante en un seul bloc (un élément)
+            lignes = ({'nom': accord['projet'], 'pays': accord['pays'] or 'N/A', 'type': accord['type'] or 'N/A',
+                       'statut': accord['statut'] or 'N/A', 'debut': accord['debut'] or '—',
+                       'details': accord['details'] or 'N/A'}
+                      for accord in vue['accords'].to_dict('records'))
+            st.markdown(card("""
                 <div style="background: rgba(255,255,255,0.1); padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
-                    <strong>{projet['Projet']}</strong><br>
-                    🌍 {projet['Pays Participants']} • 🎯 {projet['Type']}<br>
-                    📊 {projet['Statut']} • 📝 {projet['Détails']}
+                    <strong>{nom}</strong><br>
+                    🌍 {pays} • 🎯 {type}<br>
+                    📊 {statut} • 📅 {debut} • 📝 {details}
                 </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+                """).render_many(lignes, wrapper="""
+            <div class="alliance-card">
+                <h4>📋 PROJETS STRATÉGIQUES</h4>
+                {}
+            </div>
+            """), unsafe_allow_html=True)
+    
+    def create_alliance_filters(self):
+        """Filtres (paires triées, hashables) et page de la base des accords"""
+        store = self.alliance_store
+        filtres = {
+            'recherche': st.sidebar.text_input("Recherche d'accord:", value='').strip(),
+            'type': tuple(st.sidebar.multiselect("Types d'accord:", store.values('type'))),
+            'statut': tuple(st.sidebar.multiselect("Statuts:", store.values('statut'))),
+            'pays': tuple(st.sidebar.multiselect("Pays partenaires:", store.values('pays'))),
+        }
+        annees = store.year_range()
+        if annees and annees[0] < annees[1]:
+            periode = tuple(st.sidebar.slider("Début de l'accord:", annees[0], annees[1], annees))
+            # Période complète : aucun filtre (les accords sans date restent affichés)
+            filtres['debut'] = periode if periode != annees else None
+        page = st.sidebar.number_input("Page des accords:", min_value=1, value=1, step=1)
+        return tuple(sorted((cle, v) for cle, v in filtres.items() if v)), int(page)
     
     def run_advanced_dashboard(self):
         """Exécute le dashboard avancé complet"""
         # Sidebar avancé
         controls = self.create_advanced_sidebar()
         
+        # Figures envoyées à la session (référence ou envoi complet) : suivies seulement
+        # panneau Performance ouvert ; registre oublié à la fermeture (historique interrompu)
+        if controls['show_performance']:
+            ledger = self.get_figure_ledger()
+        else:
+            ledger = None
+            st.session_state.pop('figure_ledger', None)
+        
+        # Instrumentation optionnelle (panneau Performance et/ou export fichier)
+        metrics_file = os.environ.get(METRICS_FILE_ENV)
+        if not (controls['show_performance'] or metrics_file):
+            self.render_advanced_dashboard(controls)
+            return
+        
+        instrumentation = Instrumentation(track_memory=True)
+        with instrumentation.activate(), (ledger.activate() if ledger is not None else nullcontext()):
+            self.render_advanced_dashboard(controls)
+        if metrics_file:
+            instrumentation.export(metrics_file)
+        if controls['show_performance']:
+            self.display_performance_panel(instrumentation, ledger)
+    
+    def render_advanced_dashboard(self, controls):
+        """En-tête, données et sections du dashboard pour un état de la sidebar"""
+        debut, fin = controls['horizon']
+        
         # Header avancé
-        self.display_advanced_header()
+        self.display_advanced_header(debut, fin)
         
         # Génération des données avancées
-        df, config = self.generate_advanced_data(controls['selection'])
-        
-        # Navigation par onglets avancés
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "📊 Tableau de Bord", 
-            "🔬 Analyse Technique", 
-            "🌍 Contexte Régional", 
-            "⚔️ Branches Militaires",
-            "⚠️ Évaluation Menaces",
-            "🤝 Alliances Stratégiques",
-            "💎 Synthèse Stratégique"
-        ])
-        
-        with tab1:
+        df, config = self.generate_advanced_data(controls['selection'], controls['scenario'],
+                                                 debut, fin, controls['frequence'])
+        
+        # Navigation par onglets avancés (sections construites à la demande)
+        renderer = SectionRenderer(
+            self.define_sections(df, config, controls),
+            cache_key=(self.sections_key(controls), MODEL_VERSION, self.data_source.fingerprint),
+            output_cache=self.get_section_cache(),
+            executor=shared_executor(),
+            timeout=section_timeout(),
+            snapshot=self.snapshot_sections(controls)
+        )
+        with live_slots(self.define_live_slots(controls['live_source'], controls['live_cadence'])):
+            renderer.render(lazy=controls['lazy_tabs'])
+    
+    def define_sections(self, df, config, controls):
+        """Sections du dashboard : (libellé d'onglet, fonction de rendu)"""
+        def tableau_de_bord():
             self.display_strategic_metrics(df, config)
             self.create_comprehensive_analysis(df, config)
         
-        with tab2:
-            self.create_technical_analysis(df, config)
-        
-        with tab3:
+        def contexte_regional():
             if controls['show_regional']:
-                self.create_regional_analysis(df, config)
-        
-        with tab4:
-            self.create_branch_analysis(df, config)
+                self.create_regional_analysis(df, config, controls['pas_carte'])
         
-        with tab5:
+        def evaluation_menaces():
             if controls['threat_assessment']:
-                self.create_threat_assessment(df, config)
+                self.create_threat_assessment(df, config, controls['enveloppe_reponse'])
         
-        with tab6:
+        def alliances():
             if controls['show_alliances']:
-                self.create_alliance_database()
+                self.create_alliance_database(controls['filtres_accords'], controls['page_accords'])
+        
+        def sensibilite():
+            if controls['show_sensitivity']:
+                self.create_sensitivity_analysis(df, config)
         
-        with tab7:
-            self.create_strategic_synthesis(df, config, controls)
+        return [
+            ("📊 Tableau de Bord", tableau_de_bord),
+            ("🔬 Analyse Technique", lambda: self.create_technical_analysis(df, config)),
+            ("🌍 Contexte Régional", contexte_regional),
+            ("⚔️ Branches Militaires", lambda: self.create_branch_analysis(df, config)),
+            ("⚠️ Évaluation Menaces", evaluation_menaces),
+            ("🤝 Alliances Stratégiques", alliances),
+            ("🎚️ Sensibilité", sensibilite),
+            ("💎 Synthèse Stratégique", lambda: self.create_strategic_synthesis(df, config, controls))
+        ]
+    
+    def define_live_slots(self, spec, cadence):
+        """Emplacements temps réel du Tableau de Bord : fragments rafraîchis à cadence fixe.
+
+        Seuls ces fragments sont réexécutés par le flux ; le reste de la section
+        est réémis depuis le cache. Aucun emplacement rempli sans source.
+        """
+        if not spec:
+            return {}
+        
+        def fragment(vue):
+            @st.fragment(run_every=cadence)
+            def panneau():
+                # Redemandé à chaque rafraîchissement : flux gardé actif, relancé après une erreur
+                vue(get_feed(spec))
+            return panneau
+        
+        return {'metriques': fragment(self.display_live_metrics),
+                'tendance': fragment(self.display_live_trend)}
+    
+    def display_live_metrics(self, feed):
+        """Indicateurs glissants du flux (dernière minute)"""
+        snapshot = feed.aggregates.snapshot(seconds=60)
+        st.markdown('<h3 class="section-header">🔴 SITUATION TEMPS RÉEL</h3>', unsafe_allow_html=True)
+        if feed.error:
+            st.error(f"Flux interrompu : {feed.error}")
+        
+        dernieres = snapshot['latest']
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.markdown(card("""
+            <div class="idf-card">
+                <h4>🛡️ INTERCEPTIONS (1 min)</h4>
+                <h2>{}</h2>
+                <p>🚀 Taux d'interception glissant</p>
+            </div>
+            """).render('-' if dernieres.get('interception') is None else f"{dernieres['interception']:.1f}%"),
+            unsafe_allow_html=True)
+        with col2:
+            st.metric("🚨 Alertes / minute", f"{dernieres.get('alerte') or 0:.0f}")
+        with col3:
+            readiness = dernieres.get('readiness')
+            st.metric("📊 Préparation (1 min)", '-' if readiness is None else f"{readiness:.1f}%")
+        with col4:
+            st.metric("📥 Événements reçus", f"{snapshot['total']:,}",
+                      f"{feed.errors} rejetés" if feed.errors else None, delta_color="off")
+    
+    def display_live_trend(self, feed):
+        """Tendances du flux par seconde (5 dernières minutes)"""
+        snapshot = feed.aggregates.snapshot(seconds=300)
+        series = [nom for nom in EVENT_TYPES if nom in snapshot['series']]
+        if series:
+            fig = make_subplots(rows=len(series), cols=1, shared_xaxes=True,
+                                subplot_titles=[EVENT_TYPES[nom][0] for nom in series])
+            for i, nom in enumerate(series):
+                frame = snapshot['series'][nom]
+                fig.add_trace(go.Scatter(x=frame['Instant'], y=frame['Valeur'], mode='lines',
+                                         name=EVENT_TYPES[nom][0], line=dict(color='#0038B8', width=2)),
+                              row=i + 1, col=1)
+            fig.update_layout(height=180 * len(series) + 80, template="plotly_white", showlegend=False,
+                              margin=dict(t=40, b=20))
+            st.plotly_chart(fig, use_container_width=True)
+    
+    def display_performance_panel(self, instrumentation, ledger=None):
+        """Panneau ⏱️ Performance : où passe le temps du dernier rerun"""
+        summary = pd.DataFrame(instrumentation.summary())
+        
+        with st.sidebar.expander("⏱️ PERFORMANCE DU RERUN", expanded=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Durée totale", f"{instrumentation.total_s * 1000:.0f} ms")
+            with col2:
+                st.metric("Payload émis", f"{summary['payload_bytes'].sum() / 1024:.1f} Ko")
+            
+            table = pd.DataFrame({
+                'Type': summary['kind'],
+                'Appel': summary['name'],
+                'N': summary['calls'],
+                'ms': (summary['seconds'] * 1000).round(1),
+                'Alloc. Ko': (summary['alloc_bytes'] / 1024).round(1),
+                'Payload Ko': (summary['payload_bytes'] / 1024).round(1)
+            })
+            st.dataframe(table, hide_index=True, use_container_width=True)
+            
+            data_stats, figure_stats, sections = DATA_CACHE.stats(), FIGURE_CACHE.stats(), SECTION_STORE.stats()
+            st.caption(f"Cache données : {data_stats['hits']} succès / {data_stats['misses']} échecs • "
+                       f"Cache figures : {figure_stats['hits']} succès / {figure_stats['misses']} échecs • "
+                       f"Sections partagées : {sections['entries']} ({sections['nbytes'] / 2**20:.1f} Mo), "
+                       f"{sections['hits']} succès, {sections['dedup_hits']} attentes dédupliquées • "
+                       f"Bundle : {f'{len(self.snapshot)} entrées' if self.snapshot is not None else 'absent ou périmé'}")
+            if ledger is not None:
+                figures = ledger.stats
+                st.caption(f"Figures : {figures['envoyees']} envoyées ({figures['octets_envoyes'] / 1024:.1f} Ko), "
+                           f"{figures['references']} réémises par référence ({figures['octets_evites'] / 1024:.1f} Ko évités), "
+                           f"{figures['modifiees']} modifiées ({figures['traces_modifiees']}/{figures['traces']} traces)")
+    
+    def get_figure_ledger(self):
+        """Registre des figures envoyées à la session courante"""
+        return st.session_state.setdefault('figure_ledger', FigureLedger())
+    
+    def get_section_cache(self):
+        """Sorties de sections partagées entre sessions (calculées une fois par état)"""
+        return SECTION_STORE
+    
+    def sections_key(self, controls):
+        """Clé des sorties de sections : état de la sidebar, versions du catalogue d'accords et des sites"""
+        return (normalize_controls(controls), self.alliance_store.digest, sites_fingerprint())
+    
+    def snapshot_sections(self, controls):
+        """Sorties précalculées des sections pour cet état de la sidebar (``None`` sans bundle)"""
+        if self.snapshot is None:
+            return None
+        return partial(self.snapshot.section_ops, self.sections_key(controls))
     
     def create_strategic_synthesis(self, df, config, controls):
         """Synthèse stratégique finale"""
@@ -1039,7 +1046,7 @@ class DefenseIsraelDashboardAvance:
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
+            st.markdown(card("""
             <div class="idf-card">
                 <h4>🏆 AVANTAGES STRATÉGIQUES DÉCISIFS</h4>
                 <div style="margin-top: 1rem;">
@@ -1061,10 +1068,10 @@ class DefenseIsraelDashboardAvance:
                     </div>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
+            st.markdown(card("""
             <div class="alliance-card">
                 <h4>🎯 DÉFIS STRATÉGIQUES</h4>
                 <div style="margin-top: 1rem;">
@@ -1086,10 +1093,10 @@ class DefenseIsraelDashboardAvance:
                     </div>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+            """).render(), unsafe_allow_html=True)
         
         # Perspectives futures
-        st.markdown("""
+        st.markdown(card("""
         <div class="metric-card">
             <h4>🔮 PERSPECTIVES STRATÉGIQUES 2027-2035</h4>
             <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -1107,10 +1114,10 @@ class DefenseIsraelDashboardAvance:
                 </div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """).render(), unsafe_allow_html=True)
         
         # Recommandations finales
-        st.markdown("""
+        st.markdown(card("""
         <div class="idf-card">
             <h4>🎖️ RECOMMANDATIONS STRATÉGIQUES FINALES</h4>
             <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem; margin-top: 1rem;">
@@ -1130,9 +1137,10 @@ class DefenseIsraelDashboardAvance:
                 </div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """).render(), unsafe_allow_html=True)
 
 # Lancement du dashboard avancé
 if __name__ == "__main__":
+    configure_page()
     dashboard = DefenseIsraelDashboardAvance()
     dashboard.run_advanced_dashboard()
\ No newline at end of file
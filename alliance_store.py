@@ -0,0 +1,248 @@
+# alliance_store.py
+"""Catalogue des accords d'alliance : base SQLite indexée, filtrée et paginée.
+
+Le catalogue par défaut est la table de référence ``alliances`` (base en
+mémoire). Un fichier d'accords (``DASHBOARD_ALLIANCES_FILE``, CSV, Parquet ou
+Arrow ; colonnes ``projet``, ``type``, ``pays``, ``statut``, ``debut``,
+``details``) est chargé une seule fois dans une base SQLite en cache, indexée
+par type, statut, pays et année de début. Le dashboard n'en lit qu'une page et
+des agrégats : l'onglet reste réactif à plusieurs centaines de milliers
+d'accords.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_sources import DATA_CACHE_DIR_ENV, fingerprint, iter_chunks
+
+ALLIANCES_FILE_ENV = 'DASHBOARD_ALLIANCES_FILE'
+
+COLONNES = ('projet', 'type', 'pays', 'statut', 'debut', 'details')
+
+# Accords affichés par page dans l'onglet
+PAGE_SIZE = 25
+
+# Séparateur des pays d'un accord multilatéral (« Israël/USA »)
+SEPARATEUR_PAYS = '/'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accords (
+    id INTEGER PRIMARY KEY,
+    projet TEXT NOT NULL,
+    type TEXT,
+    pays TEXT,
+    statut TEXT,
+    debut INTEGER,
+    details TEXT
+);
+CREATE TABLE IF NOT EXISTS accords_pays (accord INTEGER NOT NULL, pays TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (cle TEXT PRIMARY KEY, valeur TEXT);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_accords_type ON accords(type, statut);
+CREATE INDEX IF NOT EXISTS idx_accords_statut ON accords(statut);
+CREATE INDEX IF NOT EXISTS idx_accords_debut ON accords(debut);
+CREATE INDEX IF NOT EXISTS idx_accords_pays ON accords_pays(pays, accord);
+"""
+
+
+def rows_from_table(table):
+    """Accords de la table de référence : le premier champ complémentaire sert de détail"""
+    lignes = []
+    for projet, ligne in table.items():
+        extras = [v for nom, v in ligne.to_dict().items() if nom not in COLONNES]
+        lignes.append((projet, ligne.get('type'), ligne.get('pays'), ligne.get('statut'),
+                       ligne.get('debut'), str(extras[0]) if extras else None))
+    return lignes
+
+
+def _rows_from_frame(df):
+    """Tuples ``COLONNES`` d'un paquet de fichier (colonnes absentes : NULL)"""
+    colonnes = []
+    for nom in COLONNES:
+        if nom not in df.columns:
+            colonnes.append([None] * len(df))
+        elif nom == 'debut':
+            annees = pd.to_numeric(df[nom], errors='coerce')
+            colonnes.append([None if pd.isna(a) else int(a) for a in annees])
+        else:
+            colonnes.append([None if pd.isna(v) else str(v) for v in df[nom]])
+    return zip(*colonnes)
+
+
+class AllianceStore:
+    """Accords dans SQLite : filtres indexés, recherche, pagination et agrégats.
+
+    Une connexion unique protégée par un verrou : les requêtes (index,
+    ``LIMIT``) durent quelques millisecondes.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._connexion = sqlite3.connect(path, check_same_thread=False)
+        self._connexion.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._valeurs = {}
+        self.digest = self._meta('digest')
+
+    def _meta(self, cle):
+        ligne = self._connexion.execute("SELECT valeur FROM meta WHERE cle = ?", (cle,)).fetchone()
+        return ligne[0] if ligne else None
+
+    def load(self, lignes, digest=None):
+        """Remplace le catalogue par ``lignes`` (tuples ``COLONNES``), index reconstruits à la fin"""
+        # Empreinte calculée sur le contenu si l'appelant n'en fournit pas
+        empreinte = hashlib.sha1() if digest is None else None
+        with self._lock, self._connexion as connexion:
+            connexion.execute("DELETE FROM accords")
+            connexion.execute("DELETE FROM accords_pays")
+            for nom in ('idx_accords_type', 'idx_accords_statut', 'idx_accords_debut', 'idx_accords_pays'):
+                connexion.execute(f"DROP INDEX IF EXISTS {nom}")
+            paquet = []
+            for i, ligne in enumerate(lignes):
+                paquet.append((i, *ligne))
+                if len(paquet) >= 10_000:
+                    self._insert(connexion, paquet, empreinte)
+                    paquet = []
+            self._insert(connexion, paquet, empreinte)
+            connexion.executescript(INDEXES)
+            self.digest = digest or empreinte.hexdigest()
+            self._valeurs = {}
+            connexion.execute("INSERT OR REPLACE INTO meta VALUES ('digest', ?)", (self.digest,))
+        with self._lock:
+            self._connexion.execute("ANALYZE")
+        return self
+
+    @staticmethod
+    def _insert(connexion, paquet, empreinte):
+        connexion.executemany("INSERT INTO accords VALUES (?, ?, ?, ?, ?, ?, ?)", paquet)
+        connexion.executemany("INSERT INTO accords_pays VALUES (?, ?)", (
+            (ligne[0], pays.strip()) for ligne in paquet if ligne[3]
+            for pays in ligne[3].split(SEPARATEUR_PAYS) if pays.strip()))
+        if empreinte is not None:
+            empreinte.update(json.dumps(paquet, ensure_ascii=False).encode('utf-8'))
+
+    def _query(self, sql, parametres=()):
+        with self._lock:
+            return self._connexion.execute(sql, parametres).fetchall()
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM accords")[0][0]
+
+    def values(self, colonne):
+        """Valeurs distinctes de ``type``, ``statut`` ou ``pays`` (lues sur les index, mémoïsées)"""
+        if colonne not in ('type', 'statut', 'pays'):
+            raise KeyError(colonne)
+        valeurs = self._valeurs.get(colonne)
+        if valeurs is None:
+            table = 'accords_pays' if colonne == 'pays' else 'accords'
+            valeurs = self._valeurs[colonne] = [v for (v,) in self._query(
+                f"SELECT DISTINCT {colonne} FROM {table} WHERE {colonne} IS NOT NULL ORDER BY {colonne}")]
+        return valeurs
+
+    def year_range(self):
+        """Première et dernière année de début (``None`` si non renseignées)"""
+        debut, fin = self._query("SELECT MIN(debut), MAX(debut) FROM accords")[0]
+        return None if debut is None else (debut, fin)
+
+    @staticmethod
+    def where(filtres):
+        """Clause ``WHERE`` et paramètres de ``filtres``.
+
+        ``type``/``statut``/``pays`` : valeurs acceptées ; ``debut`` : (min, max) ;
+        ``recherche`` : sous-chaîne du nom (insensible à la casse ASCII).
+        """
+        clauses, parametres = [], []
+        filtres = filtres or {}
+        for colonne in ('type', 'statut'):
+            valeurs = list(filtres.get(colonne) or ())
+            if valeurs:
+                clauses.append(f"{colonne} IN ({', '.join('?' * len(valeurs))})")
+                parametres.extend(valeurs)
+        pays = list(filtres.get('pays') or ())
+        if pays:
+            clauses.append(f"id IN (SELECT accord FROM accords_pays WHERE pays IN ({', '.join('?' * len(pays))}))")
+            parametres.extend(pays)
+        if filtres.get('debut'):
+            clauses.append("debut BETWEEN ? AND ?")
+            parametres.extend(filtres['debut'])
+        if filtres.get('recherche'):
+            motif = filtres['recherche'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("projet LIKE ? ESCAPE '\\'")
+            parametres.append(f"%{motif}%")
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', parametres
+
+    def count(self, filtres=None):
+        where, parametres = self.where(filtres)
+        return self._query(f"SELECT COUNT(*) FROM accords{where}", parametres)[0][0]
+
+    def page(self, filtres=None, page=1, page_size=PAGE_SIZE):
+        """Accords de la page ``page`` (à partir de 1), dans l'ordre du catalogue"""
+        where, parametres = self.where(filtres)
+        lignes = self._query(f"SELECT {', '.join(COLONNES)} FROM accords{where} ORDER BY id LIMIT ? OFFSET ?",
+                             (*parametres, page_size, (max(page, 1) - 1) * page_size))
+        # dtype objet : années manquantes gardées à None (pas de passage en float)
+        return pd.DataFrame(lignes, columns=list(COLONNES), dtype=object)
+
+    def aggregate(self, filtres=None):
+        """Nombre d'accords par (type, statut) : données du treemap sans une feuille par accord"""
+        where, parametres = self.where(filtres)
+        lignes = self._query(f"SELECT type, statut, COUNT(*) FROM accords{where} GROUP BY type, statut", parametres)
+        agregats = pd.DataFrame(lignes, columns=['type', 'statut', 'accords'])
+        agregats['accords'] = agregats['accords'].astype(np.int64)
+        return agregats
+
+
+def store_from_file(path, cache_dir=None):
+    """Base SQLite du fichier ``path``, construite une fois par version du fichier"""
+    empreinte = fingerprint(path)
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), '.cache_colonnaire')
+    chemin = os.path.join(cache_dir, f'alliances-{empreinte}.sqlite')
+    if os.path.exists(chemin):
+        store = AllianceStore(chemin)
+        if store.digest == empreinte:
+            return store
+    os.makedirs(cache_dir, exist_ok=True)
+    temporaire = f'{chemin}.tmp-{os.getpid()}'
+    if os.path.exists(temporaire):
+        os.remove(temporaire)
+    lignes = (ligne for paquet in iter_chunks(path) for ligne in _rows_from_frame(paquet))
+    store = AllianceStore(temporaire).load(lignes, digest=empreinte)
+    store._connexion.close()
+    os.replace(temporaire, chemin)
+    return AllianceStore(chemin)
+
+
+def alliances_fingerprint():
+    """Empreinte du catalogue configuré (digest de sa base ; ``None`` : table de référence)"""
+    path = os.environ.get(ALLIANCES_FILE_ENV)
+    return fingerprint(path) if path else None
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_alliance_store(table):
+    """Catalogue du processus : fichier ``DASHBOARD_ALLIANCES_FILE`` s'il est défini, sinon ``table``"""
+    path = os.environ.get(ALLIANCES_FILE_ENV)
+    # Clé de version : un fichier modifié en cours de processus donne une nouvelle base
+    cle = (path, fingerprint(path)) if path else (None, table.digest)
+    with _STORES_LOCK:
+        store = _STORES.get(cle)
+        if store is None:
+            if path:
+                store = store_from_file(path, os.environ.get(DATA_CACHE_DIR_ENV))
+            else:
+                store = AllianceStore().load(rows_from_table(table), digest=table.digest)
+            # Versions précédentes du même catalogue oubliées (fermées quand plus utilisées)
+            for ancienne in [c for c in _STORES if c[0] == cle[0]]:
+                del _STORES[ancienne]
+            store = _STORES[cle] = store
+        return store
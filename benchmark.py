@@ -0,0 +1,226 @@
+# benchmark.py
+"""Banc de mesure : génération des données, rendu par onglet, rerun complet.
+
+Aucun navigateur n'est nécessaire : les sections sont exécutées contre un
+Streamlit simulé (``StubStreamlit``) qui enregistre les éléments émis.
+
+    python benchmark.py                       # mesure et compare à la référence
+    python benchmark.py --save-baseline       # enregistre la référence
+    python benchmark.py --threshold 0.25 -o resultats.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+from data_cache import DATA_CACHE
+from figure_cache import FIGURE_CACHE
+from rendering import SECTION_STORE, StubStreamlit, record
+from scenario_engine import SCENARIO_PAR_DEFAUT
+
+BASELINE_PATH = 'benchmark_baseline.json'
+
+# Horizons mesurés : libellé -> (début, fin, pas en années)
+HORIZONS = {
+    'annuel_28': (2000, 2028, 1.0),
+    'mensuel_336': (2000, 2028, 1 / 12),
+    'journalier_10k': (2000, 2028, 1 / 365.25),
+}
+
+SELECTION_PAR_DEFAUT = "Israël - Vue d'Ensemble"
+
+
+def best_of(fonction, repeat=5):
+    """Meilleur temps (s) sur ``repeat`` exécutions, moins sensible au bruit"""
+    meilleurs = []
+    for _ in range(repeat):
+        debut = time.perf_counter()
+        fonction()
+        meilleurs.append(time.perf_counter() - debut)
+    return min(meilleurs)
+
+
+def reset_caches():
+    DATA_CACHE.clear()
+    FIGURE_CACHE.clear()
+    SECTION_STORE.clear()
+
+
+def iter_ops(ops):
+    for op in ops:
+        yield op
+        for child in op.children or []:
+            yield from iter_ops(child.ops)
+
+
+def payload_stats(ops):
+    """Nombre de figures et octets JSON des figures et du HTML émis"""
+    figures = [op.args[0] for op in iter_ops(ops) if op.name == 'plotly_chart']
+    markdown = [op.args[0] for op in iter_ops(ops) if op.name == 'markdown']
+    return {
+        'figures': len(figures),
+        'figure_bytes': sum(len(fig.to_json().encode('utf-8')) for fig in figures),
+        'markdown_bytes': sum(len(texte.encode('utf-8')) for texte in markdown),
+    }
+
+
+def bench_data(model, selections, repeat):
+    """Génération des séries (hors cache) par sélection et horizon"""
+    resultats = {}
+    for selection in selections:
+        for horizon, (debut, fin, pas) in HORIZONS.items():
+            annees = np.arange(debut, fin, pas)
+            resultats[f'data.{selection}.{horizon}'] = best_of(
+                lambda: model._build_advanced_data(selection, annees), repeat)
+    return resultats
+
+
+def bench_sections(dashboard, repeat):
+    """Construction de chaque onglet, à froid (caches vidés) et à chaud"""
+    controls = {'selection': SELECTION_PAR_DEFAUT, 'scenario': SCENARIO_PAR_DEFAUT,
+                'show_regional': True, 'show_alliances': True, 'show_technical': True,
+                'threat_assessment': True, 'show_sensitivity': True, 'enveloppe_reponse': None,
+                'filtres_accords': (), 'page_accords': 1, 'pas_carte': 2.0,
+                'lazy_tabs': True, 'type_analyse': "Vue d'Ensemble Israël"}
+    resultats, payloads = {}, {}
+    for label, _ in dashboard.define_sections(None, None, controls):
+        def construire(label=label):
+            df, config = dashboard.generate_advanced_data(controls['selection'], controls['scenario'])
+            renderer = dict(dashboard.define_sections(df, config, controls))[label]
+            return record(renderer)
+
+        froid = []
+        for _ in range(repeat):
+            reset_caches()
+            debut = time.perf_counter()
+            construire()
+            froid.append(time.perf_counter() - debut)
+        resultats[f'section.{label}.froid'] = min(froid)
+        resultats[f'section.{label}.chaud'] = best_of(construire, repeat)
+
+        ops = construire()
+        debut = time.perf_counter()
+        stats = payload_stats(ops)
+        resultats[f'section.{label}.serialisation'] = time.perf_counter() - debut
+        payloads[label] = stats
+        resultats[f'payload.{label}.octets'] = stats['figure_bytes'] + stats['markdown_bytes']
+    return resultats, payloads
+
+
+def bench_rerun(dashboard_cls, repeat):
+    """Rerun complet de run_advanced_dashboard via un Streamlit simulé"""
+    resultats = {}
+    for mode, lazy in (('paresseux', True), ('immediat', False)):
+        session = {}
+
+        def rerun(lazy=lazy, session=session):
+            stub = StubStreamlit({"Rendu à la demande (section active)": lazy})
+            # Même session d'un rerun à l'autre, comme un analyste qui interagit
+            stub.session_state = session
+            with stub:
+                dashboard_cls().run_advanced_dashboard()
+            return stub
+
+        froid = []
+        for _ in range(repeat):
+            reset_caches()
+            session.clear()
+            debut = time.perf_counter()
+            rerun()
+            froid.append(time.perf_counter() - debut)
+        resultats[f'rerun.{mode}.froid'] = min(froid)
+        resultats[f'rerun.{mode}.chaud'] = best_of(rerun, repeat)
+        stats = payload_stats(rerun().ops)
+        resultats[f'payload.rerun.{mode}.octets'] = stats['figure_bytes'] + stats['markdown_bytes']
+    return resultats
+
+
+def run_benchmarks(selections=None, repeat=5):
+    from Dashboard import DefenseIsraelDashboardAvance
+
+    # Calculs mesurés : le bundle précalculé n'est pas utilisé
+    dashboard = DefenseIsraelDashboardAvance(snapshot=False)
+    selections = selections or [SELECTION_PAR_DEFAUT, "Marine Israélienne"]
+    mesures = {}
+    mesures.update(bench_data(dashboard, selections, repeat))
+    sections, payloads = bench_sections(dashboard, repeat)
+    mesures.update(sections)
+    mesures.update(bench_rerun(partial(DefenseIsraelDashboardAvance, snapshot=False), repeat))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'mesures': mesures,
+        'payloads': payloads,
+    }
+
+
+def compare(resultats, reference, threshold, min_delta=0.002):
+    """Régressions : mesures dépassant la référence de plus de ``threshold``.
+
+    Les écarts de temps inférieurs à ``min_delta`` secondes sont ignorés
+    (bruit de mesure sur les sections servies depuis le cache).
+    """
+    regressions = []
+    for nom, valeur in resultats['mesures'].items():
+        base = reference.get('mesures', {}).get(nom)
+        if not base or valeur <= base * (1 + threshold):
+            continue
+        if not nom.endswith('octets') and valeur - base < min_delta:
+            continue
+        regressions.append((nom, base, valeur))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du dashboard défense Israël")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Fichier de référence JSON")
+    parser.add_argument('--save-baseline', action='store_true', help="Enregistre les mesures comme référence")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Régression tolérée (0.25 = +25%%)")
+    parser.add_argument('--min-delta', type=float, default=0.002, help="Écart de temps minimal signalé (s)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--selections', nargs='*')
+    parser.add_argument('-o', '--output', help="Écrit les résultats JSON dans ce fichier")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    resultats = run_benchmarks(args.selections, args.repeat)
+
+    for nom, valeur in resultats['mesures'].items():
+        unite = 'o' if nom.endswith('octets') else 'ms'
+        print(f"{nom:<70} {valeur if unite == 'o' else valeur * 1000:>12.1f} {unite}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, ensure_ascii=False, indent=2)
+        print(f"Référence enregistrée dans {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Aucune référence ({args.baseline}) : comparaison ignorée", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        reference = json.load(f)
+    regressions = compare(resultats, reference, args.threshold, args.min_delta)
+    for nom, base, valeur in regressions:
+        print(f"RÉGRESSION {nom}: {base:.4g} -> {valeur:.4g} (+{100 * (valeur / base - 1):.0f}%)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# cli.py
+"""Interface en ligne de commande headless (sans Streamlit ni Plotly).
+
+    python cli.py list
+    python cli.py export --selection "Israël - Vue d'Ensemble" -o donnees.csv
+    python cli.py export --scenario "Escalade Nord" --bands -o bandes.parquet
+    python cli.py export --frequence journalière --debut 2020 --fin 2030 -o journalier.csv
+    python cli.py tables -o capacites.json
+    python cli.py import-time
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Budget de temps d'import à froid du noyau (secondes), dominé par pandas
+IMPORT_BUDGET_S = 1.0
+
+# Modules d'interface qui ne doivent jamais être chargés par le noyau
+UI_MODULES = ('streamlit', 'plotly', 'matplotlib', 'seaborn')
+
+SELECTION_PAR_DEFAUT = "Israël - Vue d'Ensemble"
+
+
+def write_frame(df, path):
+    """Écrit un DataFrame selon l'extension : .csv, .parquet ou .json"""
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    elif path.endswith('.json'):
+        df.to_json(path, orient='records', force_ascii=False, indent=2)
+    else:
+        df.to_csv(path, index=False)
+
+
+def cmd_list(args):
+    from defense_core import DefenseIsraelModel
+    from scenario_engine import SCENARIOS
+
+    model = DefenseIsraelModel()
+    print("Sélections :")
+    for selection in dict.fromkeys(model.branches_options + model.programmes_options):
+        print(f"  {selection}")
+    print("Scénarios :")
+    for scenario in SCENARIOS:
+        print(f"  {scenario}")
+
+
+def cmd_export(args):
+    from data_sources import FileSource
+    from defense_core import DefenseIsraelModel
+
+    model = DefenseIsraelModel(FileSource(args.source) if args.source else None)
+    if args.trajectories:
+        model.scenario_engine.n_trajectories = args.trajectories
+    df, config = model.generate_advanced_data(args.selection, args.scenario, args.debut, args.fin, args.frequence)
+    if args.bands:
+        df = model.generate_scenario_bands(df, config)
+    write_frame(df, args.output)
+    print(f"{len(df)} lignes x {len(df.columns)} colonnes -> {args.output}", file=sys.stderr)
+
+
+def cmd_tables(args):
+    import pandas as pd
+    from defense_core import DefenseIsraelModel
+
+    model = DefenseIsraelModel()
+    tables = {
+        'capacites': model.military_capabilities.to_dict(),
+        'alliances': model.alliance_projects.to_dict(),
+    }
+    if args.output.endswith('.json'):
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(tables, f, ensure_ascii=False, indent=2)
+    else:
+        frames = [pd.DataFrame.from_dict(table, orient='index').rename_axis('nom').reset_index().assign(table=nom)
+                  for nom, table in tables.items()]
+        write_frame(pd.concat(frames, ignore_index=True), args.output)
+    print(f"Tables de référence -> {args.output}", file=sys.stderr)
+
+
+def measure_import_time(module='defense_core'):
+    """Temps d'import à froid de ``module`` dans un interpréteur neuf"""
+    code = (
+        "import sys, time, json\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(json.dumps({'secondes': time.perf_counter() - t, "
+        f"'ui': [m for m in {UI_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    sortie = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+def cmd_import_time(args):
+    mesure = measure_import_time(args.module)
+    print(f"import {args.module}: {mesure['secondes']:.3f}s (budget {args.budget:.2f}s)")
+    if mesure['ui']:
+        print(f"ERREUR: modules d'interface chargés: {', '.join(mesure['ui'])}", file=sys.stderr)
+        return 1
+    if mesure['secondes'] > args.budget:
+        print("ERREUR: budget d'import dépassé", file=sys.stderr)
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse stratégique Israël - mode headless")
+    sub = parser.add_subparsers(dest='commande', required=True)
+
+    sub.add_parser('list', help="Sélections et scénarios disponibles").set_defaults(func=cmd_list)
+
+    export = sub.add_parser('export', help="Exporte les séries d'une sélection")
+    export.add_argument('--selection', default=SELECTION_PAR_DEFAUT)
+    export.add_argument('--scenario', default=None)
+    export.add_argument('--debut', type=int, default=2000)
+    export.add_argument('--fin', type=int, default=2027, help="Dernière année incluse")
+    export.add_argument('--frequence', default='annuelle',
+                        choices=['annuelle', 'mensuelle', 'hebdomadaire', 'journalière'])
+    export.add_argument('--bands', action='store_true', help="Exporte les bandes Monte Carlo P5/P50/P95")
+    export.add_argument('--trajectories', type=int, default=None)
+    export.add_argument('--source', default=None, help="Données observées (.csv, .parquet, .arrow)")
+    export.add_argument('-o', '--output', required=True, help="Fichier .csv, .parquet ou .json")
+    export.set_defaults(func=cmd_export)
+
+    tables = sub.add_parser('tables', help="Exporte les tables de capacités et d'alliances")
+    tables.add_argument('-o', '--output', required=True, help="Fichier .json, .csv ou .parquet")
+    tables.set_defaults(func=cmd_tables)
+
+    import_time = sub.add_parser('import-time', help="Mesure le temps d'import à froid du noyau")
+    import_time.add_argument('--module', default='defense_core')
+    import_time.add_argument('--budget', type=float, default=IMPORT_BUDGET_S)
+    import_time.set_defaults(func=cmd_import_time)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
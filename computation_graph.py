@@ -0,0 +1,135 @@
+# computation_graph.py
+"""Graphe de calcul incrémental des séries simulées.
+
+Chaque nœud déclare ses entrées : l'axe temporel, les clés de configuration
+qu'il lit (avec leur valeur par défaut) et les nœuds amont dont il dépend.
+Le résultat d'un nœud est mémorisé sous la clé de ces entrées ; modifier un
+paramètre ne recalcule donc que les nœuds qui le lisent et leurs dépendants.
+"""
+import hashlib
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from data_cache import DataCache
+
+# ``params`` : {clé de configuration: défaut} ; ``depends`` : nœuds amont,
+# passés à ``function`` en arguments nommés
+Node = namedtuple('Node', 'name function params depends')
+
+
+def axis_key(t):
+    """Empreinte d'un axe temporel (longueur, bornes et contenu)"""
+    t = np.ascontiguousarray(t)
+    if t.size == 0:
+        return (0,)
+    return (t.size, float(t[0]), float(t[-1]), hashlib.sha1(t.tobytes()).hexdigest())
+
+
+def _input_key(valeur):
+    """Valeur de configuration sous forme hachable (tableaux par contenu)"""
+    if isinstance(valeur, np.ndarray):
+        return ('ndarray', valeur.shape, str(valeur.dtype), hashlib.sha1(valeur.tobytes()).hexdigest())
+    if isinstance(valeur, (list, tuple)):
+        return tuple(_input_key(v) for v in valeur)
+    return valeur
+
+
+class ComputationGraph:
+    """Nœuds nommés, ordre topologique et mémoïsation par entrées"""
+
+    def __init__(self, cache=None):
+        self.nodes = {}
+        self.cache = cache if cache is not None else DataCache(maxsize=512, ttl=None)
+        # Bilan de la dernière évaluation, propre à chaque thread (graphe partagé par les sessions)
+        self._last = threading.local()
+
+    @property
+    def computed(self):
+        """Nœuds calculés par la dernière ``evaluate`` de ce thread"""
+        return getattr(self._last, 'computed', [])
+
+    @property
+    def reused(self):
+        """Nœuds repris du cache par la dernière ``evaluate`` de ce thread"""
+        return getattr(self._last, 'reused', [])
+
+    def add(self, name, function, params=None, depends=()):
+        for amont in depends:
+            if amont not in self.nodes:
+                raise KeyError(f"Nœud amont inconnu pour '{name}': {amont}")
+        self.nodes[name] = Node(name, function, dict(params or {}), tuple(depends))
+        return self.nodes[name]
+
+    def __contains__(self, name):
+        return name in self.nodes
+
+    def order(self, names):
+        """Nœuds demandés et leurs amonts, dans un ordre d'évaluation valide"""
+        ordre, vus = [], set()
+
+        def visiter(nom):
+            if nom in vus:
+                return
+            if nom not in self.nodes:
+                raise KeyError(f"Série inconnue: {nom}")
+            vus.add(nom)
+            for amont in self.nodes[nom].depends:
+                visiter(amont)
+            ordre.append(nom)
+
+        for nom in names:
+            visiter(nom)
+        return ordre
+
+    def inputs(self, name, config):
+        """Arguments de configuration lus par un nœud"""
+        return {cle: config.get(cle, defaut) for cle, defaut in self.nodes[name].params.items()}
+
+    def dependents(self, keys):
+        """Nœuds à recalculer quand les clés de configuration ``keys`` changent"""
+        keys = set(keys)
+        touches = {nom for nom, node in self.nodes.items() if keys & set(node.params)}
+        for nom in self.order(self.nodes):
+            if touches & set(self.nodes[nom].depends):
+                touches.add(nom)
+        return [nom for nom in self.nodes if nom in touches]
+
+    def evaluate(self, names, t, config):
+        """Valeurs des nœuds ``names`` sur ``t`` ; seuls les nœuds dont une entrée a changé sont calculés"""
+        axe = axis_key(t)
+        valeurs, cles = {}, {}
+        calcules, repris = [], []
+        for nom in self.order(names):
+            node = self.nodes[nom]
+            kwargs = self.inputs(nom, config)
+            cle = (nom, axe, tuple((k, _input_key(v)) for k, v in sorted(kwargs.items())),
+                   tuple(cles[amont] for amont in node.depends))
+            cles[nom] = cle
+            resultat = self.cache.get(cle)
+            if resultat is None:
+                amonts = {amont: valeurs[amont] for amont in node.depends}
+                resultat = np.asarray(node.function(t, **kwargs, **amonts))
+                # Partagé entre exécutions : jamais modifié en place
+                resultat.flags.writeable = False
+                self.cache.put(cle, resultat)
+                calcules.append(nom)
+            else:
+                repris.append(nom)
+            valeurs[nom] = resultat
+        self._last.computed, self._last.reused = calcules, repris
+        return {nom: valeurs[nom] for nom in names}
+
+    def evaluate_batch(self, names, t, config):
+        """Valeurs des nœuds ``names`` sans mémoïsation.
+
+        Les paramètres de ``config`` peuvent être des colonnes ``(N, 1)`` :
+        les N jeux de paramètres sont évalués en une passe, résultats ``(N, len(t))``.
+        """
+        valeurs = {}
+        for nom in self.order(names):
+            node = self.nodes[nom]
+            amonts = {amont: valeurs[amont] for amont in node.depends}
+            valeurs[nom] = np.asarray(node.function(t, **self.inputs(nom, config), **amonts))
+        return {nom: valeurs[nom] for nom in names}
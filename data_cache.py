@@ -0,0 +1,156 @@
+# data_cache.py
+"""Cache mémoire des données générées, partagé par toutes les sessions.
+
+Le module est importé (et non ré-exécuté) à chaque rerun Streamlit : l'état
+du cache survit donc aux interactions et est commun à tous les analystes
+connectés au même processus serveur.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def estimate_nbytes(value):
+    """Taille mémoire approximative d'une valeur mise en cache (octets)"""
+    if hasattr(value, 'memory_usage'):  # DataFrame / Series pandas
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if hasattr(value, 'nbytes'):  # tableau NumPy
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class DataCache:
+    """Cache LRU borné avec expiration (TTL) et compteurs de succès/échecs.
+
+    ``max_bytes`` borne aussi la taille cumulée des valeurs (mesurée par
+    ``sizeof``). ``get_or_compute`` est « single-flight » : des demandes
+    concurrentes d'une même clé attendent un calcul unique.
+    """
+
+    def __init__(self, maxsize=128, ttl=900.0, clock=time.monotonic, max_bytes=None, sizeof=estimate_nbytes):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._inflight = {}
+        self._lock = threading.RLock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dedup_hits = 0
+
+    def get(self, key, default=None):
+        """Valeur en cache (rafraîchie en tête LRU) ou ``default``"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expire, value = entry
+                if self.ttl is None or expire > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._discard(key)
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Insère une valeur et évince les entrées les plus anciennes"""
+        expire = None if self.ttl is None else self._clock() + self.ttl
+        taille = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (expire, value)
+            self._sizes[key] = taille
+            self.nbytes += taille
+            while len(self._entries) > 1 and (
+                    len(self._entries) > self.maxsize
+                    or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        if self._entries.pop(key, None) is not None:
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    def get_or_compute(self, key, compute):
+        """Retourne la valeur en cache, sinon la calcule (une seule fois) et la mémorise"""
+        sentinel = object()
+        with self._lock:
+            value = self.get(key, sentinel)
+            if value is not sentinel:
+                return value
+            en_cours = self._inflight.get(key)
+            if en_cours is None:
+                en_cours = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.dedup_hits += 1
+                leader = False
+        if not leader:
+            # Même calcul déjà lancé par une autre session : on attend son résultat
+            return en_cours.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            en_cours.set_exception(exc)
+            raise
+        else:
+            self.put(key, value)
+            en_cours.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Compteurs courants (pour l'affichage ou l'export).
+
+        ``dedup_rate`` : part des échecs servis par un calcul déjà en cours
+        plutôt que par un nouveau calcul.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'nbytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'dedup_hits': self.dedup_hits,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+                'dedup_rate': self.dedup_hits / self.misses if self.misses else 0.0,
+            }
+
+
+def make_data_key(selection, scenario, annees, model_version, source=None):
+    """Clé explicite d'un jeu de données : sélection, scénario, horizon, modèle, source"""
+    return ('advanced_data', selection, scenario, (annees[0], annees[-1], len(annees)), model_version, source)
+
+
+# Cache process-wide des DataFrames générés (les frames retournés sont
+# partagés entre sessions et ne doivent pas être modifiés en place).
+DATA_CACHE = DataCache(maxsize=256, ttl=3600.0, max_bytes=512 * 2**20)
@@ -0,0 +1,227 @@
+# data_sources.py
+"""Sources de données : simulation (par défaut) ou fichiers observés.
+
+Un fichier CSV, Parquet ou Arrow est converti une seule fois en cache
+colonnaire : un ``.npy`` par colonne, trié par (branche, année), ouvert en
+``mmap`` et accompagné d'un index des plages de lignes par branche. Les
+sections ne lisent ensuite que les tranches dont elles ont besoin ; les
+séries absentes du fichier (ou les pas sans observation) restent simulées.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Fichier de données observées utilisé par défaut par le dashboard et la CLI
+DATA_FILE_ENV = 'DASHBOARD_DATA_FILE'
+DATA_CACHE_DIR_ENV = 'DASHBOARD_DATA_CACHE_DIR'
+
+COLONNE_ANNEE = 'Annee'
+COLONNE_BRANCHE = 'Branche'
+
+# Lignes lues par paquet lors de la conversion (mémoire bornée)
+CHUNK_ROWS = 200_000
+
+
+def iter_chunks(path, chunksize=CHUNK_ROWS):
+    """Paquets de lignes (DataFrames) d'un fichier CSV, Parquet ou Arrow"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif extension == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif extension in ('.arrow', '.feather', '.ipc'):
+        import pyarrow as pa
+        with pa.memory_map(path) as fichier:
+            lecteur = pa.ipc.open_file(fichier)
+            for i in range(lecteur.num_record_batches):
+                yield lecteur.get_batch(i).to_pandas()
+    else:
+        raise ValueError(f"Format non supporté : {path} (attendu .csv, .parquet, .arrow/.feather)")
+
+
+def fingerprint(path):
+    """Empreinte d'un fichier source (chemin, taille, date de modification)"""
+    info = os.stat(path)
+    texte = f"{os.path.abspath(path)}|{info.st_size}|{info.st_mtime_ns}"
+    return hashlib.sha1(texte.encode('utf-8')).hexdigest()[:16]
+
+
+def convert(path, directory, chunksize=CHUNK_ROWS):
+    """Convertit ``path`` en cache colonnaire dans ``directory`` (écriture atomique)"""
+    temporaire = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(temporaire, exist_ok=True)
+    colonnes, branches, n = None, {}, 0
+    fichiers = {}
+    try:
+        # 1. Paquets ajoutés à des fichiers bruts, une colonne par fichier
+        for paquet in iter_chunks(path, chunksize):
+            if COLONNE_ANNEE not in paquet.columns:
+                raise ValueError(f"Colonne '{COLONNE_ANNEE}' absente de {path}")
+            if colonnes is None:
+                colonnes = [nom for nom in paquet.columns
+                            if nom not in (COLONNE_ANNEE, COLONNE_BRANCHE)
+                            and pd.api.types.is_numeric_dtype(paquet[nom])]
+                fichiers = {nom: open(os.path.join(temporaire, f'{i}.bin'), 'wb')
+                            for i, nom in enumerate([COLONNE_ANNEE, COLONNE_BRANCHE, *colonnes])}
+            if COLONNE_BRANCHE in paquet.columns:
+                codes_locaux, libelles = pd.factorize(paquet[COLONNE_BRANCHE].astype(str))
+                correspondance = np.array([branches.setdefault(b, len(branches)) for b in libelles], dtype=np.int32)
+                codes = correspondance[codes_locaux]
+            else:
+                codes = np.zeros(len(paquet), dtype=np.int32)
+            fichiers[COLONNE_BRANCHE].write(codes.tobytes())
+            for nom in [COLONNE_ANNEE, *colonnes]:
+                fichiers[nom].write(pd.to_numeric(paquet[nom], errors='coerce').to_numpy(np.float64).tobytes())
+            n += len(paquet)
+        for f in fichiers.values():
+            f.close()
+        if colonnes is None:
+            raise ValueError(f"Fichier vide : {path}")
+
+        def brut(nom, dtype):
+            chemin = fichiers[nom].name
+            return np.memmap(chemin, dtype=dtype, mode='r', shape=(n,)) if n else np.empty(0, dtype)
+
+        # 2. Tri par (branche, année) puis permutation colonne par colonne
+        codes = np.asarray(brut(COLONNE_BRANCHE, np.int32))
+        ordre = np.lexsort((np.asarray(brut(COLONNE_ANNEE, np.float64)), codes))
+        for i, nom in enumerate([COLONNE_ANNEE, *colonnes]):
+            source = brut(nom, np.float64)
+            cible = np.lib.format.open_memmap(os.path.join(temporaire, f'c{i}.npy'), mode='w+',
+                                              dtype=np.float64, shape=(n,))
+            for debut in range(0, n, chunksize):
+                cible[debut:debut + chunksize] = source[ordre[debut:debut + chunksize]]
+            cible.flush()
+            del cible, source
+
+        # 3. Index : plage de lignes [début, fin) de chaque branche
+        codes_tries = codes[ordre]
+        plages = {libelle: [int(np.searchsorted(codes_tries, code, 'left')),
+                            int(np.searchsorted(codes_tries, code, 'right'))]
+                  for libelle, code in branches.items()}
+        meta = {
+            'source': os.path.abspath(path),
+            'rows': n,
+            'columns': colonnes,
+            'files': {nom: f'c{i}.npy' for i, nom in enumerate([COLONNE_ANNEE, *colonnes])},
+            'branches': plages,
+        }
+        with open(os.path.join(temporaire, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        for f in fichiers.values():
+            os.remove(f.name)
+        os.replace(temporaire, directory)
+    except BaseException:
+        for f in fichiers.values():
+            f.close()
+        shutil.rmtree(temporaire, ignore_errors=True)
+        raise
+    return directory
+
+
+class ColumnarDataset:
+    """Cache colonnaire ouvert en ``mmap`` : seules les tranches lues sont chargées"""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.columns = self.meta['columns']
+        self.branches = list(self.meta['branches'])
+        self._data = {nom: np.load(os.path.join(directory, fichier), mmap_mode='r')
+                      for nom, fichier in self.meta['files'].items()}
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def rows(self, branche=None, debut=None, fin=None):
+        """Plage de lignes d'une branche (toutes si ``None``) entre ``debut`` et ``fin`` (exclu)"""
+        if branche is None or not self.branches:
+            premier, dernier = 0, len(self)
+        else:
+            premier, dernier = self.meta['branches'][branche]
+        annees = self._data[COLONNE_ANNEE][premier:dernier]
+        gauche = int(np.searchsorted(annees, debut, 'left')) if debut is not None else 0
+        droite = int(np.searchsorted(annees, fin, 'left')) if fin is not None else len(annees)
+        return slice(premier + gauche, premier + droite)
+
+    def frame(self, branche=None, debut=None, fin=None, colonnes=None):
+        """DataFrame de la tranche demandée (copie de la tranche seulement)"""
+        lignes = self.rows(branche, debut, fin)
+        noms = [COLONNE_ANNEE, *(colonnes if colonnes is not None else self.columns)]
+        return pd.DataFrame({nom: np.array(self._data[nom][lignes]) for nom in noms})
+
+    def resample(self, t, colonnes=None, branche=None):
+        """Moyenne des observations par pas de l'axe ``t`` (NaN si aucune)"""
+        t = np.asarray(t, dtype=np.float64)
+        pas = t[-1] - t[-2] if t.shape[0] > 1 else 1.0
+        lignes = self.rows(branche, t[0], t[-1] + pas)
+        pas_de_temps = np.searchsorted(t, self._data[COLONNE_ANNEE][lignes], 'right') - 1
+        resultats = {}
+        for nom in (colonnes if colonnes is not None else self.columns):
+            valeurs = self._data[nom][lignes]
+            valides = ~np.isnan(valeurs)
+            sommes = np.bincount(pas_de_temps[valides], weights=valeurs[valides], minlength=t.shape[0])
+            comptes = np.bincount(pas_de_temps[valides], minlength=t.shape[0])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                resultats[nom] = np.where(comptes > 0, sommes / comptes, np.nan)
+        return resultats
+
+
+class SimulatedSource:
+    """Source par défaut : toutes les séries viennent des simulateurs"""
+
+    fingerprint = None
+
+    def overlay(self, store, selection):
+        return []
+
+
+class FileSource:
+    """Séries observées lues dans un fichier local, simulées à défaut"""
+
+    def __init__(self, path, cache_dir=None, chunksize=CHUNK_ROWS):
+        self.path = path
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), '.cache_colonnaire')
+        self.chunksize = chunksize
+        self.fingerprint = fingerprint(path)
+        self._dataset = None
+
+    @property
+    def dataset(self):
+        """Cache colonnaire du fichier, converti au premier accès"""
+        if self._dataset is None:
+            directory = os.path.join(self.cache_dir, self.fingerprint)
+            if not os.path.exists(os.path.join(directory, 'meta.json')):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                convert(self.path, directory, self.chunksize)
+            self._dataset = ColumnarDataset(directory)
+        return self._dataset
+
+    def overlay(self, store, selection):
+        """Remplace dans ``store`` les pas observés ; retourne les colonnes concernées"""
+        dataset = self.dataset
+        if dataset.branches and selection not in dataset.branches:
+            return []
+        colonnes = [nom for nom in dataset.columns if nom in store]
+        observees = dataset.resample(store.index, colonnes, selection if dataset.branches else None)
+        remplacees = []
+        for nom, valeurs in observees.items():
+            masque = ~np.isnan(valeurs)
+            if masque.any():
+                store.column(nom)[masque] = valeurs[masque]
+                remplacees.append(nom)
+        return remplacees
+
+
+def source_from_env():
+    """``FileSource`` si ``DASHBOARD_DATA_FILE`` est défini, sinon la simulation"""
+    path = os.environ.get(DATA_FILE_ENV)
+    if not path:
+        return SimulatedSource()
+    return FileSource(path, os.environ.get(DATA_CACHE_DIR_ENV))
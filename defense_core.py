@@ -0,0 +1,375 @@
+# defense_core.py
+"""Noyau données/simulation de l'analyse stratégique Israël, sans interface.
+
+Importable sans Streamlit, Plotly ni Matplotlib : utilisé par le dashboard,
+la CLI headless et les outils de balayage.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import simulation_engine
+from alliance_store import PAGE_SIZE, get_alliance_store
+from data_cache import DATA_CACHE, make_data_key
+from data_sources import source_from_env
+from geospatial import PAS_KM, SITES_FILE_ENV, load_sites, sites_fingerprint, standardize_sites, threat_coverage
+from instrumentation import instrument_methods
+from registry import REGISTRY
+from response_optimizer import optimize_allocation
+from scenario_engine import SCENARIO_PAR_DEFAUT, ScenarioEngine
+from sensitivity import ECART, N_SOBOL, PARAMETRES, one_at_a_time, sobol_indices
+from simulation_engine import MODEL_VERSION, SimulationEngine, as_time_axis, config_defaults, time_axis
+
+
+@instrument_methods(generate_='data', simulate_='simulation')
+class DefenseIsraelModel:
+    """Options, tables de capacités/alliances et simulations (sans UI)"""
+    
+    def __init__(self, data_source=None, snapshot=None):
+        self.branches_options = self.define_branches_options()
+        self.programmes_options = self.define_programmes_options()
+        # Tables de référence typées, construites une fois par processus
+        self.registry = REGISTRY
+        self.military_capabilities = self.define_military_capabilities()
+        self.alliance_projects = self.define_alliance_projects()
+        self.engine = SimulationEngine()
+        self.scenario_engine = ScenarioEngine()
+        # Données observées (fichier) si configurées, simulateurs à défaut
+        self.data_source = data_source if data_source is not None else source_from_env()
+        # Bundle précalculé (snapshot_bundle) servant les frames sans calcul
+        self.snapshot = snapshot
+        
+    def define_branches_options(self):
+        return [
+            "Israël - Vue d'Ensemble", "Forces de Défense Israéliennes (Tsahal)", 
+            "Force Aérienne Israélienne", "Forces Terrestres", 
+            "Marine Israélienne", "Renseignement Militaire (Aman)",
+            "Alliances Stratégiques", "Coopérations Sécuritaires"
+        ]
+    
+    def define_programmes_options(self):
+        return [
+            "Défense Anti-Missile (Dôme de Fer)", "Supériorité Aérienne", 
+            "Renseignement Électronique", "Guerre Cyber Offensive",
+            "Forces Spéciales", "Armement de Précision",
+            "Coopération Régionale"
+        ]
+    
+    def define_military_capabilities(self):
+        return self.registry['capacites']
+    
+    def define_alliance_projects(self):
+        return self.registry['alliances']
+    
+    @property
+    def alliance_store(self):
+        """Catalogue des accords (SQLite indexé) : table de référence ou version courante du fichier"""
+        return get_alliance_store(self.alliance_projects)
+    
+    def generate_advanced_data(self, selection, scenario=None, debut=2000, fin=2027, frequence='annuelle'):
+        """Génère des données avancées et détaillées pour Israël (mémoïsées)"""
+        annees = time_axis(debut, fin, frequence)
+        key = make_data_key(selection, scenario, annees, MODEL_VERSION, self.data_source.fingerprint)
+        
+        # Même état de sidebar -> même frame, sans recalcul
+        return DATA_CACHE.get_or_compute(key, lambda: self._load_advanced_data(selection, annees, scenario))
+    
+    def _load_advanced_data(self, selection, annees, scenario=None):
+        """Frame du bundle précalculé s'il la contient, construite sinon"""
+        if self.snapshot is not None:
+            donnees = self.snapshot.frame(selection, scenario, annees)
+            if donnees is not None:
+                return donnees
+        return self._build_advanced_data(selection, annees, scenario)
+    
+    def _build_advanced_data(self, selection, annees, scenario=None):
+        """Construit le DataFrame des séries et la configuration d'une sélection"""
+        config = self.get_advanced_config(selection)
+        config['scenario'] = scenario or SCENARIO_PAR_DEFAUT
+        
+        # Toutes les séries (base + programmes prioritaires) écrites dans un bloc colonnaire
+        store = self.engine.run(annees, config)
+        
+        # Pas observés remplacés par les données réelles de la source
+        config['series_observees'] = self.data_source.overlay(store, selection)
+        
+        return store.to_frame(), config
+    
+    def generate_scenario_bands(self, df, config, max_points=None):
+        """Bandes Monte Carlo P5/P50/P95 du scénario de la configuration (mémoïsées).
+
+        Au-delà de ``max_points`` pas, les bandes sont calculées sur un
+        sous-ensemble régulier de l'axe : les percentiles d'un pas ne
+        dépendent pas de la densité de la grille.
+        """
+        scenario = config.get('scenario', SCENARIO_PAR_DEFAUT)
+        annees = df['Annee'].to_numpy(dtype=np.float64)
+        if max_points and len(annees) > max_points:
+            annees = annees[np.unique(np.linspace(0, len(annees) - 1, max_points).round().astype(np.int64))]
+        engine = self.scenario_engine
+        key = ('scenario_bands', scenario, config.get('budget_base'), (annees[0], annees[-1], len(annees)),
+               engine.n_trajectories, engine.seed, MODEL_VERSION)
+        return DATA_CACHE.get_or_compute(key, lambda: engine.bands(annees, config, scenario))
+    
+    def simulate_sensitivity(self, df, config, n=N_SOBOL, ecart=ECART, seed=0):
+        """Sensibilité des métriques de tête aux paramètres de ``config`` (mémoïsée).
+
+        Perturbations un à la fois (tornado) et indices de Sobol, évalués par
+        lots sur le graphe de calcul : ``n`` x (P + 2) jeux de paramètres.
+        """
+        defaults = config_defaults()
+        nominal = {p: float(config.get(p, defaults[p])) for p in PARAMETRES}
+        annees = df['Annee'].to_numpy(dtype=np.float64)[[0, -1]]
+        key = ('sensitivity', tuple(nominal.items()), tuple(annees), n, ecart, seed, MODEL_VERSION)
+        return DATA_CACHE.get_or_compute(key, lambda: self._build_sensitivity(annees, nominal, n, ecart, seed))
+    
+    def _build_sensitivity(self, annees, nominal, n, ecart, seed):
+        graph = self.engine.graph
+        debut = time.perf_counter()
+        oat = one_at_a_time(graph, annees, {}, nominal, ecart)
+        sobol, evaluations = sobol_indices(graph, annees, {}, nominal, n, ecart, seed)
+        return {
+            'oat': oat,
+            'sobol': sobol,
+            'evaluations': evaluations + 2 * len(nominal) + 1,
+            'duree_ms': 1000 * (time.perf_counter() - debut),
+        }
+    
+    def generate_alliance_view(self, filtres=(), page=1, page_size=PAGE_SIZE):
+        """Page d'accords filtrés et agrégats par type et statut (mémoïsés)"""
+        store = self.alliance_store
+        filtres = tuple(sorted(dict(filtres).items()))
+        key = ('alliance_view', store.digest, filtres, page, page_size)
+        return DATA_CACHE.get_or_compute(key, lambda: self._build_alliance_view(store, dict(filtres), page, page_size))
+    
+    def _build_alliance_view(self, store, filtres, page, page_size):
+        correspondants = store.count(filtres)
+        pages = max(1, -(-correspondants // page_size))
+        page = min(max(int(page), 1), pages)
+        return {
+            'total': len(store),
+            'correspondants': correspondants,
+            'page': page,
+            'pages': pages,
+            'accords': store.page(filtres, page, page_size),
+            'agregats': store.aggregate(filtres),
+        }
+    
+    def define_threat_sites(self):
+        """Sites de lancement et batteries : fichier ``DASHBOARD_SITES_FILE`` ou tables de référence"""
+        systemes = self.registry['systemes_defense'].frame()
+        portees = dict(zip(systemes['Système'], systemes['Portée_km']))
+        path = os.environ.get(SITES_FILE_ENV)
+        if path:
+            return load_sites(path, portees)
+        return (standardize_sites(self.registry['sites_lancement'].frame(), 'Menace'),
+                standardize_sites(self.registry['sites_defense'].frame(), 'Système', portees))
+    
+    def simulate_threat_coverage(self, pas_km=PAS_KM):
+        """Exposition aux menaces et couverture des batteries sur la grille (mémoïsée)"""
+        tables = [self.registry[nom] for nom in ('sites_lancement', 'sites_defense', 'systemes_defense')]
+        key = ('threat_coverage', sites_fingerprint(), *(t.digest for t in tables), float(pas_km))
+        return DATA_CACHE.get_or_compute(key, lambda: self._build_threat_coverage(pas_km))
+    
+    def _build_threat_coverage(self, pas_km):
+        lancements, defenses = self.define_threat_sites()
+        couverture = threat_coverage(lancements, defenses, pas_km=pas_km)
+        couverture.update(lancements=lancements, defenses=defenses)
+        return couverture
+    
+    def define_response_budgets(self):
+        """Budget actuel (Md$) de chaque domaine de réponse, pris sur la branche qui le finance"""
+        return {domaine: ligne['Part'] * self.military_capabilities[ligne['Branche']]['budget']
+                for domaine, ligne in self.registry['domaines_reponse'].items()}
+    
+    def simulate_threat_response(self, enveloppe=None):
+        """Répartition de l'enveloppe de réponse minimisant le risque attendu (mémoïsée).
+
+        Retourne l'allocation par domaine, l'efficacité par scénario et les
+        menaces dont le niveau de préparation est la couverture obtenue.
+        """
+        tables = [self.registry[nom] for nom in ('menaces', 'reponses', 'domaines_reponse')]
+        key = ('threat_response', enveloppe, self.military_capabilities.digest, *(t.digest for t in tables))
+        return DATA_CACHE.get_or_compute(key, lambda: self._build_threat_response(enveloppe))
+    
+    def _build_threat_response(self, enveloppe=None):
+        menaces, reponses = self.registry['menaces'], self.registry['reponses']
+        budgets = self.define_response_budgets()
+        domaines = list(budgets)
+        scenarios = reponses.frame()['Scénario'].tolist()
+        e0 = np.column_stack([reponses.columns[domaine] for domaine in domaines])
+        # Pertinence d'un domaine pour un scénario : sa part de l'efficacité observée
+        poids = e0 / e0.sum(axis=1, keepdims=True)
+        # Exposition d'un scénario : probabilité x impact des menaces qui le mobilisent
+        exposition = np.array([(menaces.columns['Probabilité'][lignes] * menaces.columns['Impact'][lignes]).sum()
+                               for lignes in (menaces.lookup('Réponse', s) for s in scenarios)])
+        
+        allocation = optimize_allocation(list(budgets.values()), e0, poids, exposition, enveloppe)
+        
+        couverture = dict(zip(scenarios, allocation.coverage.round(3)))
+        menaces_df = menaces.frame().assign(
+            Niveau_Preparation=[couverture[s] for s in menaces.columns['Réponse']])
+        reponses_df = pd.DataFrame(allocation.effectiveness.round(3), columns=domaines).assign(Scénario=scenarios)
+        allocation_df = pd.DataFrame({
+            'Domaine': domaines,
+            'Budget actuel (Md$)': allocation.baseline_budgets.round(2),
+            'Budget optimal (Md$)': allocation.budgets.round(2),
+        })
+        return {
+            'enveloppe': float(allocation.budgets.sum()),
+            'allocation': allocation_df,
+            'reponses': reponses_df[['Scénario', *domaines]],
+            'menaces': menaces_df,
+            'risque': allocation.risk,
+            'risque_actuel': allocation.baseline_risk,
+        }
+    
+    def get_advanced_config(self, selection):
+        """Configuration avancée avec plus de détails pour Israël"""
+        configs = {
+            "Israël - Vue d'Ensemble": {
+                "type": "puissance_regionale_avancee",
+                "budget_base": 24.3,
+                "personnel_base": 646.5,
+                "exercices_base": 85,
+                "priorites": ["defense_missile", "renseignement", "innovation", "cyber", "alliances", "precision"],
+                "doctrines": ["Dissuasion qualitative", "Défense active", "Frappe préemptive"],
+                "objectifs": "Maintien de l'avantage qualitatif et sécurité nationale"
+            },
+            "Force Aérienne Israélienne": {
+                "type": "suprematie_aerienne_regionale",
+                "budget_base": 8.7,
+                "personnel_base": 34,
+                "priorites": ["avions_5e_gen", "drones", "cyber_aerien", "renseignement"],
+                "capacites": ["F-35I Adir, F-16I Sufa", "Flotte de drones avancés", "Guerre électronique"],
+                "doctrine": "Qualitative Military Edge"
+            },
+            "Renseignement Militaire (Aman)": {
+                "type": "excellence_renseignement",
+                "budget_base": 4.5,
+                "personnel_base": 7,
+                "priorites": ["cyberint", "sigint", "humint", "analyse_ia"],
+                "capacites": ["Unit 8200", "Cyber-renseignement", "Surveillance régionale"],
+                "doctrine": "Prévention et anticipation"
+            },
+            "Alliances Stratégiques": {
+                "type": "cooperation_internationale",
+                "budget_base": 3.8,
+                "priorites": ["cooperation_usa", "normalisation_arabe", "partenariats_technologiques"],
+                "projets": ["Dôme de Fer", "Arrow System", "Exercices conjoints"],
+                "objectifs": "Renforcement des alliances stratégiques"
+            }
+        }
+        
+        return configs.get(selection, {
+            "type": "branche_militaire",
+            "personnel_base": 100,
+            "exercices_base": 20,
+            "priorites": ["defense_generique"]
+        })
+    
+    def simulate_advanced_budget(self, annees, config):
+        """Simulation avancée du budget avec variations géopolitiques"""
+        return self.engine.evaluate('Budget_Defense_Mds', as_time_axis(annees), config)
+    
+    def simulate_advanced_personnel(self, annees, config):
+        """Simulation avancée des effectifs"""
+        return self.engine.evaluate('Personnel_Milliers', as_time_axis(annees), config)
+    
+    def simulate_military_gdp_percentage(self, annees):
+        """Pourcentage du PIB consacré à la défense"""
+        return simulation_engine.pib_militaire(as_time_axis(annees))
+    
+    def simulate_advanced_exercises(self, annees, config):
+        """Exercices militaires avec saisonnalité"""
+        return self.engine.evaluate('Exercices_Militaires', as_time_axis(annees), config)
+    
+    def simulate_advanced_readiness(self, annees):
+        """Préparation opérationnelle avancée"""
+        return simulation_engine.readiness(as_time_axis(annees))
+    
+    def simulate_advanced_deterrence(self, annees):
+        """Capacité de dissuasion avancée"""
+        return simulation_engine.dissuasion(as_time_axis(annees))
+    
+    def simulate_advanced_mobilization(self, annees):
+        """Temps de mobilisation avancé"""
+        return simulation_engine.mobilisation(as_time_axis(annees))
+    
+    def simulate_joint_exercises(self, annees):
+        """Exercices conjoints avec alliés"""
+        return simulation_engine.exercices_conjoints(as_time_axis(annees))
+    
+    def simulate_tech_development(self, annees):
+        """Développement technologique global"""
+        return simulation_engine.developpement_technologique(as_time_axis(annees))
+    
+    def simulate_air_capacity(self, annees):
+        """Capacité aérienne globale"""
+        return simulation_engine.capacite_aerienne(as_time_axis(annees))
+    
+    def simulate_air_defense_coverage(self, annees):
+        """Couverture de défense anti-aérienne"""
+        return simulation_engine.couverture_ad(as_time_axis(annees))
+    
+    def simulate_alliance_cooperation(self, annees):
+        """Coopération avec alliances"""
+        return simulation_engine.cooperation_alliances(as_time_axis(annees))
+    
+    def simulate_cyber_capabilities(self, annees):
+        """Capacités cybernétiques"""
+        return simulation_engine.cyber_capabilities(as_time_axis(annees))
+    
+    def simulate_weapon_production(self, annees):
+        """Production d'armements (indice)"""
+        return simulation_engine.production_armements(as_time_axis(annees))
+    
+    def simulate_us_exercises(self, annees):
+        """Exercices avec USA"""
+        return simulation_engine.exercices_usa(as_time_axis(annees))
+    
+    def simulate_strategic_partnerships(self, annees):
+        """Partenariats stratégiques"""
+        return simulation_engine.partenariats_strategiques(as_time_axis(annees))
+    
+    def simulate_regional_cooperation(self, annees):
+        """Coopération régionale"""
+        return simulation_engine.cooperation_regionale(as_time_axis(annees))
+    
+    def simulate_iron_dome_interceptions(self, annees):
+        """Taux d'interception Dôme de Fer"""
+        return simulation_engine.interceptions_dome_fer(as_time_axis(annees))
+    
+    def simulate_missile_defense_coverage(self, annees):
+        """Couverture défense missile"""
+        return simulation_engine.couverture_defense_missile(as_time_axis(annees))
+    
+    def simulate_ad_systems(self, annees):
+        """Systèmes de défense anti-missile déployés"""
+        return simulation_engine.systemes_ad(as_time_axis(annees))
+    
+    def simulate_sigint_capabilities(self, annees):
+        """Capacités SIGINT"""
+        return simulation_engine.capacites_sigint(as_time_axis(annees))
+    
+    def simulate_cyber_operations(self, annees):
+        """Opérations cyber offensives"""
+        return simulation_engine.operations_cyber(as_time_axis(annees))
+    
+    def simulate_early_warning(self, annees):
+        """Alertes précoces réussies"""
+        return simulation_engine.alertes_prevention(as_time_axis(annees))
+    
+    def simulate_defense_research(self, annees):
+        """Recherche défense"""
+        return simulation_engine.recherche_defense(as_time_axis(annees))
+    
+    def simulate_emerging_tech(self, annees):
+        """Technologies émergentes"""
+        return simulation_engine.technologies_emergentes(as_time_axis(annees))
+    
+    def simulate_weapon_exports(self, annees):
+        """Exportations d'armes (milliards USD)"""
+        return simulation_engine.exportations_armes(as_time_axis(annees))
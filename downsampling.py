@@ -0,0 +1,71 @@
+# downsampling.py
+"""Réduction côté serveur des séries longues avant envoi au navigateur.
+
+Un graphique ne peut pas afficher plus de points qu'il n'a de pixels en
+largeur : au-delà de ``PIXEL_BUDGET`` points, les séries sont réduites par
+LTTB (Largest Triangle Three Buckets, forme visuelle préservée) ou par
+min/max par intervalle (extrêmes préservés).
+"""
+import numpy as np
+
+# Points maximum par trace (largeur utile d'un graphique, en pixels)
+PIXEL_BUDGET = 1000
+
+
+def lttb_indices(x, y, n_out):
+    """Indices retenus par LTTB (premier et dernier points toujours inclus)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 intervalles entre le premier et le dernier point
+    bornes = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    precedent = 0
+    for k in range(n_out - 2):
+        debut, fin = bornes[k], bornes[k + 1]
+        # Sommet suivant : moyenne de l'intervalle suivant (ou dernier point)
+        suivant_debut, suivant_fin = fin, (bornes[k + 2] if k + 2 < len(bornes) else n)
+        x_moyen = x[suivant_debut:suivant_fin].mean()
+        y_moyen = y[suivant_debut:suivant_fin].mean()
+        # Aire du triangle (précédent retenu, candidat, moyenne suivante)
+        aires = np.abs((x[precedent] - x_moyen) * (y[debut:fin] - y[precedent])
+                       - (x[precedent] - x[debut:fin]) * (y_moyen - y[precedent]))
+        precedent = debut + int(np.argmax(aires))
+        indices[k + 1] = precedent
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """Indices du minimum et du maximum de chaque intervalle, dans l'ordre"""
+    y = np.asarray(y, dtype=np.float64)
+    n = y.shape[0]
+    # Deux points par intervalle, plus le premier et le dernier
+    n_intervalles = (n_out - 2) // 2
+    if n_out >= n or n_intervalles < 1:
+        return np.arange(n)
+
+    bornes = np.linspace(0, n, n_intervalles + 1).astype(np.int64)
+    retenus = [0, n - 1]
+    for debut, fin in zip(bornes[:-1], bornes[1:]):
+        if fin > debut:
+            morceau = y[debut:fin]
+            retenus += [debut + int(np.argmin(morceau)), debut + int(np.argmax(morceau))]
+    return np.unique(retenus)
+
+
+def downsample(x, y, n_out=PIXEL_BUDGET, method='lttb'):
+    """Série ``(x, y)`` réduite à ``n_out`` points au plus (inchangée si plus courte)"""
+    x, y = np.asarray(x), np.asarray(y)
+    if x.shape[0] <= n_out:
+        return x, y
+    if method == 'lttb':
+        indices = lttb_indices(x, y, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Méthode de réduction inconnue: {method}")
+    return x[indices], y[indices]
@@ -0,0 +1,86 @@
+# figure_cache.py
+"""Cache process-wide des figures Plotly construites sur des données statiques.
+
+Une figure est identifiée par le hash de son contenu source (données et mise
+en page) : elle est construite, validée et sérialisée une seule fois, puis
+réutilisée par tous les reruns et toutes les sessions.
+"""
+import hashlib
+import json
+import threading
+
+import plotly.graph_objects as go
+
+
+def content_hash(*parts):
+    """Hash stable (SHA-1) d'objets JSON-sérialisables"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FrozenFigure(go.Figure):
+    """Figure en lecture seule dont le dict et le JSON sont mémoïsés.
+
+    ``st.plotly_chart`` appelle ``to_dict()`` à chaque émission : la version
+    figée renvoie le dictionnaire déjà validé au lieu d'en refaire une copie
+    profonde. La figure ne doit plus être modifiée après mise en cache.
+    """
+
+    @classmethod
+    def from_json(cls, texte):
+        """Figure figée reconstituée depuis son JSON, sans reconstruire l'arbre Plotly.
+
+        Seuls ``to_dict()`` et ``to_json()`` sont disponibles (émission).
+        """
+        figure = cls.__new__(cls)
+        figure.__dict__.update(_frozen_json=texte, _frozen_dict=json.loads(texte))
+        return figure
+
+    def to_dict(self):
+        frozen = self.__dict__.get('_frozen_dict')
+        if frozen is None:
+            frozen = super().to_dict()
+            self._frozen_dict = frozen
+        return frozen
+
+    def to_json(self, *args, **kwargs):
+        if args or kwargs:
+            return super().to_json(*args, **kwargs)
+        frozen = self.__dict__.get('_frozen_json')
+        if frozen is None:
+            frozen = super().to_json()
+            self._frozen_json = frozen
+        return frozen
+
+
+class FigureCache:
+    """Figures construites une fois par processus, indexées par hash de contenu"""
+
+    def __init__(self):
+        self._figures = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, name, source, layout, builder):
+        """Retourne la figure ``name`` pour ``source``/``layout``, construite au besoin"""
+        key = (name, content_hash(source, layout))
+        figure = self._figures.get(key)
+        if figure is not None:
+            self.hits += 1
+            return figure
+        figure = FrozenFigure(builder())
+        figure.to_json()
+        with self._lock:
+            self.misses += 1
+            return self._figures.setdefault(key, figure)
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+    def stats(self):
+        return {'figures': len(self._figures), 'hits': self.hits, 'misses': self.misses}
+
+
+FIGURE_CACHE = FigureCache()
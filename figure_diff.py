@@ -0,0 +1,168 @@
+# figure_diff.py
+"""Suivi par session des figures Plotly déjà envoyées au navigateur.
+
+Streamlit remplace un message par une référence de quelques octets
+(``ref_hash``) quand le navigateur l'a déjà en cache, à condition qu'il soit
+identique à l'octet près et dépasse ``global.minCachedMessageSize`` (10 Ko par
+défaut : la plupart des graphiques du dashboard étaient renvoyés en entier à
+chaque rerun). ``enable_reference_cache`` abaisse ce seuil ; le registre de
+session retient l'empreinte de la dernière figure émise à chaque emplacement,
+distingue les figures servies par référence de celles réellement envoyées et,
+pour une figure modifiée, les traces qui ont changé.
+"""
+import contextvars
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+# Taille minimale (octets) d'un message mis en cache par le navigateur
+MIN_CACHED_BYTES_ENV = 'DASHBOARD_MIN_CACHED_BYTES'
+MIN_CACHED_BYTES = 1024
+
+# Reruns pendant lesquels un message inutilisé reste dans le cache du navigateur
+MAX_CACHED_AGE = 2
+
+_ACTIVE = contextvars.ContextVar('figure_ledger', default=None)
+
+# Seuil appliqué au premier lancement, pas à chaque rerun
+_REFERENCE_CACHE_SET = False
+
+
+def active():
+    """Registre de la session courante ou ``None``"""
+    return _ACTIVE.get()
+
+
+def enable_reference_cache(min_bytes=None):
+    """Abaisse le seuil de mise en cache des messages (graphiques réémis par référence).
+
+    Appliqué une fois par processus. Sans ``min_bytes`` ni
+    ``DASHBOARD_MIN_CACHED_BYTES``, une valeur fixée par l'opérateur
+    (``config.toml``, ligne de commande) est conservée.
+    """
+    global _REFERENCE_CACHE_SET
+    from streamlit import config
+    from streamlit.config_option import ConfigOption
+
+    if _REFERENCE_CACHE_SET:
+        return
+    _REFERENCE_CACHE_SET = True
+    if min_bytes is None:
+        if MIN_CACHED_BYTES_ENV in os.environ:
+            min_bytes = int(os.environ[MIN_CACHED_BYTES_ENV])
+        elif config.get_where_defined('global.minCachedMessageSize') != ConfigOption.DEFAULT_DEFINITION:
+            return
+        else:
+            min_bytes = MIN_CACHED_BYTES
+    config.set_option('global.minCachedMessageSize', float(min_bytes))
+
+
+def figure_json(figure):
+    """JSON émis pour ``figure`` (mémoïsé par les figures figées)"""
+    if isinstance(figure, dict):
+        return json.dumps(figure, sort_keys=True)
+    return figure.to_json()
+
+
+def figure_digest(figure):
+    """Empreinte (SHA-1) du JSON d'une figure, mémoïsée sur les figures figées"""
+    attributs = getattr(figure, '__dict__', {})
+    digest = attributs.get('_frozen_digest')
+    if digest is None:
+        digest = hashlib.sha1(figure_json(figure).encode('utf-8')).hexdigest()
+        if '_frozen_json' in attributs:
+            attributs['_frozen_digest'] = digest
+    return digest
+
+
+def figure_slot(figure, ordinal):
+    """Emplacement d'une figure : son titre, à défaut son rang dans le rerun"""
+    layout = (figure if isinstance(figure, dict) else figure.to_dict()).get('layout', {})
+    titre = layout.get('title')
+    titre = titre.get('text') if isinstance(titre, dict) else titre
+    return titre or f'#{ordinal}'
+
+
+def trace_digests(texte):
+    """Empreintes des traces d'un JSON de figure"""
+    return [hashlib.sha1(json.dumps(trace, sort_keys=True).encode('utf-8')).hexdigest()
+            for trace in json.loads(texte).get('data', [])]
+
+
+class FigureLedger:
+    """Figures envoyées à une session : dernière empreinte par emplacement.
+
+    Le cache du navigateur est modélisé comme celui de Streamlit : une figure
+    émise lors d'un des ``max_age`` derniers reruns est servie par référence.
+    """
+
+    def __init__(self, max_age=MAX_CACHED_AGE):
+        self.max_age = max_age
+        self.slots = {}
+        self.cached = {}
+        self.rerun = 0
+        self.stats = self._empty_stats()
+        self._ordinal = 0
+
+    @staticmethod
+    def _empty_stats():
+        return {'figures': 0, 'references': 0, 'envoyees': 0, 'modifiees': 0,
+                'traces': 0, 'traces_modifiees': 0, 'octets_envoyes': 0, 'octets_evites': 0}
+
+    @contextmanager
+    def activate(self):
+        """Suit les figures émises pendant le bloc (un rerun)"""
+        self.rerun += 1
+        self.stats = self._empty_stats()
+        self._ordinal = 0
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+            self.cached = {digest: rerun for digest, rerun in self.cached.items()
+                           if self.rerun - rerun < self.max_age}
+
+    def observe(self, figure):
+        """Classe une figure émise : servie par référence, modifiée ou nouvelle"""
+        self._ordinal += 1
+        texte = figure_json(figure)
+        digest = figure_digest(figure)
+        slot = figure_slot(figure, self._ordinal)
+        stats = self.stats
+        stats['figures'] += 1
+        # Le navigateur annonce son cache au début du rerun
+        en_cache = self.cached.get(digest, self.rerun) < self.rerun
+        self.cached[digest] = self.rerun
+        precedent = self.slots.get(slot)
+        if en_cache:
+            stats['references'] += 1
+            stats['octets_evites'] += len(texte)
+            if precedent is None or precedent[0] != digest:
+                self.slots[slot] = (digest, None)
+            return 'reference'
+
+        stats['envoyees'] += 1
+        stats['octets_envoyes'] += len(texte)
+        traces = trace_digests(texte)
+        self.slots[slot] = (digest, traces)
+        if precedent is None or precedent[1] is None:
+            return 'nouvelle'
+        # Traces réellement modifiées (le frontend reçoit toutefois la figure entière)
+        anciennes = precedent[1]
+        modifiees = sum(1 for i, trace in enumerate(traces) if i >= len(anciennes) or anciennes[i] != trace)
+        stats['modifiees'] += 1
+        stats['traces'] += len(traces)
+        stats['traces_modifiees'] += modifiees
+        return 'modifiee'
+
+
+def observe_emit(element, args, kwargs):
+    """Enregistre une figure émise vers Streamlit dans le registre actif"""
+    ledger = _ACTIVE.get()
+    if ledger is None or element != 'plotly_chart':
+        return
+    figure = args[0] if args else kwargs.get('figure_or_data')
+    if figure is not None:
+        ledger.observe(figure)
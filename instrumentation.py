@@ -0,0 +1,220 @@
+# instrumentation.py
+"""Instrumentation des reruns : temps mural, mémoire allouée, taille des payloads.
+
+L'instrumentation n'est active que dans un bloc ``Instrumentation.activate()``
+(panneau « ⏱️ Performance » ou export configuré) ; sinon les méthodes
+décorées ne font qu'une lecture de ``contextvars``.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_ACTIVE = contextvars.ContextVar('instrumentation', default=None)
+
+# Pile des appels mesurés, propre à chaque contexte (sections préparées en parallèle)
+_STACK = contextvars.ContextVar('instrumentation_stack', default=())
+
+# Éléments Streamlit dont la taille de payload est mesurée
+OBSERVED_ELEMENTS = {'plotly_chart', 'markdown'}
+
+# Fichier d'export (.prom pour Prometheus texte, sinon JSON lines)
+METRICS_FILE_ENV = 'DASHBOARD_METRICS_FILE'
+
+
+# tracemalloc est global au processus : démarré par la première activation qui
+# suit la mémoire, arrêté par la dernière (jamais pendant celle d'une autre session)
+_TRACING_LOCK = threading.Lock()
+_TRACING_USERS = 0
+_TRACING_OWNED = False
+
+
+def active():
+    """Instrumentation courante ou ``None``"""
+    return _ACTIVE.get()
+
+
+def _acquire_tracing():
+    global _TRACING_USERS, _TRACING_OWNED
+    with _TRACING_LOCK:
+        if _TRACING_USERS == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _TRACING_OWNED = True
+        _TRACING_USERS += 1
+
+
+def _release_tracing():
+    global _TRACING_USERS, _TRACING_OWNED
+    with _TRACING_LOCK:
+        _TRACING_USERS -= 1
+        # Un suivi démarré hors de ce module (``python -X tracemalloc``) n'est pas arrêté
+        if _TRACING_USERS == 0 and _TRACING_OWNED:
+            tracemalloc.stop()
+            _TRACING_OWNED = False
+
+
+class Instrumentation:
+    """Mesures d'un rerun, regroupées par appel instrumenté"""
+
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.records = []
+        self._token = None
+        self.started_at = None
+        self.total_s = 0.0
+
+    @contextmanager
+    def activate(self):
+        """Active la collecte pour la durée du bloc"""
+        if self.track_memory:
+            _acquire_tracing()
+        self._token = _ACTIVE.set(self)
+        self.started_at = time.time()
+        debut = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total_s = time.perf_counter() - debut
+            _ACTIVE.reset(self._token)
+            if self.track_memory:
+                _release_tracing()
+
+    @contextmanager
+    def measure(self, name, kind='section'):
+        """Mesure temps et allocation nette d'un bloc.
+
+        L'allocation est globale au processus : pour des sections préparées en
+        parallèle, elle inclut celle des sections concurrentes.
+        """
+        pile = _STACK.get()
+        parent = pile[-1] if pile else None
+        token = _STACK.set(pile + (name,))
+        memoire = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            duree = time.perf_counter() - debut
+            alloue = tracemalloc.get_traced_memory()[0] - memoire if memoire is not None else None
+            _STACK.reset(token)
+            self.records.append({
+                'name': name, 'kind': kind, 'parent': parent,
+                'seconds': duree, 'alloc_bytes': alloue, 'payload_bytes': None,
+            })
+
+    def observe_emit(self, element, args, kwargs):
+        """Enregistre la taille du payload d'un élément émis vers Streamlit"""
+        if element not in OBSERVED_ELEMENTS or not args:
+            return
+        contenu = args[0]
+        texte = contenu.to_json() if element == 'plotly_chart' else str(contenu)
+        pile = _STACK.get()
+        self.records.append({
+            'name': element, 'kind': 'payload', 'parent': pile[-1] if pile else None,
+            'seconds': None, 'alloc_bytes': None, 'payload_bytes': len(texte.encode('utf-8')),
+        })
+
+    def summary(self):
+        """Agrégats par (type, nom) : appels, temps total, allocation, octets"""
+        agregats = {}
+        for record in self.records:
+            nom = record['name'] if record['kind'] != 'payload' else f"{record['name']} @ {record['parent']}"
+            cle = (record['kind'], nom)
+            agregat = agregats.setdefault(cle, {'kind': record['kind'], 'name': nom, 'calls': 0,
+                                                'seconds': 0.0, 'alloc_bytes': 0, 'payload_bytes': 0})
+            agregat['calls'] += 1
+            agregat['seconds'] += record['seconds'] or 0.0
+            agregat['alloc_bytes'] += record['alloc_bytes'] or 0
+            agregat['payload_bytes'] += record['payload_bytes'] or 0
+        return sorted(agregats.values(), key=lambda a: (-a['seconds'], -a['payload_bytes']))
+
+    def export(self, path):
+        """Exporte vers ``path`` : Prometheus texte (.prom) ou JSON lines"""
+        if path.endswith('.prom'):
+            self.write_prometheus(path)
+        else:
+            self.append_jsonl(path)
+
+    def append_jsonl(self, path):
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps(dict(record, ts=self.started_at), ensure_ascii=False) + '\n')
+            f.write(json.dumps({'name': 'rerun', 'kind': 'total', 'seconds': self.total_s,
+                                'ts': self.started_at}) + '\n')
+
+    def write_prometheus(self, path):
+        """Écrit l'état du dernier rerun (format textfile collector, écriture atomique)"""
+        lignes = [
+            '# HELP dashboard_rerun_seconds Durée du dernier rerun instrumenté',
+            '# TYPE dashboard_rerun_seconds gauge',
+            f'dashboard_rerun_seconds {self.total_s:.6f}',
+            '# HELP dashboard_call_seconds Temps mural cumulé par appel instrumenté',
+            '# TYPE dashboard_call_seconds gauge',
+            '# HELP dashboard_call_alloc_bytes Allocation nette cumulée par appel instrumenté',
+            '# TYPE dashboard_call_alloc_bytes gauge',
+            '# HELP dashboard_payload_bytes Octets émis vers le navigateur par élément',
+            '# TYPE dashboard_payload_bytes gauge',
+        ]
+        for agregat in self.summary():
+            labels = f'kind="{agregat["kind"]}",name="{_escape(agregat["name"])}"'
+            if agregat['kind'] == 'payload':
+                lignes.append(f'dashboard_payload_bytes{{{labels}}} {agregat["payload_bytes"]}')
+            else:
+                lignes.append(f'dashboard_call_seconds{{{labels}}} {agregat["seconds"]:.6f}')
+                lignes.append(f'dashboard_call_alloc_bytes{{{labels}}} {agregat["alloc_bytes"]}')
+        temporaire = f'{path}.tmp'
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lignes) + '\n')
+        os.replace(temporaire, path)
+
+
+def _escape(valeur):
+    return str(valeur).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@contextmanager
+def measure(name, kind='section'):
+    """Mesure un bloc si une instrumentation est active, sinon ne fait rien"""
+    instrumentation = _ACTIVE.get()
+    if instrumentation is None:
+        yield
+        return
+    with instrumentation.measure(name, kind):
+        yield
+
+
+def observe_emit(element, args, kwargs):
+    instrumentation = _ACTIVE.get()
+    if instrumentation is not None:
+        instrumentation.observe_emit(element, args, kwargs)
+
+
+def instrumented(fonction, kind='section'):
+    """Décorateur : mesure chaque appel de ``fonction`` quand l'instrumentation est active"""
+    @functools.wraps(fonction)
+    def wrapper(*args, **kwargs):
+        instrumentation = _ACTIVE.get()
+        if instrumentation is None:
+            return fonction(*args, **kwargs)
+        with instrumentation.measure(fonction.__name__, kind):
+            return fonction(*args, **kwargs)
+    return wrapper
+
+
+def instrument_methods(**prefixes):
+    """Décorateur de classe : instrumente les méthodes par préfixe.
+
+    ``@instrument_methods(create_='section', simulate_='simulation')``
+    """
+    def decorate(cls):
+        for nom, valeur in list(vars(cls).items()):
+            for prefixe, kind in prefixes.items():
+                if nom.startswith(prefixe) and callable(valeur):
+                    setattr(cls, nom, instrumented(valeur, kind))
+                    break
+        return cls
+    return decorate
@@ -0,0 +1,310 @@
+# live_feed.py
+"""Flux temps réel : événements d'interception, d'alerte et de préparation.
+
+Les événements (JSON lines ``{"ts": 1718000000.5, "type": "interception",
+"valeur": 1}``) arrivent d'un fichier suivi (``tail:``), d'un journal rejoué
+(``replay:``) ou d'un socket local (``tcp://hôte:port``, ``unix:chemin``).
+Un thread de fond les agrège par paquets dans des anneaux de compartiments
+d'une seconde : la mémoire reste bornée quel que soit le débit, et
+l'interface lit un instantané à cadence fixe.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Source du flux ouverte par défaut par le dashboard
+LIVE_FEED_ENV = 'DASHBOARD_LIVE_FEED'
+
+# Types d'événements agrégés : type -> (libellé, agrégat affiché)
+EVENT_TYPES = {
+    'interception': ("Taux d'interception (%)", 'taux'),
+    'alerte': ("Alertes (par minute)", 'debit'),
+    'readiness': ("Préparation opérationnelle (%)", 'moyenne'),
+}
+
+# Événements accumulés avant d'être intégrés aux agrégats
+BATCH_SIZE = 1024
+BATCH_DELAY_S = 0.05
+
+# Reprise d'un flux en erreur : délai doublé à chaque échec consécutif, plafonné
+RETRY_DELAY_S = 2.0
+RETRY_MAX_S = 60.0
+
+# Flux arrêté et oublié quand aucune session ne l'a demandé depuis ce délai
+IDLE_TIMEOUT_S = 300.0
+
+
+class BucketRing:
+    """Anneau de compartiments temporels (nombre, somme) à capacité fixe"""
+
+    def __init__(self, capacity=3600, resolution=1.0):
+        self.capacity = capacity
+        self.resolution = resolution
+        self.ids = np.full(capacity, -1, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.latest = -1
+
+    def add(self, ts, valeurs):
+        """Intègre un paquet d'événements (horodatages, valeurs)"""
+        ids = np.floor(np.asarray(ts, dtype=np.float64) / self.resolution).astype(np.int64)
+        valeurs = np.asarray(valeurs, dtype=np.float64)
+        if ids.size == 0:
+            return
+        self.latest = max(self.latest, int(ids.max()))
+        # Événements plus anciens que la fenêtre de l'anneau : ignorés
+        recents = ids > self.latest - self.capacity
+        ids, valeurs = ids[recents], valeurs[recents]
+        slots = ids % self.capacity
+
+        # Compartiments recyclés : remis à zéro avant cumul
+        nouveaux = np.unique(ids)
+        perimes = self.ids[nouveaux % self.capacity] < nouveaux
+        recycles = nouveaux[perimes] % self.capacity
+        self.ids[recycles] = nouveaux[perimes]
+        self.counts[recycles] = 0
+        self.sums[recycles] = 0.0
+
+        self.counts += np.bincount(slots, minlength=self.capacity)
+        self.sums += np.bincount(slots, weights=valeurs, minlength=self.capacity)
+
+    def window(self, seconds):
+        """Compartiments des ``seconds`` dernières secondes, par ordre chronologique"""
+        n = min(self.capacity, max(1, int(seconds / self.resolution)))
+        ids = np.arange(self.latest - n + 1, self.latest + 1)
+        slots = ids % self.capacity
+        presents = self.ids[slots] == ids
+        return (ids * self.resolution,
+                np.where(presents, self.counts[slots], 0),
+                np.where(presents, self.sums[slots], 0.0))
+
+
+class RollingAggregates:
+    """Agrégats glissants par type d'événement, protégés par un verrou"""
+
+    def __init__(self, capacity=3600, resolution=1.0):
+        self._lock = threading.Lock()
+        self._rings = defaultdict(lambda: BucketRing(capacity, resolution))
+        self.total = 0
+        self.latest_ts = None
+
+    def fold(self, ts, types, valeurs):
+        """Intègre un paquet d'événements hétérogènes"""
+        ts, types, valeurs = np.asarray(ts), np.asarray(types), np.asarray(valeurs, dtype=np.float64)
+        with self._lock:
+            for nom in np.unique(types):
+                masque = types == nom
+                self._rings[str(nom)].add(ts[masque], valeurs[masque])
+            self.total += len(ts)
+            self.latest_ts = max(self.latest_ts or ts.max(), ts.max())
+
+    def snapshot(self, seconds=300):
+        """Instantané : dernières valeurs et série par seconde de chaque type"""
+        with self._lock:
+            series = {nom: ring.window(seconds) for nom, ring in self._rings.items()}
+            total, latest = self.total, self.latest_ts
+        frames, dernieres = {}, {}
+        for nom, (instants, comptes, sommes) in series.items():
+            agregat = EVENT_TYPES.get(nom, (nom, 'moyenne'))[1]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                if agregat == 'taux':
+                    valeurs = np.where(comptes > 0, 100 * sommes / comptes, np.nan)
+                elif agregat == 'debit':
+                    valeurs = sommes * 60.0
+                else:
+                    valeurs = np.where(comptes > 0, sommes / comptes, np.nan)
+            frames[nom] = pd.DataFrame({'Instant': pd.to_datetime(instants, unit='s'),
+                                        'Valeur': valeurs, 'Evenements': comptes})
+            # Dernière valeur : sur la dernière minute pour lisser
+            minute = slice(-60, None)
+            if agregat == 'debit':
+                dernieres[nom] = float(sommes[minute].sum())
+            elif comptes[minute].sum():
+                facteur = 100.0 if agregat == 'taux' else 1.0
+                dernieres[nom] = facteur * float(sommes[minute].sum() / comptes[minute].sum())
+            else:
+                dernieres[nom] = None
+        return {'total': total, 'latest_ts': latest, 'series': frames, 'latest': dernieres}
+
+
+# --- Sources d'événements (lignes JSON) --------------------------------------
+
+def tail_lines(path, poll=0.1, stop=None):
+    """Suit un fichier comme ``tail -f`` (à partir de la fin) ; ``None`` quand rien n'arrive"""
+    with open(path, encoding='utf-8') as f:
+        f.seek(0, os.SEEK_END)
+        while stop is None or not stop.is_set():
+            ligne = f.readline()
+            if ligne:
+                yield ligne
+            else:
+                yield None
+                time.sleep(poll)
+
+
+def replay_lines(path, speed=1.0, loop=True, stop=None):
+    """Rejoue un journal en respectant l'écart entre horodatages (``speed=0`` : au plus vite).
+
+    À chaque boucle les horodatages sont décalés de la durée du journal, pour
+    que les agrégats voient un temps croissant.
+    """
+    decalage = 0.0
+    while stop is None or not stop.is_set():
+        debut_reel, premier, dernier = time.monotonic(), None, None
+        with open(path, encoding='utf-8') as f:
+            for ligne in f:
+                if stop is not None and stop.is_set():
+                    return
+                try:
+                    evenement = json.loads(ligne)
+                except ValueError:
+                    evenement = None
+                if not isinstance(evenement, dict):
+                    # Ligne illisible transmise telle quelle : rejetée et comptée par ``consume``
+                    yield ligne
+                    continue
+                ts = evenement.get('ts')
+                if ts is not None:
+                    premier = ts if premier is None else premier
+                    dernier = ts
+                    if speed:
+                        attente = (ts - premier) / speed - (time.monotonic() - debut_reel)
+                        if attente > 0:
+                            time.sleep(attente)
+                    evenement['ts'] = ts + decalage
+                yield evenement
+        if not loop or premier is None:
+            return
+        decalage += dernier - premier + 1.0
+
+
+def socket_lines(address, stop=None):
+    """Lignes reçues d'un socket local (``hôte:port`` TCP ou chemin Unix)"""
+    if ':' in address and not address.startswith('/'):
+        hote, port = address.rsplit(':', 1)
+        connexion = socket.create_connection((hote, int(port)))
+    else:
+        connexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connexion.connect(address)
+    connexion.settimeout(0.5)
+    tampon = b''
+    with connexion:
+        while stop is None or not stop.is_set():
+            try:
+                recu = connexion.recv(65536)
+            except socket.timeout:
+                yield None
+                continue
+            if not recu:
+                return
+            tampon += recu
+            *lignes, tampon = tampon.split(b'\n')
+            for ligne in lignes:
+                yield ligne.decode('utf-8')
+
+
+def open_source(spec, stop=None):
+    """Itérateur de lignes d'après ``tail:chemin``, ``replay:chemin[@vitesse]``, ``tcp://hôte:port`` ou ``unix:chemin``"""
+    if spec.startswith('tail:'):
+        return tail_lines(spec[5:], stop=stop)
+    if spec.startswith('replay:'):
+        chemin, _, vitesse = spec[7:].partition('@')
+        return replay_lines(chemin, float(vitesse or 1.0), stop=stop)
+    if spec.startswith('tcp://'):
+        return socket_lines(spec[6:], stop=stop)
+    if spec.startswith('unix:'):
+        return socket_lines(spec[5:], stop=stop)
+    raise ValueError(f"Source de flux inconnue: {spec}")
+
+
+class LiveFeed:
+    """Consomme une source dans un thread de fond et alimente les agrégats"""
+
+    def __init__(self, spec, capacity=3600, resolution=1.0):
+        self.spec = spec
+        self.aggregates = RollingAggregates(capacity, resolution)
+        self.errors = 0
+        self.error = None
+        self.failures = 0
+        self._retry_at = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread de lecture ; un flux en erreur est relancé après son délai de reprise"""
+        if self._thread is None or not self._thread.is_alive():
+            if self.error is not None:
+                if time.monotonic() < self._retry_at:
+                    return self
+                self.error = None
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"flux {self.spec}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def consume(self, lignes):
+        """Analyse et intègre des lignes (ou événements déjà décodés) par paquets"""
+        ts, types, valeurs = [], [], []
+        echeance = time.monotonic() + BATCH_DELAY_S
+        for ligne in lignes:
+            # ``None`` : source inactive, le paquet en attente est tout de même publié
+            if ligne is not None:
+                try:
+                    evenement = ligne if isinstance(ligne, dict) else json.loads(ligne)
+                    type_, instant = evenement['type'], evenement.get('ts') or time.time()
+                    valeur = float(evenement.get('valeur', 1.0))
+                except (ValueError, KeyError, TypeError):
+                    self.errors += 1
+                    continue
+                types.append(type_)
+                ts.append(instant)
+                valeurs.append(valeur)
+            if not ts:
+                continue
+            if len(ts) >= BATCH_SIZE or time.monotonic() >= echeance:
+                self.aggregates.fold(ts, types, valeurs)
+                ts, types, valeurs = [], [], []
+                echeance = time.monotonic() + BATCH_DELAY_S
+        if ts:
+            self.aggregates.fold(ts, types, valeurs)
+
+    def _run(self):
+        recus = self.aggregates.total
+        try:
+            self.consume(open_source(self.spec, stop=self._stop))
+        except Exception as exc:
+            # Source inconnue, fichier absent, socket fermé... : signalé par le panneau
+            # et relancé plus tard (délai remis à zéro si des événements sont arrivés)
+            self.failures = 1 if self.aggregates.total > recus else self.failures + 1
+            self._retry_at = time.monotonic() + min(RETRY_DELAY_S * 2 ** (self.failures - 1), RETRY_MAX_S)
+            self.error = str(exc) or type(exc).__name__
+
+
+# Flux actifs du processus, partagés par les sessions et les reruns,
+# avec l'instant de leur dernière demande
+_FEEDS = {}
+_FEEDS_LOCK = threading.Lock()
+
+
+def get_feed(spec):
+    """Flux démarré pour ``spec`` (créé au premier appel) ; les flux délaissés sont arrêtés"""
+    maintenant = time.monotonic()
+    with _FEEDS_LOCK:
+        for ancien in [s for s, (_, demande) in _FEEDS.items() if maintenant - demande > IDLE_TIMEOUT_S]:
+            _FEEDS.pop(ancien)[0].stop()
+        feed = _FEEDS[spec][0] if spec in _FEEDS else LiveFeed(spec)
+        _FEEDS[spec] = (feed, maintenant)
+        return feed.start()
@@ -0,0 +1,340 @@
+# registry.py
+"""Registre des données de référence : capacités, alliances, menaces, systèmes.
+
+Chaque table est construite une seule fois par processus en colonnes NumPy
+en lecture seule. La clé donne une ligne en O(1), les index (branche, type,
+statut, pays...) les positions des lignes d'une valeur, et ``frame()`` un
+DataFrame partagé dont les colonnes numériques ne sont pas copiées.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def _column(values):
+    """Colonne typée en lecture seule : numérique si possible, objets sinon"""
+    values = list(values)
+    if values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        array = np.asarray(values)
+    else:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+    array.flags.writeable = False
+    return array
+
+
+class Record:
+    """Ligne d'une table : vue (table, position), sans copie des valeurs"""
+
+    __slots__ = ('table', 'position')
+
+    def __init__(self, table, position):
+        self.table = table
+        self.position = position
+
+    def __getitem__(self, column):
+        valeur = self.table.columns[column][self.position]
+        return valeur.item() if isinstance(valeur, np.generic) else valeur
+
+    def get(self, column, default=None):
+        """Valeur de ``column`` ; ``default`` si la colonne est absente ou vide pour cette ligne"""
+        if column not in self.table.columns:
+            return default
+        valeur = self[column]
+        return default if valeur is None else valeur
+
+    def keys(self):
+        return self.table.columns.keys()
+
+    def to_dict(self):
+        """Champs renseignés de la ligne"""
+        return {nom: self[nom] for nom in self.table.columns if self[nom] is not None}
+
+    def __repr__(self):
+        return f"Record({self.table.name}, {self.to_dict()!r})"
+
+
+class Table:
+    """Table immuable en colonnes, indexée par clé et par colonnes catégorielles.
+
+    ``separators`` déclare les colonnes multi-valuées (``{'pays': '/'}``) :
+    chaque valeur séparée est indexée.
+    """
+
+    def __init__(self, name, columns, key=None, indexes=(), separators=None):
+        self.name = name
+        self.columns = {nom: _column(valeurs) for nom, valeurs in columns.items()}
+        longueurs = {len(colonne) for colonne in self.columns.values()}
+        if len(longueurs) > 1:
+            raise ValueError(f"Table '{name}' : colonnes de longueurs différentes {sorted(longueurs)}")
+        self._length = longueurs.pop() if longueurs else 0
+        self.key = key
+        self._positions = {}
+        if key is not None:
+            self._positions = {valeur: i for i, valeur in enumerate(self.columns[key].tolist())}
+            if len(self._positions) != self._length:
+                raise ValueError(f"Table '{name}' : clé '{key}' non unique")
+        separators = separators or {}
+        self._indexes = {nom: self._build_index(nom, separators.get(nom)) for nom in indexes}
+        self._frame = None
+        contenu = json.dumps({nom: colonne.tolist() for nom, colonne in self.columns.items()},
+                             sort_keys=True, ensure_ascii=False, default=str)
+        # Empreinte du contenu (clé du cache de figures, sans resérialiser les données)
+        self.digest = hashlib.sha1(f"{name}|{contenu}".encode('utf-8')).hexdigest()
+
+    @classmethod
+    def from_mapping(cls, name, mapping, key, indexes=(), separators=None):
+        """Table depuis ``{clé: {champ: valeur}}`` ; un champ absent d'une ligne vaut ``None``"""
+        champs = list(dict.fromkeys(champ for ligne in mapping.values() for champ in ligne))
+        columns = {key: list(mapping)}
+        columns.update({champ: [ligne.get(champ) for ligne in mapping.values()] for champ in champs})
+        return cls(name, columns, key, indexes, separators)
+
+    def _build_index(self, column, separator=None):
+        positions = {}
+        for i, valeur in enumerate(self.columns[column].tolist()):
+            valeurs = [v.strip() for v in valeur.split(separator)] if separator else [valeur]
+            for v in valeurs:
+                positions.setdefault(v, []).append(i)
+        index = {}
+        for valeur, lignes in positions.items():
+            index[valeur] = np.array(lignes, dtype=np.intp)
+            index[valeur].flags.writeable = False
+        return index
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def __getitem__(self, key):
+        return Record(self, self._positions[key])
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def get(self, key, default=None):
+        position = self._positions.get(key)
+        return default if position is None else Record(self, position)
+
+    def keys(self):
+        return self._positions.keys()
+
+    def items(self):
+        """Couples (clé, ligne) dans l'ordre de la table"""
+        return ((cle, Record(self, i)) for cle, i in self._positions.items())
+
+    def records(self, positions=None):
+        """Lignes aux ``positions`` données (toutes par défaut)"""
+        positions = range(self._length) if positions is None else positions
+        return [Record(self, int(i)) for i in positions]
+
+    def values(self, column):
+        """Valeurs distinctes indexées de ``column``"""
+        return list(self._indexes[column])
+
+    def lookup(self, column, value):
+        """Positions des lignes dont ``column`` vaut ``value`` (O(1), tableau vide si aucune)"""
+        return self._indexes[column].get(value, np.empty(0, dtype=np.intp))
+
+    def where(self, criteria):
+        """Positions des lignes satisfaisant tous les critères ``{colonne: valeur}`` indexés"""
+        positions = None
+        for column, value in criteria.items():
+            lignes = self.lookup(column, value)
+            positions = lignes if positions is None else np.intersect1d(positions, lignes, assume_unique=True)
+        return np.arange(self._length) if positions is None else positions
+
+    def frame(self, positions=None):
+        """DataFrame de la table (construit une fois, partagé) ou des lignes ``positions``"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.columns, copy=False)
+        return self._frame if positions is None else self._frame.take(positions)
+
+    def to_dict(self):
+        """``{clé: {champ: valeur}}`` des champs renseignés (forme de ``from_mapping``)"""
+        return {cle: {nom: v for nom, v in ligne.to_dict().items() if nom != self.key}
+                for cle, ligne in self.items()}
+
+
+class Registry:
+    """Tables de référence par nom"""
+
+    def __init__(self, tables):
+        self.tables = {table.name: table for table in tables}
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def __contains__(self, name):
+        return name in self.tables
+
+    def __iter__(self):
+        return iter(self.tables)
+
+
+def define_military_capabilities():
+    return {
+        "Forces de Défense Israéliennes (Tsahal)": {
+            "budget": 24.3,
+            "personnel": 646.5,
+            "reservistes": 465,
+            "divisions": 12,
+            "equipements": "Merkava IV, Namer, Spike Missiles",
+            "technologies": "Systèmes C4I, Drones, IA militaire"
+        },
+        "Force Aérienne Israélienne": {
+            "budget": 8.7,
+            "personnel": 34,
+            "avions_combat": 362,
+            "helicopteres": 125,
+            "drones": 250,
+            "equipements": "F-35I Adir, F-16I Sufa, F-15I Ra'am",
+            "technologies": "Systèmes EW avancés, Cyber-défense aérienne"
+        },
+        "Forces Terrestres": {
+            "budget": 6.2,
+            "personnel": 133,
+            "chars": 2600,
+            "vehicules_blindes": 10000,
+            "artillerie": 600,
+            "equipements": "Chars Merkava, VCI Namer, Artillerie autonome",
+            "technologies": "Systèmes de combat numériques, Drones tactiques"
+        },
+        "Marine Israélienne": {
+            "budget": 2.8,
+            "personnel": 9.5,
+            "corvettes": 7,
+            "sous_marins": 6,
+            "patrouilleurs": 45,
+            "equipements": "Classe Sa'ar 6, Classe Dolphin",
+            "technologies": "Missiles navals Gabriel, Systèmes anti-missiles"
+        },
+        "Renseignement Militaire (Aman)": {
+            "budget": 4.5,
+            "personnel": 7,
+            "capacites": "SIGINT, IMINT, HUMINT, CYBINT",
+            "unites": "Unit 8200, Unit 504, Yaman",
+            "technologies": "Cyber-renseignement, IA analytique"
+        }
+    }
+
+
+def define_alliance_projects():
+    return {
+        "Coopération USA-Israël": {"pays": "États-Unis", "type": "Soutien militaire", "statut": "Actif", "debut": 2016, "financement": "3.8 Md$/an"},
+        "Dôme de Fer": {"pays": "Israël/USA", "type": "Défense anti-missile", "statut": "Opérationnel", "debut": 2011, "interceptions": "90%+"},
+        "Arrow System": {"pays": "Israël/USA", "type": "Defense missile balistique", "statut": "Opérationnel", "debut": 2000, "portee": "Haute altitude"},
+        "Exercice Juniper Cobra": {"pays": "USA/Israël", "type": "Exercice conjoint", "statut": "Biannuel", "debut": 2001, "effectifs": "5000+"},
+        "Accords d'Abraham": {"pays": "EAU/Bahreïn/Maroc/Soudan", "type": "Normalisation", "statut": "Actif", "debut": 2020, "domaines": "Sécurité, Économie"},
+        "Coopération Grèce-Chypre": {"pays": "Grèce/Chypre", "type": "Partage gaz/security", "statut": "Renforcement", "debut": 2016, "exercices": "Trident"}
+    }
+
+
+def define_reference_tables():
+    """Toutes les tables de référence du dashboard"""
+    return [
+        Table.from_mapping('capacites', define_military_capabilities(), key='branche'),
+        Table.from_mapping('alliances', define_alliance_projects(), key='projet',
+                           indexes=('type', 'statut', 'pays'), separators={'pays': '/'}),
+        Table('menaces_regionales', {
+            'Menace': ['Iran Nucléaire', 'Hezbollah (Roquettes)', 'Hamas (Gaza)',
+                       'Syrie (Conventionnel)', 'Cyber Attaques', 'Terrorisme'],
+            'Distance_km': [1000, 120, 60, 70, 0, 0],
+            'Capacite_Ennemie': [9, 8, 7, 6, 9, 6],
+            'Niveau_Alerte': [9, 8, 7, 5, 8, 6]
+        }, key='Menace'),
+        Table('systemes_defense', {
+            'Système': ['Dôme de Fer', 'Arrow 2/3', "David's Sling", 'Barrière Gaza', 'Barrière Liban'],
+            'Portée_km': [70, 100, 300, 0, 0],
+            'Taux_Interception': [90, 90, 90, 95, 95],
+            'Année_Déploiement': [2011, 2000, 2017, 2021, 2018]
+        }, key='Système'),
+        # Sites géolocalisés (coordonnées approchées) : lancement des menaces et batteries
+        Table('sites_lancement', {
+            'Site': ['Bande de Gaza', 'Sud-Liban', 'Damas', 'Téhéran'],
+            'Menace': ['Hamas (Gaza)', 'Hezbollah (Roquettes)', 'Syrie (Conventionnel)', 'Iran Nucléaire'],
+            'Latitude': [31.45, 33.27, 33.51, 35.69],
+            'Longitude': [34.40, 35.40, 36.29, 51.39],
+            'Portée_km': [160, 300, 300, 2000]
+        }, key='Site', indexes=('Menace',)),
+        # Portée des batteries : celle de leur système (table ``systemes_defense``)
+        Table('sites_defense', {
+            'Site': ['Sderot', 'Ashkelon', 'Beer-Sheva', 'Tel Aviv', 'Haïfa', 'Kiryat Shmona',
+                     'Eilat', 'Centre (Arrow)', "Centre (David's Sling)"],
+            'Système': ['Dôme de Fer', 'Dôme de Fer', 'Dôme de Fer', 'Dôme de Fer', 'Dôme de Fer',
+                        'Dôme de Fer', 'Dôme de Fer', 'Arrow 2/3', "David's Sling"],
+            'Latitude': [31.52, 31.67, 31.25, 32.08, 32.79, 33.21, 29.56, 31.90, 31.98],
+            'Longitude': [34.60, 34.57, 34.79, 34.78, 34.99, 35.57, 34.95, 34.75, 34.85]
+        }, key='Site', indexes=('Système',)),
+        Table('avantages', {
+            'Domaine': ['Renseignement Cyber', 'Force Aérienne', 'Défense Anti-Missile',
+                        'Forces Spéciales', 'Guerre Électronique', 'Drones', 'Précision'],
+            'Score_Israel': [10, 9, 10, 9, 10, 9, 10],
+            'Score_Voisins': [4, 6, 3, 5, 4, 5, 4]  # Meilleurs voisins
+        }, key='Domaine'),
+        Table('systemes_armes', {
+            'Système': ['F-35I Adir', 'Dôme de Fer', 'Arrow 3', 'Merkava IV',
+                        'Classe Sa\'ar 6', 'Système Trophy', 'Eitan APC'],
+            'Portée/Puissance': [2200, 70, 2400, 0, 0, 0, 0],
+            'Branche': ['Air Force', 'Défense', 'Défense', 'Armée', 'Marine', 'Armée', 'Armée'],
+            'Statut': ['Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Opérationnel', 'Développement']
+        }, key='Système', indexes=('Branche', 'Statut')),
+        Table('superiorite', {
+            'Domaine': ['Défense Anti-Missile', 'Drones de Combat', 'Guerre Cyber',
+                        'Renseignement SIGINT', 'Guerre Électronique', 'Armes de Précision'],
+            'Avance_Annees': [15, 10, 8, 12, 10, 8],
+            'Exportations_Mds': [2.5, 1.2, 1.8, 0.9, 0.7, 3.2]
+        }, key='Domaine'),
+        Table('reseau_alliances', {
+            'Alliance': ['USA-Israël', 'Accords Abraham (EAU)', 'Accords Abraham (Bahreïn)',
+                         'Grèce-Israël', 'Chypre-Israël', 'Coopération Jordanienne',
+                         'Coopération Égyptienne', 'Inde-Israël'],
+            'Niveau_Coopération': [10, 7, 6, 8, 8, 6, 5, 8],  # sur 10
+            'Année_Début': [1948, 2020, 2020, 2010, 2010, 1994, 1979, 1992],
+            'Domaines': ['Militaire', 'Économie/Sécurité', 'Économie/Sécurité', 'Énergie/Sécurité',
+                         'Énergie/Sécurité', 'Sécurité/Eau', 'Sécurité/Gaz', 'Militaire/Techno']
+        }, key='Alliance', indexes=('Domaines',), separators={'Domaines': '/'}),
+        Table('cooperation_future', {
+            'Domaine': ['Défense Anti-Missile Régionale', 'Guerre Cyber Collective',
+                        'Surveillance Spatiale', 'Guerre Électronique',
+                        'Renseignement Artificiel', 'Exercices Conjoints Avancés'],
+            'Potentiel': [8, 9, 7, 8, 9, 8]  # sur 10
+        }, key='Domaine'),
+        Table('menaces', {
+            'Type de Menace': ['Iran Nucléaire', 'Hezbollah (Liban)', 'Hamas (Gaza)',
+                               'Syrie (Conventionnel)', 'Guerre Cyber Iranienne',
+                               'Terrorisme Transfrontalier', 'Crise Jérusalem',
+                               'Prolifération Missiles'],
+            'Probabilité': [0.7, 0.8, 0.9, 0.6, 0.8, 0.7, 0.5, 0.8],
+            'Impact': [0.9, 0.8, 0.7, 0.6, 0.7, 0.6, 0.8, 0.7],
+            'Niveau_Preparation': [0.9, 0.8, 0.9, 0.7, 0.8, 0.9, 0.6, 0.8],
+            # Scénario de réponse (table ``reponses``) mobilisé par la menace
+            'Réponse': ['Frappe Iranienne', 'Attaque Hezbollah', 'Escalade Gaza',
+                        'Conflit Syrie', 'Cyber Attaque Majeure',
+                        'Escalade Gaza', 'Crise Multifront',
+                        'Frappe Iranienne']
+        }, key='Type de Menace', indexes=('Réponse',)),
+        Table('reponses', {
+            'Scénario': ['Frappe Iranienne', 'Attaque Hezbollah', 'Escalade Gaza',
+                         'Conflit Syrie', 'Cyber Attaque Majeure', 'Crise Multifront'],
+            'Force_Aerienne': [0.9, 0.8, 0.9, 0.8, 0.3, 0.8],
+            'Defense_Anti_Missile': [0.8, 0.9, 0.9, 0.7, 0.2, 0.8],
+            'Cybersécurité': [0.7, 0.6, 0.5, 0.4, 0.9, 0.6],
+            'Forces_Terrestres': [0.4, 0.7, 0.6, 0.5, 0.2, 0.7]
+        }, key='Scénario'),
+        # Domaines de réponse : branche qui les finance et part de son budget
+        Table('domaines_reponse', {
+            'Domaine': ['Force_Aerienne', 'Defense_Anti_Missile', 'Cybersécurité', 'Forces_Terrestres'],
+            'Branche': ['Force Aérienne Israélienne', 'Force Aérienne Israélienne',
+                        'Renseignement Militaire (Aman)', 'Forces Terrestres'],
+            'Part': [0.5, 0.5, 1.0, 1.0]
+        }, key='Domaine', indexes=('Branche',)),
+    ]
+
+
+# Construit une fois par processus, partagé par les modèles, sessions et reruns
+REGISTRY = Registry(define_reference_tables())
@@ -0,0 +1,369 @@
+# rendering.py
+"""Rendu différé des sections du dashboard.
+
+Les sections appellent ``st.*`` via un proxy : par défaut les appels vont à
+Streamlit, mais dans un bloc ``SectionRecorder`` ils sont enregistrés sous
+forme d'opérations rejouables. Une section peut ainsi être exécutée une
+seule fois puis réémise depuis le cache.
+
+``st.live_slot(nom)`` marque dans une section l'emplacement d'un rendu temps
+réel : enregistré comme une opération, il est rempli à l'émission par la
+fonction que ``live_slots`` associe à ``nom`` (rien sinon), hors du cache.
+"""
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import figure_diff
+import instrumentation
+from data_cache import DataCache, estimate_nbytes
+
+_TARGET = contextvars.ContextVar('render_target', default=None)
+
+# Éléments Streamlit qui ouvrent des conteneurs (colonnes, onglets, ...)
+_MULTI_CONTAINERS = {'columns', 'tabs'}
+_SINGLE_CONTAINERS = {'container', 'expander', 'popover'}
+
+RecordedOp = namedtuple('RecordedOp', 'name args kwargs children')
+
+# Emplacements temps réel : nom -> fonction de rendu pendant l'émission
+LIVE_SLOT = 'live_slot'
+_LIVE = contextvars.ContextVar('live_slots', default={})
+
+# Préparation parallèle des sections : nombre de threads (0 : séquentiel) et
+# délai maximal d'attente d'une section (secondes)
+SECTION_WORKERS_ENV = 'DASHBOARD_SECTION_WORKERS'
+SECTION_TIMEOUT_ENV = 'DASHBOARD_SECTION_TIMEOUT'
+
+
+def _streamlit():
+    import streamlit
+    return streamlit
+
+
+def _observed(name, element):
+    """Enveloppe un élément Streamlit pour mesurer son payload à l'émission"""
+    @functools.wraps(element)
+    def emit(*args, **kwargs):
+        instrumentation.observe_emit(name, args, kwargs)
+        figure_diff.observe_emit(name, args, kwargs)
+        return element(*args, **kwargs)
+    return emit
+
+
+@contextlib.contextmanager
+def live_slots(renderers):
+    """Rendus temps réel (nom -> fonction) des emplacements ``st.live_slot`` émis dans le bloc"""
+    token = _LIVE.set(dict(renderers))
+    try:
+        yield
+    finally:
+        _LIVE.reset(token)
+
+
+def _fill_live_slot(name, container=None):
+    renderer = _LIVE.get().get(name)
+    if renderer is None:
+        return
+    with container if container is not None else contextlib.nullcontext():
+        renderer()
+
+
+class _StreamlitProxy:
+    """Redirige ``st.*`` vers la cible de rendu courante (Streamlit par défaut)"""
+
+    def __getattr__(self, name):
+        target = _TARGET.get()
+        if target is not None:
+            return getattr(target, name)
+        if name == LIVE_SLOT:
+            return _fill_live_slot
+        element = getattr(_streamlit(), name)
+        if name in instrumentation.OBSERVED_ELEMENTS and (instrumentation.active() is not None
+                                                          or figure_diff.active() is not None):
+            return _observed(name, element)
+        return element
+
+
+st = _StreamlitProxy()
+
+
+class RecordedContainer:
+    """Conteneur enregistré (racine, colonne, onglet, expander...)"""
+
+    def __init__(self, recorder):
+        self._recorder = recorder
+        self.ops = []
+
+    def __enter__(self):
+        self._recorder._stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        self._recorder._stack.pop()
+        return False
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            return self._recorder._record(self, name, args, kwargs)
+        return record
+
+
+class SectionRecorder:
+    """Capture les appels ``st.*`` d'une section au lieu de les émettre"""
+
+    def __init__(self):
+        self.root = RecordedContainer(self)
+        self._stack = [self.root]
+        self._token = None
+
+    @property
+    def ops(self):
+        return self.root.ops
+
+    def __enter__(self):
+        self._token = _TARGET.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _TARGET.reset(self._token)
+        return False
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._stack[-1], name)
+
+    def _record(self, container, name, args, kwargs):
+        if name in _MULTI_CONTAINERS:
+            spec = args[0] if args else kwargs.get('spec', kwargs.get('tabs'))
+            count = spec if isinstance(spec, int) else len(spec)
+            children = [RecordedContainer(self) for _ in range(count)]
+            container.ops.append(RecordedOp(name, args, kwargs, children))
+            return children
+        if name in _SINGLE_CONTAINERS:
+            child = RecordedContainer(self)
+            container.ops.append(RecordedOp(name, args, kwargs, [child]))
+            return child
+        container.ops.append(RecordedOp(name, args, kwargs, None))
+        return None
+
+
+def figure_nbytes(figure):
+    """Taille approximative d'une figure : JSON déjà mémoïsé, sinon tableaux de ses traces et mise en page"""
+    texte = figure.__dict__.get('_frozen_json')
+    if texte is not None:
+        return len(texte)
+    # Propriétés lues en place : ``to_plotly_json`` en ferait une copie profonde
+    return sum(estimate_nbytes(objet._props or {}) for objet in (*figure.data, figure.layout))
+
+
+def ops_nbytes(ops):
+    """Taille approximative d'opérations enregistrées (figures estimées sans sérialisation)"""
+    total = 0
+    for op in ops:
+        for valeur in (*op.args, *op.kwargs.values()):
+            total += figure_nbytes(valeur) if hasattr(valeur, 'to_plotly_json') else estimate_nbytes(valeur)
+        for child in op.children or []:
+            total += ops_nbytes(child.ops)
+    return total
+
+
+# Sorties de sections partagées par toutes les sessions du processus
+SECTION_STORE_MB_ENV = 'DASHBOARD_SECTION_STORE_MB'
+SECTION_STORE = DataCache(maxsize=512, ttl=3600.0, sizeof=ops_nbytes,
+                          max_bytes=int(float(os.environ.get(SECTION_STORE_MB_ENV, 256)) * 2**20))
+
+
+def record(renderer):
+    """Exécute ``renderer`` en enregistrant ses appels, retourne les opérations"""
+    with SectionRecorder() as recorder:
+        renderer()
+    return recorder.ops
+
+
+def replay(ops, target=st):
+    """Réémet des opérations enregistrées vers ``target`` (Streamlit ou conteneur)"""
+    for op in ops:
+        if op.name == LIVE_SLOT:
+            _fill_live_slot(*op.args, container=None if target is st else target)
+            continue
+        if target is not st and _TARGET.get() is None:
+            # Émission directe vers un conteneur Streamlit (le proxy ne la voit pas)
+            instrumentation.observe_emit(op.name, op.args, op.kwargs)
+            figure_diff.observe_emit(op.name, op.args, op.kwargs)
+        produced = getattr(target, op.name)(*op.args, **op.kwargs)
+        if op.children is None:
+            continue
+        containers = produced if isinstance(produced, (list, tuple)) else [produced]
+        for container, child in zip(containers, op.children):
+            replay(child.ops, container)
+
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def shared_executor():
+    """Pool de threads partagé par les sessions pour préparer les sections.
+
+    ``None`` si ``DASHBOARD_SECTION_WORKERS`` vaut 0 ou 1 (rendu séquentiel).
+    """
+    global _EXECUTOR
+    workers = os.environ.get(SECTION_WORKERS_ENV)
+    workers = int(workers) if workers else min(8, (os.cpu_count() or 1) + 4)
+    if workers <= 1:
+        return None
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='section')
+        return _EXECUTOR
+
+
+def section_timeout():
+    timeout = os.environ.get(SECTION_TIMEOUT_ENV)
+    return float(timeout) if timeout else None
+
+
+class SectionRenderer:
+    """Rend une liste de sections ``(libellé, fonction)``.
+
+    En mode immédiat toutes les sections sont construites dans des
+    ``st.tabs`` ; en mode paresseux seule la section active est exécutée, et
+    sa sortie enregistrée est conservée dans ``output_cache`` pour les reruns
+    suivants.
+
+    Le mode immédiat passe par le même cache : avec un ``executor``, les
+    sections sont enregistrées en parallèle puis émises dans l'ordre des
+    onglets (une section qui dépasse ``timeout`` secondes est signalée et
+    servie au rerun suivant) ; sans, elles sont préparées une à une.
+
+    ``snapshot`` (libellé -> opérations ou ``None``) fournit des sorties
+    précalculées, utilisées avant tout enregistrement.
+    """
+
+    def __init__(self, sections, cache_key=None, output_cache=None, executor=None, timeout=None,
+                 snapshot=None):
+        self.sections = list(sections)
+        self.cache_key = cache_key
+        self.output_cache = output_cache
+        self.executor = executor
+        self.timeout = timeout
+        self.snapshot = snapshot
+
+    @property
+    def labels(self):
+        return [label for label, _ in self.sections]
+
+    def render(self, lazy=True, nav_key='section_active'):
+        if lazy:
+            self.render_lazy(nav_key)
+        else:
+            self.render_eager()
+
+    def render_eager(self):
+        tabs = st.tabs(self.labels)
+        # Avec un executor, toutes les sections soumises d'abord ; sans, préparées
+        # une à une. Dans les deux cas via ``section_ops`` (snapshot, puis output_cache)
+        futures = None if self.executor is None else [self.prepare(label) for label in self.labels]
+        for i, (tab, label) in enumerate(zip(tabs, self.labels)):
+            with tab:
+                if futures is None:
+                    ops = self.section_ops(label)
+                else:
+                    try:
+                        ops = futures[i].result(timeout=self.timeout)
+                    except FutureTimeoutError:
+                        st.warning(f"⏳ Section « {label} » en cours de préparation : "
+                                   f"elle s'affichera au prochain rafraîchissement.")
+                        continue
+                with instrumentation.measure(f"emission {label}", 'emit'):
+                    replay(ops)
+
+    def render_lazy(self, nav_key='section_active'):
+        active = st.radio("Section", self.labels, horizontal=True,
+                          key=nav_key, label_visibility="collapsed")
+        ops = self.section_ops(active)
+        with instrumentation.measure(f"emission {active}", 'emit'):
+            replay(ops)
+
+    def prepare(self, label):
+        """Future des opérations d'une section, enregistrée dans ``executor``.
+
+        Le résultat est conservé dans ``output_cache`` même si le rerun n'a pas
+        attendu (délai dépassé).
+        """
+        # Contexte copié : instrumentation active et pile de mesure suivent la section
+        contexte = contextvars.copy_context()
+        return self.executor.submit(contexte.run, self.section_ops, label)
+
+    def section_ops(self, label):
+        """Opérations enregistrées d'une section (calculées au premier accès)"""
+        renderer = dict(self.sections)[label]
+
+        def compute():
+            ops = self.snapshot(label) if self.snapshot is not None else None
+            return ops if ops is not None else record(renderer)
+
+        if self.output_cache is None:
+            return compute()
+        return self.output_cache.get_or_compute((label, self.cache_key), compute)
+
+
+# Widgets Streamlit et valeur par défaut lorsqu'aucune n'est fournie
+_WIDGETS = {'radio', 'selectbox', 'checkbox', 'toggle', 'slider', 'select_slider',
+            'number_input', 'text_input', 'multiselect'}
+
+
+class StubStreamlit(SectionRecorder):
+    """Streamlit simulé sans navigateur ni runtime (benchmarks, exports).
+
+    Les appels sont enregistrés comme dans ``SectionRecorder`` ; les widgets
+    retournent la valeur fournie dans ``values`` (par clé ou par libellé),
+    sinon leur valeur par défaut.
+    """
+
+    def __init__(self, values=None):
+        super().__init__()
+        self.values = dict(values or {})
+        self.session_state = {}
+        self.sidebar = RecordedContainer(self)
+
+    def _record(self, container, name, args, kwargs):
+        if name == 'fragment':
+            # Décorateur : la fonction est exécutée une fois, sans rafraîchissement
+            return args[0] if args and callable(args[0]) else (lambda fonction: fonction)
+        produced = super()._record(container, name, args, kwargs)
+        if name in _WIDGETS:
+            return self._widget_value(name, args, kwargs)
+        return produced
+
+    def _widget_value(self, name, args, kwargs):
+        label = args[0] if args else kwargs.get('label')
+        key = kwargs.get('key')
+        if key is not None and key in self.values:
+            value = self.values[key]
+        elif label in self.values:
+            value = self.values[label]
+        elif key is not None and key in self.session_state:
+            value = self.session_state[key]
+        elif name in ('radio', 'selectbox', 'select_slider'):
+            options = list(args[1] if len(args) > 1 else kwargs.get('options', []))
+            value = options[kwargs.get('index', 0)] if options else None
+        elif name == 'multiselect':
+            value = list(kwargs.get('default') or [])
+        elif name in ('checkbox', 'toggle', 'text_input'):
+            value = kwargs.get('value', args[1] if len(args) > 1 else ('' if name == 'text_input' else False))
+        else:  # slider, number_input : (label, min_value, max_value, value)
+            value = kwargs.get('value', args[3] if len(args) > 3 else kwargs.get('min_value', args[1] if len(args) > 1 else 0))
+        if key is not None:
+            self.session_state[key] = value
+        return value
@@ -0,0 +1,360 @@
+# report.py
+"""Rapports statiques (HTML autonome, PDF) des sections du dashboard.
+
+Les sections sont exécutées hors navigateur (``StubStreamlit``) ou relues
+depuis le bundle précalculé, puis leurs opérations enregistrées sont
+converties en HTML. Un rapport embarque Plotly.js une seule fois et chaque
+figure distincte une seule fois (dédupliquée par hash de son JSON) ; les
+rapports d'un lot sont produits en parallèle dans un pool de processus.
+
+    python report.py -o rapports/ --selections "Force Aérienne Israélienne" --format html pdf
+"""
+import argparse
+import functools
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import tempfile
+import textwrap
+import time
+import unicodedata
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+FORMATS = ('html', 'pdf')
+
+# Rapport : titre, sections ``(libellé, html)`` et figures ``{hash: json}``
+Report = namedtuple('Report', 'title sections figures')
+
+REPORT_CSS = """
+<style>
+    body { font-family: "Source Sans Pro", Arial, sans-serif; max-width: 1400px; margin: 0 auto; padding: 1rem 2rem; }
+    nav ol { columns: 2; }
+    section.report-section { page-break-before: always; }
+    .columns { display: flex; gap: 1rem; }
+    .column { min-width: 0; }
+    .figure { width: 100%; }
+    .figure img { width: 100%; }
+    .metric { padding: 0.5rem 0; }
+    .metric-label { font-size: 0.9rem; color: #555; }
+    .metric-value { font-size: 2rem; }
+    .metric-delta.up { color: #09ab3b; }
+    .metric-delta.down { color: #ff2b2b; }
+    .metric-delta.off { color: #808495; }
+    .caption { font-size: 0.85rem; color: #808495; }
+    .alert { padding: 0.8rem 1rem; border-radius: 0.5rem; margin: 0.5rem 0; }
+    .alert-info { background: #e8f0fe; }
+    .alert-success { background: #e6f4ea; }
+    .alert-warning { background: #fef7e0; }
+    .alert-error { background: #fce8e6; }
+    table.dataframe { border-collapse: collapse; font-size: 0.85rem; }
+    table.dataframe td, table.dataframe th { border: 1px solid #ddd; padding: 0.2rem 0.5rem; }
+</style>
+"""
+
+# Création des figures interactives, une fois toutes les données chargées
+BOOTSTRAP_JS = """
+document.querySelectorAll('div[data-figure]').forEach(function (div) {
+    var figure = FIGURES[div.dataset.figure];
+    Plotly.newPlot(div, figure.data, figure.layout || {}, {responsive: true});
+});
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def plotly_js():
+    """Source de Plotly.js fournie avec le paquet plotly (lue une fois par processus)"""
+    from plotly.offline import get_plotlyjs
+    return get_plotlyjs()
+
+
+def _arguments(args, kwargs, *names):
+    """Arguments positionnels/nommés d'un appel ``st.*`` enregistré, par nom"""
+    valeurs = dict(zip(names, args))
+    valeurs.update((nom, kwargs[nom]) for nom in names if nom in kwargs)
+    return [valeurs.get(nom) for nom in names]
+
+
+def _script_json(texte):
+    """JSON sûr dans un élément ``<script>``"""
+    return texte.replace('</', '<\\/')
+
+
+class ReportBuilder:
+    """Convertit des opérations enregistrées en HTML, figures dédupliquées"""
+
+    def __init__(self):
+        self.figures = {}
+
+    def render(self, ops):
+        return ''.join(self.render_op(op) for op in ops)
+
+    def render_op(self, op):
+        element = getattr(self, f'_render_{op.name}', None)
+        if element is None:
+            return f'<!-- élément non exporté : {html.escape(op.name)} -->'
+        return element(op)
+
+    def _render_markdown(self, op):
+        texte, unsafe = _arguments(op.args, op.kwargs, 'body', 'unsafe_allow_html')
+        texte = textwrap.dedent(str(texte)).strip()
+        if unsafe:
+            return texte
+        texte = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(texte))
+        return ''.join(f'<p>{paragraphe}</p>' for paragraphe in texte.split('\n\n'))
+
+    def _render_write(self, op):
+        return f'<p>{html.escape(str(op.args[0]))}</p>' if op.args else ''
+
+    def _render_caption(self, op):
+        return f'<p class="caption">{html.escape(str(op.args[0]))}</p>'
+
+    def _render_title(self, op):
+        return f'<h1>{html.escape(str(op.args[0]))}</h1>'
+
+    def _render_header(self, op):
+        return f'<h2>{html.escape(str(op.args[0]))}</h2>'
+
+    def _render_subheader(self, op):
+        return f'<h3>{html.escape(str(op.args[0]))}</h3>'
+
+    def _render_alert(self, op):
+        return f'<div class="alert alert-{op.name}">{html.escape(str(op.args[0]))}</div>'
+
+    _render_info = _render_success = _render_warning = _render_error = _render_alert
+
+    def _render_live_slot(self, op):
+        # Rendu temps réel : sans objet dans un rapport figé
+        return ''
+
+    def _render_metric(self, op):
+        label, value, delta, delta_color = _arguments(op.args, op.kwargs, 'label', 'value', 'delta', 'delta_color')
+        sortie = (f'<div class="metric"><div class="metric-label">{html.escape(str(label))}</div>'
+                  f'<div class="metric-value">{html.escape(str(value))}</div>')
+        if delta not in (None, ''):
+            negatif = str(delta).lstrip().startswith('-')
+            sens = {'normal': ('down', 'up'), 'inverse': ('up', 'down')}.get(delta_color or 'normal', ('off', 'off'))
+            sortie += f'<div class="metric-delta {sens[0] if negatif else sens[1]}">{"▼" if negatif else "▲"} {html.escape(str(delta))}</div>'
+        return sortie + '</div>'
+
+    def _render_plotly_chart(self, op):
+        figure = _arguments(op.args, op.kwargs, 'figure_or_data')[0]
+        texte = figure.to_json() if hasattr(figure, 'to_json') else json.dumps(figure)
+        empreinte = hashlib.sha1(texte.encode('utf-8')).hexdigest()[:16]
+        self.figures.setdefault(empreinte, texte)
+        hauteur = (figure.to_dict() if hasattr(figure, 'to_dict') else figure).get('layout', {}).get('height') or 450
+        return f'<div class="figure" data-figure="{empreinte}" style="height: {hauteur}px"></div>'
+
+    def _render_dataframe(self, op):
+        data, hide_index = _arguments(op.args, op.kwargs, 'data', 'hide_index')
+        data = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        return data.to_html(index=not hide_index, classes='dataframe', border=0)
+
+    _render_table = _render_dataframe
+
+    def _render_columns(self, op):
+        spec = _arguments(op.args, op.kwargs, 'spec')[0]
+        poids = [1] * spec if isinstance(spec, int) else list(spec)
+        colonnes = ''.join(f'<div class="column" style="flex: {p}">{self.render(enfant.ops)}</div>'
+                           for p, enfant in zip(poids, op.children))
+        return f'<div class="columns">{colonnes}</div>'
+
+    def _render_tabs(self, op):
+        libelles = _arguments(op.args, op.kwargs, 'tabs')[0]
+        return ''.join(f'<h4>{html.escape(str(libelle))}</h4>{self.render(enfant.ops)}'
+                       for libelle, enfant in zip(libelles, op.children))
+
+    def _render_container(self, op):
+        return f'<div>{self.render(op.children[0].ops)}</div>'
+
+    def _render_expander(self, op):
+        label = _arguments(op.args, op.kwargs, 'label')[0]
+        return f'<details open><summary>{html.escape(str(label))}</summary>{self.render(op.children[0].ops)}</details>'
+
+
+def build_report(dashboard, selection, scenario=None):
+    """Rapport complet d'une sélection : en-tête puis toutes les sections du dashboard"""
+    from Dashboard import CUSTOM_CSS
+    from rendering import StubStreamlit, record
+
+    controls = _controls_for(dashboard, selection, scenario)
+    debut, fin = controls['horizon']
+    df, config = dashboard.generate_advanced_data(selection, controls['scenario'], debut, fin, controls['frequence'])
+    # Sections du bundle précalculé s'il est à jour, calculées à défaut
+    snapshot = dashboard.snapshot_sections(controls)
+
+    builder = ReportBuilder()
+    with StubStreamlit() as stub:
+        dashboard.display_advanced_header(debut, fin)
+    sections = [('', CUSTOM_CSS + builder.render(stub.ops))]
+    for label, renderer in dashboard.define_sections(df, config, controls):
+        ops = snapshot(label) if snapshot is not None else None
+        sections.append((label, builder.render(ops if ops is not None else record(renderer))))
+    titre = f"Analyse stratégique - {selection} - {controls['scenario']}"
+    return Report(titre, sections, builder.figures)
+
+
+def _controls_for(dashboard, selection, scenario=None):
+    """Contrôles de la sidebar (valeurs par défaut) pour ``selection`` et ``scenario``"""
+    from rendering import StubStreamlit
+
+    for mode, (libelle, options) in dashboard.define_analysis_modes().items():
+        if selection in options:
+            break
+    else:
+        raise ValueError(f"Sélection inconnue: {selection}")
+    valeurs = {"Mode d'analyse:": mode}
+    if libelle:
+        valeurs[libelle] = selection
+    if scenario:
+        valeurs["Scénario:"] = scenario
+    with StubStreamlit(valeurs):
+        return dashboard.create_advanced_sidebar()
+
+
+def to_html(report, images=None):
+    """Document HTML autonome ; ``images`` (hash -> fichier) remplace les figures interactives"""
+    corps = []
+    sommaire = ''.join(f'<li><a href="#section-{i}">{html.escape(label)}</a></li>'
+                       for i, (label, _) in enumerate(report.sections) if label)
+    corps.append(f'<nav><h2>Sommaire</h2><ol>{sommaire}</ol></nav>')
+    for i, (label, contenu) in enumerate(report.sections):
+        if label:
+            corps.append(f'<section class="report-section" id="section-{i}"><h2>{html.escape(label)}</h2>{contenu}</section>')
+        else:
+            corps.append(contenu)
+    document = ''.join(corps)
+
+    if images is None:
+        figures = ','.join(f'"{empreinte}":{_script_json(texte)}' for empreinte, texte in report.figures.items())
+        scripts = (f'<script>{plotly_js()}</script>'
+                   f'<script>var FIGURES = {{{figures}}};{BOOTSTRAP_JS}</script>')
+    else:
+        document = re.sub(r'<div class="figure" data-figure="(\w+)"[^>]*></div>',
+                          lambda m: f'<div class="figure"><img src="{images[m.group(1)]}"></div>', document)
+        scripts = ''
+
+    genere = datetime.now().strftime('%Y-%m-%d %H:%M')
+    return (f'<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+            f'<title>{html.escape(report.title)}</title>{REPORT_CSS}</head>'
+            f'<body><p class="caption">{html.escape(report.title)} - généré le {genere}</p>'
+            f'{document}{scripts}</body></html>')
+
+
+def write_html(report, path):
+    with open(path, 'w', encoding='utf-8') as fichier:
+        fichier.write(to_html(report))
+
+
+def write_pdf(report, path):
+    """PDF du rapport : figures exportées en SVG d'un seul lot (kaleido), mise en page par WeasyPrint"""
+    try:
+        import kaleido  # noqa: F401  (moteur d'export statique de plotly)
+        import plotly.io as pio
+        from weasyprint import HTML
+    except ImportError as exc:
+        raise ImportError("Export PDF : installer kaleido et weasyprint (pip install kaleido weasyprint)") from exc
+
+    with tempfile.TemporaryDirectory(prefix='rapport-') as dossier:
+        images = {empreinte: f'{empreinte}.svg' for empreinte in report.figures}
+        if images:
+            pio.write_images([json.loads(texte) for texte in report.figures.values()],
+                             [os.path.join(dossier, images[empreinte]) for empreinte in report.figures],
+                             format='svg', width=1100)
+        HTML(string=to_html(report, images), base_url=dossier).write_pdf(path)
+
+
+WRITERS = {'html': write_html, 'pdf': write_pdf}
+
+
+def report_path(output, selection, scenario, extension):
+    """Nom de fichier ASCII stable pour une sélection et un scénario"""
+    nom = unicodedata.normalize('NFKD', f'{selection}_{scenario}').encode('ascii', 'ignore').decode()
+    nom = re.sub(r'[^A-Za-z0-9]+', '-', nom).strip('-').lower()
+    return os.path.join(output, f'{nom}.{extension}')
+
+
+# Dashboard par processus du pool, construit au premier rapport
+_DASHBOARD = None
+
+
+def _dashboard():
+    global _DASHBOARD
+    if _DASHBOARD is None:
+        from Dashboard import DefenseIsraelDashboardAvance
+        _DASHBOARD = DefenseIsraelDashboardAvance()
+    return _DASHBOARD
+
+
+def _generate(selection, scenario, output, formats):
+    """Produit les fichiers d'un rapport (exécuté dans un processus du pool)"""
+    dashboard = _dashboard()
+    report = build_report(dashboard, selection, scenario)
+    scenario = _controls_for(dashboard, selection, scenario)['scenario']
+    chemins = []
+    for extension in formats:
+        chemin = report_path(output, selection, scenario, extension)
+        WRITERS[extension](report, chemin)
+        chemins.append(chemin)
+    return selection, scenario, chemins
+
+
+def generate_reports(selections, output, scenarios=(None,), formats=('html',), workers=None, progress=None):
+    """Génère les rapports sélections x scénarios dans ``output``, en parallèle"""
+    os.makedirs(output, exist_ok=True)
+    travaux = [(selection, scenario) for selection in selections for scenario in scenarios]
+    workers = min(workers or os.cpu_count() or 1, len(travaux) or 1)
+    resultats = []
+    if workers == 1:
+        for termines, (selection, scenario) in enumerate(travaux, start=1):
+            resultats.append(_generate(selection, scenario, output, formats))
+            if progress is not None:
+                progress(termines, len(travaux))
+        return resultats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_generate, selection, scenario, output, formats) for selection, scenario in travaux]
+        for termines, future in enumerate(as_completed(futures), start=1):
+            resultats.append(future.result())
+            if progress is not None:
+                progress(termines, len(travaux))
+    return resultats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rapports statiques du dashboard défense Israël")
+    parser.add_argument('-o', '--output', default='rapports', help="Dossier de sortie")
+    parser.add_argument('--selections', nargs='*', help="Sélections (défaut : toutes)")
+    parser.add_argument('--scenarios', nargs='*', default=[None], help="Scénarios (défaut : celui de la sidebar)")
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['html'], dest='formats')
+    parser.add_argument('--workers', type=int, default=None, help="Processus (défaut : nombre de coeurs)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    selections = args.selections or list(dict.fromkeys(
+        selection for _, options in _dashboard().define_analysis_modes().values() for selection in options))
+    debut = time.perf_counter()
+
+    def progress(termines, total):
+        print(f"\r[report] {termines}/{total} rapports - {time.perf_counter() - debut:.1f}s",
+              end='\n' if termines == total else '', file=sys.stderr, flush=True)
+
+    try:
+        resultats = generate_reports(selections, args.output, args.scenarios, args.formats, args.workers, progress)
+    except ImportError as exc:
+        print(f"ERREUR: {exc}", file=sys.stderr)
+        return 1
+    fichiers = sum(len(chemins) for _, _, chemins in resultats)
+    print(f"[report] {fichiers} fichiers écrits dans {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# response_optimizer.py
+"""Répartition du budget de réponse entre domaines, au risque attendu minimal.
+
+L'efficacité d'un domaine ``j`` face au scénario ``s`` suit des rendements
+décroissants calés sur l'efficacité observée ``e0`` au budget actuel ``b`` :
+
+    e_sj(x_j) = 1 - (1 - e0_sj) ** (x_j / b_j)
+
+La couverture d'un scénario pondère ses domaines par leur pertinence, et le
+risque attendu somme exposition (probabilité x impact des menaces) x
+(1 - couverture). Le risque est convexe en ``x`` : il est minimisé sur
+{x >= plancher, somme(x) = enveloppe} en évaluant d'un bloc des milliers
+d'allocations candidates, puis par descente de gradient projetée depuis les
+meilleures.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# ``budgets`` (D,) ; ``effectiveness`` (S, D) et ``coverage`` (S,) à l'optimum ;
+# ``baseline_*`` : répartition actuelle ramenée à la même enveloppe
+Allocation = namedtuple('Allocation', 'budgets risk baseline_budgets baseline_risk effectiveness coverage')
+
+
+def effectiveness(X, base, e0):
+    """Efficacité (..., S, D) de chaque domaine pour des budgets ``X`` (..., D)"""
+    echec = 1.0 - np.clip(e0, 0.0, 0.999)
+    return 1.0 - echec ** (np.asarray(X)[..., None, :] / base)
+
+
+def expected_risk(X, base, e0, poids, exposition):
+    """Risque attendu (...) de budgets ``X`` (..., D)"""
+    couverture = (effectiveness(X, base, e0) * poids).sum(axis=-1)
+    return ((1.0 - couverture) * exposition).sum(axis=-1)
+
+
+def risk_gradient(X, base, e0, poids, exposition):
+    """Gradient (..., D) du risque attendu par rapport aux budgets"""
+    echec = 1.0 - np.clip(e0, 0.0, 0.999)
+    derivee = -(echec ** (np.asarray(X)[..., None, :] / base)) * np.log(echec) / base
+    return -(derivee * poids * exposition[:, None]).sum(axis=-2)
+
+
+def project_simplex(V, total, plancher):
+    """Projection euclidienne de chaque ligne de ``V`` sur {x >= plancher, somme(x) = total}"""
+    V = np.atleast_2d(V)
+    Y = V - plancher
+    reste = total - plancher.sum()
+    tries = -np.sort(-Y, axis=1)
+    cumuls = np.cumsum(tries, axis=1) - reste
+    rangs = np.arange(1, Y.shape[1] + 1)
+    actifs = (tries - cumuls / rangs > 0).sum(axis=1)
+    seuil = cumuls[np.arange(Y.shape[0]), actifs - 1] / actifs
+    return np.maximum(Y - seuil[:, None], 0.0) + plancher
+
+
+def optimize_allocation(base, e0, poids, exposition, enveloppe=None, plancher=0.25,
+                        candidates=4096, starts=16, iterations=200, seed=0):
+    """Budgets par domaine minimisant le risque attendu pour ``enveloppe`` (Md$).
+
+    ``base`` (D,) budgets actuels ; ``e0`` (S, D) efficacités observées ;
+    ``poids`` (S, D) pertinence des domaines par scénario ; ``exposition``
+    (S,) ; ``plancher`` : part minimale du budget actuel (mise à l'échelle)
+    conservée par chaque domaine.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    e0, poids, exposition = (np.asarray(a, dtype=np.float64) for a in (e0, poids, exposition))
+    enveloppe = base.sum() if enveloppe is None else float(enveloppe)
+    actuelle = base * enveloppe / base.sum()
+    minimum = plancher * actuelle
+
+    def risque(X):
+        return expected_risk(X, base, e0, poids, exposition)
+
+    # 1. Candidats : allocation actuelle et tirages uniformes sur le simplexe
+    rng = np.random.default_rng(seed)
+    X = minimum + rng.dirichlet(np.ones(base.size), size=candidates) * (enveloppe - minimum.sum())
+    X = np.vstack([actuelle, X])
+    X = X[np.argsort(risque(X))[:starts]]
+
+    # 2. Descente projetée depuis les meilleurs, pas adapté ligne par ligne
+    valeurs = risque(X)
+    pas = np.full(X.shape[0], 0.1 * enveloppe)
+    for _ in range(iterations):
+        gradient = risk_gradient(X, base, e0, poids, exposition)
+        norme = np.linalg.norm(gradient, axis=1, keepdims=True)
+        essai = project_simplex(X - pas[:, None] * gradient / np.where(norme > 0, norme, 1.0), enveloppe, minimum)
+        nouvelles = risque(essai)
+        mieux = nouvelles < valeurs
+        X[mieux], valeurs[mieux] = essai[mieux], nouvelles[mieux]
+        pas = np.where(mieux, pas * 1.5, pas * 0.5)
+        if pas.max() < 1e-9 * enveloppe:
+            break
+
+    meilleur = X[int(np.argmin(valeurs))]
+    efficacites = effectiveness(meilleur, base, e0)
+    return Allocation(meilleur, float(valeurs.min()), actuelle, float(risque(actuelle)),
+                      efficacites, (efficacites * poids).sum(axis=-1))
@@ -0,0 +1,151 @@
+# scenario_engine.py
+"""Moteur Monte Carlo des scénarios sécuritaires.
+
+Les N trajectoires sont simulées ensemble sur une grille trajectoires x
+années : les chocs s'appliquent aux séries déterministes du moteur de
+simulation à partir de l'année de projection, puis les bandes P5/P50/P95
+sont extraites par percentiles.
+"""
+import numpy as np
+import pandas as pd
+
+import simulation_engine
+from simulation_engine import as_time_axis
+
+# Paramètres stochastiques par scénario de la sidebar
+SCENARIOS = {
+    "Statut Quo Sécuritaire": {
+        'proba_crise': 0.05,       # probabilité annuelle d'une crise majeure
+        'derive_budget': 0.0,      # dérive annuelle (log) du budget
+        'vol_budget': 0.02,
+        'hausse_budget_crise': 0.05,
+        'delta_readiness': 0.0,
+        'vol_readiness': 0.8,
+        'vol_mobilisation': 0.05,
+        'surcharge_mobilisation': 0.10,
+        'vol_interception': 1.5,
+        'saturation_interception': 5.0,
+    },
+    "Conflit Régional Majeur": {
+        'proba_crise': 0.50,
+        'derive_budget': 0.04,
+        'vol_budget': 0.04,
+        'hausse_budget_crise': 0.25,
+        'delta_readiness': -3.0,
+        'vol_readiness': 2.0,
+        'vol_mobilisation': 0.10,
+        'surcharge_mobilisation': 0.30,
+        'vol_interception': 3.0,
+        'saturation_interception': 15.0,
+    },
+    "Escalade Nord": {
+        'proba_crise': 0.35,
+        'derive_budget': 0.025,
+        'vol_budget': 0.03,
+        'hausse_budget_crise': 0.15,
+        'delta_readiness': -1.5,
+        'vol_readiness': 1.5,
+        'vol_mobilisation': 0.08,
+        'surcharge_mobilisation': 0.20,
+        'vol_interception': 2.5,
+        'saturation_interception': 12.0,
+    },
+    "Opération Préemptive": {
+        'proba_crise': 0.25,
+        'derive_budget': 0.02,
+        'vol_budget': 0.03,
+        'hausse_budget_crise': 0.10,
+        'delta_readiness': 1.0,
+        'vol_readiness': 1.2,
+        'vol_mobilisation': 0.06,
+        'surcharge_mobilisation': 0.05,
+        'vol_interception': 2.0,
+        'saturation_interception': 6.0,
+    },
+}
+
+SCENARIO_PAR_DEFAUT = "Statut Quo Sécuritaire"
+
+# Séries stochastiques produites (colonne -> libellé)
+SERIES_SCENARIO = {
+    'Budget_Defense_Mds': 'Budget Défense (Md$)',
+    'Readiness_Operative': 'Préparation Opérationnelle (%)',
+    'Temps_Mobilisation_Jours': 'Temps de Mobilisation (jours)',
+    'Interceptions_Dome_Fer': "Taux d'Interception (%)",
+}
+
+
+class ScenarioEngine:
+    """Simulation Monte Carlo vectorisée (trajectoires x années) d'un scénario"""
+
+    def __init__(self, n_trajectories=10_000, seed=2027, debut_projection=2024,
+                 max_elements=4_000_000):
+        self.n_trajectories = n_trajectories
+        self.seed = seed
+        self.debut_projection = debut_projection
+        # Taille maximale d'un bloc (trajectoires x pas de temps) en mémoire
+        self.max_elements = max_elements
+
+    def parameters(self, scenario):
+        return SCENARIOS.get(scenario, SCENARIOS[SCENARIO_PAR_DEFAUT])
+
+    def simulate(self, annees, config, scenario):
+        """Trajectoires complètes : colonne -> tableau (N, T)"""
+        blocs = list(self._iter_blocks(as_time_axis(annees), config, scenario))
+        return {nom: np.concatenate([bloc[nom] for bloc in blocs], axis=1) for nom in SERIES_SCENARIO}
+
+    def bands(self, annees, config, scenario, percentiles=(5, 50, 95)):
+        """Bandes de percentiles par année (colonnes ``<serie>_P<q>``)"""
+        t = as_time_axis(annees)
+        colonnes = {f'{nom}_P{q}': np.empty(t.shape[0]) for nom in SERIES_SCENARIO for q in percentiles}
+        debut = 0
+        for bloc in self._iter_blocks(t, config, scenario):
+            for nom, valeurs in bloc.items():
+                quantiles = np.percentile(valeurs, percentiles, axis=0)
+                for q, ligne in zip(percentiles, quantiles):
+                    colonnes[f'{nom}_P{q}'][debut:debut + valeurs.shape[1]] = ligne
+            debut += valeurs.shape[1]
+        return pd.DataFrame({'Annee': t, **colonnes})
+
+    def _iter_blocks(self, t, config, scenario):
+        """Simule par blocs de pas de temps pour borner la mémoire (N x bloc)"""
+        p = self.parameters(scenario)
+        n = self.n_trajectories
+        rng = np.random.default_rng(self.seed)
+        taille_bloc = max(1, self.max_elements // n)
+        # Log-multiplicateur cumulé du budget, reporté d'un bloc à l'autre
+        cumul_budget = np.zeros((n, 1))
+        # Durée de chaque pas (années) : dérive et volatilité annuelles de la
+        # marche aléatoire du budget mises à l'échelle (1 en résolution annuelle)
+        dt = np.diff(t, prepend=t[0] - (t[1] - t[0] if t.shape[0] > 1 else 1.0))
+
+        for debut in range(0, t.shape[0], taille_bloc):
+            tb = t[debut:debut + taille_bloc]
+            dtb = dt[debut:debut + taille_bloc]
+            projection = (np.floor(tb) >= self.debut_projection).astype(np.float64)
+            crise = (rng.random((n, tb.shape[0])) < p['proba_crise']) * projection
+            z = rng.standard_normal((4, n, tb.shape[0]))
+
+            log_budget = cumul_budget + np.cumsum(projection * (p['derive_budget'] * dtb + p['vol_budget'] * np.sqrt(dtb) * z[0]), axis=1)
+            cumul_budget = log_budget[:, -1:]
+            budget = (simulation_engine.budget_defense(tb, config.get('budget_base', 24.3))
+                      * np.exp(log_budget) * (1 + p['hausse_budget_crise'] * crise))
+
+            readiness = simulation_engine.readiness(tb) + projection * (p['delta_readiness'] + p['vol_readiness'] * z[1])
+
+            mobilisation = (simulation_engine.mobilisation(tb) * np.exp(projection * p['vol_mobilisation'] * z[2])
+                            * (1 + p['surcharge_mobilisation'] * crise))
+
+            interception_base = simulation_engine.interceptions_dome_fer(tb)
+            interception = np.where(
+                interception_base > 0,
+                interception_base + projection * (p['vol_interception'] * z[3]) - p['saturation_interception'] * crise,
+                0.0,
+            )
+
+            yield {
+                'Budget_Defense_Mds': budget,
+                'Readiness_Operative': np.clip(readiness, 0, 100),
+                'Temps_Mobilisation_Jours': np.maximum(mobilisation, 1.0),
+                'Interceptions_Dome_Fer': np.clip(interception, 0, 100),
+            }
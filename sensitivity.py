@@ -0,0 +1,93 @@
+# sensitivity.py
+"""Sensibilité des métriques de tête aux paramètres de configuration.
+
+Les jeux de paramètres perturbés sont passés aux séries du graphe sous forme
+de colonnes ``(N, 1)`` : une seule évaluation vectorisée couvre toutes les
+perturbations un à la fois, ou tout l'échantillon de Saltelli pour les
+indices de Sobol (premier ordre et totaux). Les séries étant des fonctions
+ponctuelles de ``t``, seules les bornes de l'axe sont évaluées.
+"""
+import numpy as np
+import pandas as pd
+
+# Paramètres étudiés (clés de configuration lues par les séries)
+PARAMETRES = ('budget_base', 'croissance_budget', 'personnel_base',
+              'croissance_personnel', 'exercices_base', 'croissance_exercices')
+
+# Métrique -> (série, fonction des valeurs (N, 2) au début et à la fin de l'horizon)
+METRIQUES = {
+    'Budget défense final (Md$)': ('Budget_Defense_Mds', lambda v: v[:, -1]),
+    'Croissance du budget (%)': ('Budget_Defense_Mds', lambda v: 100 * (v[:, -1] / v[:, 0] - 1)),
+    'Effectifs finaux (K)': ('Personnel_Milliers', lambda v: v[:, -1]),
+    'Exercices militaires finaux': ('Exercices_Militaires', lambda v: v[:, -1]),
+}
+
+# Perturbation relative autour de la valeur nominale (±20 %)
+ECART = 0.2
+
+# Taille de base de l'échantillon de Saltelli : N x (P + 2) évaluations
+N_SOBOL = 16384
+
+
+def evaluate_metrics(graph, t, config, valeurs):
+    """Métriques ``{nom: (N,)}`` pour ``valeurs`` ``{paramètre: (N,)}`` en une évaluation"""
+    n = len(next(iter(valeurs.values())))
+    bornes = np.asarray(t, dtype=np.float64)[[0, -1]]
+    cfg = dict(config)
+    cfg.update({nom: np.asarray(v, dtype=np.float64)[:, None] for nom, v in valeurs.items()})
+    series = graph.evaluate_batch(list(dict.fromkeys(s for s, _ in METRIQUES.values())), bornes, cfg)
+    return {nom: np.broadcast_to(fonction(np.broadcast_to(series[s], (n, 2))), (n,))
+            for nom, (s, fonction) in METRIQUES.items()}
+
+
+def one_at_a_time(graph, t, config, nominal, ecart=ECART):
+    """Écart de chaque métrique quand un paramètre passe à -``ecart`` / +``ecart``"""
+    noms = list(nominal)
+    P = len(noms)
+    # Ligne 0 : nominal ; lignes 2i+1 / 2i+2 : paramètre i bas / haut
+    X = np.tile(np.array([nominal[n] for n in noms], dtype=np.float64), (2 * P + 1, 1))
+    for i in range(P):
+        X[2 * i + 1, i] *= 1 - ecart
+        X[2 * i + 2, i] *= 1 + ecart
+    metriques = evaluate_metrics(graph, t, config, dict(zip(noms, X.T)))
+    lignes = []
+    for metrique, f in metriques.items():
+        for i, nom in enumerate(noms):
+            lignes.append({'Paramètre': nom, 'Métrique': metrique, 'Nominal': f[0],
+                           'Bas': f[2 * i + 1] - f[0], 'Haut': f[2 * i + 2] - f[0]})
+    return pd.DataFrame(lignes)
+
+
+def sobol_indices(graph, t, config, nominal, n=N_SOBOL, ecart=ECART, seed=0):
+    """Indices de Sobol S1 (Saltelli 2010) et ST (Jansen), paramètres uniformes à ±``ecart``"""
+    noms = list(nominal)
+    P = len(noms)
+    centre = np.array([nominal[nom] for nom in noms], dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    A = centre * (1 + ecart * rng.uniform(-1, 1, size=(n, P)))
+    B = centre * (1 + ecart * rng.uniform(-1, 1, size=(n, P)))
+    # A, B puis A avec la colonne i prise dans B, empilés pour une évaluation unique
+    blocs = [A, B]
+    for i in range(P):
+        AB = A.copy()
+        AB[:, i] = B[:, i]
+        blocs.append(AB)
+    X = np.vstack(blocs)
+    metriques = evaluate_metrics(graph, t, config, dict(zip(noms, X.T)))
+
+    lignes = []
+    for metrique, f in metriques.items():
+        # Centrage : réduit la variance de l'estimateur S1 quand la moyenne domine
+        f = f.reshape(P + 2, n)
+        f = f - f[:2].mean()
+        fA, fB = f[0], f[1]
+        variance = np.var(f[:2])
+        for i, nom in enumerate(noms):
+            fAB = f[2 + i]
+            if variance > 0:
+                s1 = float(np.mean(fB * (fAB - fA)) / variance)
+                st = float(0.5 * np.mean((fA - fAB) ** 2) / variance)
+            else:
+                s1 = st = 0.0
+            lignes.append({'Paramètre': nom, 'Métrique': metrique, 'S1': s1, 'ST': st})
+    return pd.DataFrame(lignes), X.shape[0]
@@ -0,0 +1,303 @@
+# simulation_engine.py
+"""Moteur de simulation vectorisé pour l'analyse stratégique Israël.
+
+Chaque série est une fonction NumPy pure de l'axe temporel ``t`` (années,
+éventuellement fractionnaires pour une résolution mensuelle ou journalière).
+Les paramètres de configuration peuvent être des scalaires ou des tableaux
+diffusables (``(N, 1)`` pour N trajectoires Monte Carlo).
+"""
+import numpy as np
+
+from computation_graph import ComputationGraph
+from timeseries_store import TimeSeriesStore
+
+MODEL_VERSION = "2.0"
+
+ANNEE_REFERENCE = 2000
+
+
+def as_time_axis(annees):
+    """Convertit une liste d'années en axe float64 contigu"""
+    return np.ascontiguousarray(annees, dtype=np.float64)
+
+
+# Pas de temps disponibles (en années)
+FREQUENCES = {
+    'annuelle': 1.0,
+    'mensuelle': 1 / 12,
+    'hebdomadaire': 7 / 365.25,
+    'journalière': 1 / 365.25,
+}
+
+HORIZON_PAR_DEFAUT = (2000, 2027)
+
+
+def time_axis(debut=2000, fin=2027, frequence='annuelle'):
+    """Axe de ``debut`` au dernier pas de l'année ``fin`` incluse, au pas ``frequence``"""
+    if fin < debut:
+        raise ValueError(f"Horizon invalide : {debut}-{fin}")
+    pas = FREQUENCES[frequence]
+    n = int(round((fin + 1 - debut) / pas))
+    return debut + pas * np.arange(n, dtype=np.float64)
+
+
+def _annee_civile(t):
+    """Année civile d'un instant (2005.5 -> 2005) pour les ruptures par période"""
+    return np.floor(t)
+
+
+# --- Séries dépendant de la configuration -----------------------------------
+
+def budget_defense(t, budget_base=24.3, croissance_budget=0.035):
+    """Budget avec variations géopolitiques (Md$)"""
+    an = _annee_civile(t)
+    base = budget_base * (1 + croissance_budget * (t - ANNEE_REFERENCE))
+    facteur = np.select(
+        [
+            (an >= 2000) & (an <= 2005),  # Seconde Intifada
+            (an >= 2006) & (an <= 2007),  # Guerre du Liban
+            (an >= 2008) & (an <= 2009),  # Opération Plomb Durci
+            (an >= 2012) & (an <= 2014),  # Opérations diverses
+            an >= 2020,                   # Normalisation et nouvelles menaces
+        ],
+        [1.15, 1.20, 1.18, 1.12, 1.25],
+        default=1.0,
+    )
+    return base * facteur
+
+
+def personnel(t, personnel_base=646.5, croissance_personnel=0.008):
+    """Effectifs (milliers)"""
+    return personnel_base * (1 + croissance_personnel * (t - ANNEE_REFERENCE))
+
+
+def exercices_militaires(t, exercices_base=85, croissance_exercices=3):
+    """Exercices militaires avec saisonnalité quadriennale"""
+    dt = t - ANNEE_REFERENCE
+    return exercices_base + croissance_exercices * dt + 5 * np.sin(2 * np.pi * dt / 4)
+
+
+# --- Séries indépendantes de la configuration -------------------------------
+
+def pib_militaire(t):
+    """Pourcentage du PIB consacré à la défense"""
+    return 6.5 + 0.05 * (t - ANNEE_REFERENCE)
+
+
+def readiness(t):
+    """Préparation opérationnelle (paliers 2006, 2014, 2020)"""
+    an = _annee_civile(t)
+    base = 92.0 + 3.0 * (an >= 2006) + 2.0 * (an >= 2014) + 3.0 * (an >= 2020)
+    return np.minimum(base, 98)
+
+
+def dissuasion(t):
+    """Capacité de dissuasion (paliers 2007, 2010, 2020)"""
+    an = _annee_civile(t)
+    base = 88.0 + 3.0 * (an >= 2007) + 4.0 * (an >= 2010) + 3.0 * (an >= 2020)
+    return np.minimum(base, 95)
+
+
+def mobilisation(t):
+    """Temps de mobilisation (jours)"""
+    return np.maximum(48 - 1.2 * (t - ANNEE_REFERENCE), 24)
+
+
+def exercices_conjoints(t):
+    """Exercices conjoints avec alliés"""
+    an = _annee_civile(t)
+    return np.select(
+        [an < 2005, an < 2010],
+        [np.full_like(t, 15.0), 25 + (t - 2005)],
+        default=35 + 2 * (t - 2010),
+    )
+
+
+def _rampe(t, depart, pente, plafond, origine=ANNEE_REFERENCE):
+    """Croissance linéaire plafonnée, forme commune des indices de capacité"""
+    return np.minimum(depart + pente * (t - origine), plafond)
+
+
+def _rampe_differee(t, debut, depart, pente, plafond, avant):
+    """Rampe plafonnée démarrant en ``debut``, valeur constante ``avant`` sinon"""
+    return np.where(_annee_civile(t) >= debut, _rampe(t, depart, pente, plafond, debut), avant)
+
+
+def developpement_technologique(t):
+    return _rampe(t, 85, 1.8, 96)
+
+
+def capacite_aerienne(t):
+    return _rampe(t, 90, 1.2, 97)
+
+
+def couverture_ad(t):
+    return _rampe(t, 75, 2.0, 95)
+
+
+def cooperation_alliances(t):
+    return _rampe(t, 70, 1.5, 90)
+
+
+def cyber_capabilities(t):
+    return _rampe(t, 90, 1.5, 98)
+
+
+def production_armements(t):
+    return _rampe(t, 75, 1.8, 92)
+
+
+def exercices_usa(t):
+    return _rampe(t, 20, 1.5, 45)
+
+
+def partenariats_strategiques(t):
+    return _rampe(t, 50, 2.0, 85)
+
+
+def cooperation_regionale(t):
+    """Coopération régionale : 10 avant les Accords d'Abraham, puis rampe"""
+    return _rampe_differee(t, 2020, 20, 3.0, 65, avant=10.0)
+
+
+def interceptions_dome_fer(t):
+    """Taux d'interception Dôme de Fer : nul avant déploiement (2011)"""
+    return _rampe_differee(t, 2011, 75, 2.5, 95, avant=0.0)
+
+
+def couverture_defense_missile(t):
+    return _rampe(t, 60, 2.0, 90)
+
+
+def systemes_ad(t):
+    return _rampe(t, 5, 0.8, 25)
+
+
+def capacites_sigint(t):
+    return _rampe(t, 85, 1.5, 96)
+
+
+def operations_cyber(t):
+    return _rampe(t, 80, 2.0, 95)
+
+
+def alertes_prevention(t):
+    return _rampe(t, 75, 1.5, 92)
+
+
+def recherche_defense(t):
+    return _rampe(t, 88, 1.2, 96)
+
+
+def technologies_emergentes(t):
+    return _rampe(t, 85, 1.8, 95)
+
+
+def exportations_armes(t):
+    return _rampe(t, 3, 0.5, 12.5)
+
+
+# --- Registre des séries ----------------------------------------------------
+
+# Colonne -> (fonction, clés de configuration lues avec leur valeur par défaut)
+SERIES_DE_BASE = {
+    'Budget_Defense_Mds': (budget_defense, {'budget_base': 24.3, 'croissance_budget': 0.035}),
+    'Personnel_Milliers': (personnel, {'personnel_base': 646.5, 'croissance_personnel': 0.008}),
+    'PIB_Militaire_Pourcent': (pib_militaire, {}),
+    'Exercices_Militaires': (exercices_militaires, {'exercices_base': 85, 'croissance_exercices': 3}),
+    'Readiness_Operative': (readiness, {}),
+    'Capacite_Dissuasion': (dissuasion, {}),
+    'Temps_Mobilisation_Jours': (mobilisation, {}),
+    'Exercices_Conjoints': (exercices_conjoints, {}),
+    'Developpement_Technologique': (developpement_technologique, {}),
+    'Capacite_Aerienne': (capacite_aerienne, {}),
+    'Couverture_AD': (couverture_ad, {}),
+    'Cooperation_Alliances': (cooperation_alliances, {}),
+    'Cyber_Capabilities': (cyber_capabilities, {}),
+    'Production_Armements': (production_armements, {}),
+}
+
+# Priorité de configuration -> séries spécifiques aux programmes
+SERIES_PAR_PRIORITE = {
+    'defense_missile': {
+        'Interceptions_Dome_Fer': (interceptions_dome_fer, {}),
+        'Couverture_Defense_Missile': (couverture_defense_missile, {}),
+        'Systemes_AD_Deployes': (systemes_ad, {}),
+    },
+    'renseignement': {
+        'Capacites_SIGINT': (capacites_sigint, {}),
+        'Operations_Cyber': (operations_cyber, {}),
+        'Alertes_Prevention': (alertes_prevention, {}),
+    },
+    'innovation': {
+        'Recherche_Defense': (recherche_defense, {}),
+        'Technologies_Emergentes': (technologies_emergentes, {}),
+        'Exportations_Armes': (exportations_armes, {}),
+    },
+    'alliances': {
+        'Exercices_USA': (exercices_usa, {}),
+        'Partenariats_Strategiques': (partenariats_strategiques, {}),
+        'Cooperation_Regionale': (cooperation_regionale, {}),
+    },
+}
+
+
+def config_defaults():
+    """Paramètres de configuration lus par les séries et leur valeur par défaut"""
+    defaults = {}
+    for series in [SERIES_DE_BASE, *SERIES_PAR_PRIORITE.values()]:
+        for _, parametres in series.values():
+            defaults.update(parametres)
+    return defaults
+
+
+def build_graph(cache=None):
+    """Graphe de calcul de toutes les séries enregistrées"""
+    graph = ComputationGraph(cache)
+    for series in [SERIES_DE_BASE, *SERIES_PAR_PRIORITE.values()]:
+        for nom, (fonction, parametres) in series.items():
+            graph.add(nom, fonction, parametres)
+    return graph
+
+
+# Graphe partagé : les séries déjà calculées survivent aux reruns et aux sélections
+GRAPH = build_graph()
+
+
+class SimulationEngine:
+    """Calcule les séries d'une configuration via le graphe de calcul.
+
+    Les séries sont écrites en place dans un ``TimeSeriesStore`` : un bloc
+    float préalloué dont chaque colonne est contiguë, sans listes Python
+    intermédiaires. Seules les séries dont une entrée déclarée (axe, clés de
+    configuration, séries amont) a changé sont recalculées.
+    """
+
+    def __init__(self, dtype=np.float64, graph=None):
+        self.dtype = dtype
+        self.graph = graph if graph is not None else GRAPH
+
+    def series_for(self, config):
+        """Séries (ordonnées) produites pour une configuration"""
+        series = dict(SERIES_DE_BASE)
+        for priorite in config.get('priorites', []):
+            series.update(SERIES_PAR_PRIORITE.get(priorite, {}))
+        return series
+
+    def evaluate(self, nom, t, config):
+        """Évalue une série isolée sur l'axe ``t``"""
+        t = as_time_axis(t)
+        return np.asarray(self.graph.evaluate([nom], t, config)[nom], dtype=self.dtype)
+
+    def fill(self, store, config, noms=None):
+        """Écrit dans ``store`` les séries demandées (toutes par défaut)"""
+        noms = list(noms if noms is not None else self.series_for(config))
+        valeurs = self.graph.evaluate(noms, store.index, config)
+        for nom in noms:
+            store.write(nom, valeurs[nom])
+        return store
+
+    def run(self, annees, config):
+        """Nouveau ``TimeSeriesStore`` contenant toutes les séries de la configuration"""
+        store = TimeSeriesStore(as_time_axis(annees), list(self.series_for(config)), dtype=self.dtype)
+        return self.fill(store, config)
@@ -0,0 +1,348 @@
+# snapshot_bundle.py
+"""Bundles précalculés pour un démarrage à froid instantané.
+
+``python snapshot_bundle.py`` (« bake ») exécute hors ligne chaque
+combinaison sélection x scénario de la sidebar et écrit dans un seul fichier
+les DataFrames (blocs binaires bruts) et les sections rendues (figures en
+JSON, compressées). Au lancement, le dashboard ouvre ce fichier en ``mmap``
+et sert les données et les sections directement depuis lui. Une empreinte du
+code et de la source de données détecte les bundles périmés, reconstruits en
+arrière-plan.
+
+    python snapshot_bundle.py                  # écrit snapshot.bundle
+    python snapshot_bundle.py --check          # code 1 si le bundle est périmé
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from simulation_engine import MODEL_VERSION
+
+MAGIC = b'DIBUNDLE1\n'
+ALIGNEMENT = 64
+
+BUNDLE_ENV = 'DASHBOARD_BUNDLE'
+# 0 : un bundle périmé est ignoré sans être reconstruit
+BUNDLE_REBUILD_ENV = 'DASHBOARD_BUNDLE_REBUILD'
+
+REPERTOIRE = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(REPERTOIRE, 'snapshot.bundle')
+
+
+def content_hash(data_source=None):
+    """Empreinte de ce qui détermine le contenu d'un bundle : code, modèle, sources, Plotly"""
+    from alliance_store import alliances_fingerprint
+    from geospatial import sites_fingerprint
+    empreinte = hashlib.sha1()
+    for nom in sorted(os.listdir(REPERTOIRE)):
+        if nom.endswith('.py'):
+            with open(os.path.join(REPERTOIRE, nom), 'rb') as f:
+                empreinte.update(nom.encode('utf-8') + b'\0' + f.read())
+    try:
+        from importlib.metadata import version
+        plotly_version = version('plotly')
+    except Exception:
+        plotly_version = None
+    fingerprint = getattr(data_source, 'fingerprint', None)
+    # Fichiers de données hors code (catalogue d'accords, sites) : les sections les affichent
+    empreinte.update(json.dumps([MODEL_VERSION, plotly_version, fingerprint,
+                                 alliances_fingerprint(), sites_fingerprint()]).encode('utf-8'))
+    return empreinte.hexdigest()
+
+
+def _key(*parts):
+    return json.dumps(parts, ensure_ascii=False)
+
+
+def frame_key(selection, scenario, annees):
+    return _key('data', selection, scenario, float(annees[0]), float(annees[-1]), len(annees))
+
+
+def section_key(controls_key, label):
+    return _key('section', controls_key, label)
+
+
+# --- Sérialisation des opérations enregistrées -------------------------------
+
+def _encode(valeur):
+    if hasattr(valeur, 'to_plotly_json'):
+        return {'__figure__': valeur.to_json()}
+    if isinstance(valeur, pd.DataFrame):
+        return {'__frame__': valeur.to_json(orient='split', date_format='iso')}
+    if isinstance(valeur, dict):
+        return {cle: _encode(v) for cle, v in valeur.items()}
+    if isinstance(valeur, (list, tuple)):
+        return [_encode(v) for v in valeur]
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    if valeur is None or isinstance(valeur, (str, int, float, bool)):
+        return valeur
+    raise TypeError(f"Valeur non sérialisable dans un bundle : {type(valeur).__name__}")
+
+
+def _decode(valeur):
+    if isinstance(valeur, dict):
+        if '__figure__' in valeur:
+            from figure_cache import FrozenFigure
+            return FrozenFigure.from_json(valeur['__figure__'])
+        if '__frame__' in valeur:
+            from io import StringIO
+            return pd.read_json(StringIO(valeur['__frame__']), orient='split')
+        return {cle: _decode(v) for cle, v in valeur.items()}
+    if isinstance(valeur, list):
+        return [_decode(v) for v in valeur]
+    return valeur
+
+
+def encode_ops(ops):
+    return [{'n': op.name, 'a': _encode(op.args), 'k': _encode(op.kwargs),
+             'c': None if op.children is None else [encode_ops(child.ops) for child in op.children]}
+            for op in ops]
+
+
+def decode_ops(encoded):
+    from rendering import RecordedContainer, RecordedOp
+
+    def conteneur(ops):
+        # Rejoué seulement : aucun enregistreur associé
+        child = RecordedContainer(None)
+        child.ops = decode_ops(ops)
+        return child
+
+    return [RecordedOp(op['n'], tuple(_decode(op['a'])), _decode(op['k']),
+                       None if op['c'] is None else [conteneur(c) for c in op['c']])
+            for op in encoded]
+
+
+# --- Écriture -----------------------------------------------------------------
+
+class BundleWriter:
+    """Écrit les blobs dans un fichier temporaire puis assemble le bundle"""
+
+    def __init__(self, path, content_hash):
+        self.path = path
+        self.entries = {}
+        self.meta = {'content_hash': content_hash, 'model_version': MODEL_VERSION,
+                     'created': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self._body = tempfile.TemporaryFile()
+        self._offset = 0
+
+    def _write(self, data):
+        padding = -self._offset % ALIGNEMENT
+        self._body.write(b'\0' * padding)
+        self._offset += padding
+        debut = self._offset
+        self._body.write(data)
+        self._offset += len(data)
+        return debut, len(data)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add_frame(self, key, df, config, index_name='Annee'):
+        """DataFrame numérique : axe puis bloc float64 (ordre Fortran), en binaire brut"""
+        colonnes = [nom for nom in df.columns if nom != index_name]
+        index = np.ascontiguousarray(df[index_name].to_numpy())
+        bloc = np.asfortranarray(df[colonnes].to_numpy(dtype=np.float64))
+        index_offset, _ = self._write(index.tobytes())
+        bloc_offset, _ = self._write(bloc.tobytes(order='F'))
+        self.entries[key] = {'kind': 'frame', 'rows': len(df), 'index_name': index_name,
+                             'index_dtype': index.dtype.str, 'index_offset': index_offset,
+                             'columns': colonnes, 'block_offset': bloc_offset,
+                             'config': _encode(config)}
+
+    def add_ops(self, key, ops):
+        offset, longueur = self._write(zlib.compress(json.dumps(encode_ops(ops)).encode('utf-8'), 6))
+        self.entries[key] = {'kind': 'ops', 'offset': offset, 'length': longueur}
+
+    def close(self):
+        """Assemble entête + corps de façon atomique"""
+        entete = json.dumps(dict(self.meta, entries=self.entries), ensure_ascii=False).encode('utf-8')
+        prefixe = len(MAGIC) + 8 + len(entete)
+        entete += b' ' * (-prefixe % ALIGNEMENT)
+        temporaire = f'{self.path}.tmp-{os.getpid()}'
+        with open(temporaire, 'wb') as f:
+            f.write(MAGIC + struct.pack('<Q', len(entete)) + entete)
+            self._body.seek(0)
+            while True:
+                morceau = self._body.read(1 << 20)
+                if not morceau:
+                    break
+                f.write(morceau)
+        self._body.close()
+        os.replace(temporaire, self.path)
+        return self.path
+
+
+# --- Lecture ------------------------------------------------------------------
+
+class SnapshotBundle:
+    """Bundle ouvert en ``mmap`` : les entrées sont lues à la demande"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Bundle invalide : {path}")
+        (taille,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        debut = len(MAGIC) + 8
+        meta = json.loads(self._mmap[debut:debut + taille])
+        self._base = debut + taille
+        self.entries = meta.pop('entries')
+        self.meta = meta
+        self.content_hash = meta['content_hash']
+
+    def __len__(self):
+        return len(self.entries)
+
+    def frame(self, selection, scenario, annees):
+        """``(df, config)`` d'une combinaison, sans copie des données, ou ``None``"""
+        entree = self.entries.get(frame_key(selection, scenario, annees))
+        if entree is None:
+            return None
+        n, colonnes = entree['rows'], entree['columns']
+        index = np.frombuffer(self._mmap, dtype=np.dtype(entree['index_dtype']), count=n,
+                              offset=self._base + entree['index_offset'])
+        bloc = np.frombuffer(self._mmap, dtype=np.float64, count=n * len(colonnes),
+                             offset=self._base + entree['block_offset']).reshape((n, len(colonnes)), order='F')
+        df = pd.DataFrame(bloc, columns=colonnes, copy=False)
+        df.insert(0, entree['index_name'], index)
+        return df, _decode(entree['config'])
+
+    def section_ops(self, controls_key, label):
+        """Opérations enregistrées d'une section, ou ``None``"""
+        entree = self.entries.get(section_key(controls_key, label))
+        if entree is None:
+            return None
+        debut = self._base + entree['offset']
+        return decode_ops(json.loads(zlib.decompress(self._mmap[debut:debut + entree['length']])))
+
+
+# --- Bake ---------------------------------------------------------------------
+
+def bake(path=BUNDLE_PATH, progress=None):
+    """Précalcule toutes les combinaisons sélection x scénario de la sidebar"""
+    from Dashboard import DefenseIsraelDashboardAvance
+    from rendering import StubStreamlit, record
+    from scenario_engine import SCENARIOS
+
+    dashboard = DefenseIsraelDashboardAvance(snapshot=False)
+    writer = BundleWriter(path, content_hash(dashboard.data_source))
+    combinaisons = [(mode, libelle, selection, scenario)
+                    for mode, (libelle, options) in dashboard.define_analysis_modes().items()
+                    for selection in options for scenario in SCENARIOS]
+    ignorees = 0
+    for i, (mode, libelle, selection, scenario) in enumerate(combinaisons, 1):
+        valeurs = {"Mode d'analyse:": mode, "Scénario:": scenario}
+        if libelle:
+            valeurs[libelle] = selection
+        with StubStreamlit(valeurs):
+            controls = dashboard.create_advanced_sidebar()
+        debut, fin = controls['horizon']
+        df, config = dashboard.generate_advanced_data(selection, scenario, debut, fin, controls['frequence'])
+        cle = frame_key(selection, scenario, df['Annee'].to_numpy())
+        if cle not in writer:
+            writer.add_frame(cle, df, config)
+        for label, renderer in dashboard.define_sections(df, config, controls):
+            try:
+                writer.add_ops(section_key(dashboard.sections_key(controls), label), record(renderer))
+            except TypeError:
+                # Section non sérialisable : calculée à la demande
+                ignorees += 1
+        if progress:
+            progress(i, len(combinaisons))
+    writer.close()
+    return len(writer.entries), ignorees
+
+
+# Bundles ouverts, empreintes attendues (par source et versions des fichiers),
+# reconstructions en cours et empreinte visée par la dernière de chaque bundle
+_BUNDLES = {}
+_HASHES = {}
+_REBUILDS = set()
+_REBUILT = {}
+_BUNDLES_LOCK = threading.Lock()
+
+
+def get_bundle(data_source=None, path=None):
+    """Bundle à jour pour ``data_source`` (ouvert une fois par processus), ou ``None``.
+
+    Un bundle périmé est ignoré et reconstruit en arrière-plan, une fois par
+    version des données ; la version reconstruite est servie dès qu'elle est écrite.
+    """
+    from alliance_store import alliances_fingerprint
+    from geospatial import sites_fingerprint
+    path = path or os.environ.get(BUNDLE_ENV, BUNDLE_PATH)
+    source = getattr(data_source, 'fingerprint', None)
+    # Empreintes des fichiers (stat) à chaque appel : le hash complet n'est refait que s'ils changent
+    versions = (alliances_fingerprint(), sites_fingerprint())
+    with _BUNDLES_LOCK:
+        connues, attendu = _HASHES.get(source, (None, None))
+        if connues != versions:
+            attendu = content_hash(data_source)
+            _HASHES[source] = (versions, attendu)
+        bundle = _BUNDLES.get(path)
+        if bundle is None:
+            if not os.path.exists(path):
+                return None
+            bundle = _BUNDLES[path] = SnapshotBundle(path)
+        if bundle.content_hash == attendu:
+            return bundle
+        if (path not in _REBUILDS and _REBUILT.get(path) != attendu
+                and os.environ.get(BUNDLE_REBUILD_ENV, '1') != '0'):
+            _REBUILDS.add(path)
+            _REBUILT[path] = attendu
+            threading.Thread(target=_rebuild, args=(path,), name='bundle', daemon=True).start()
+        return None
+
+
+def _rebuild(path):
+    try:
+        bake(path)
+    finally:
+        # Rouvert au prochain appel (nouveau fichier s'il a été écrit)
+        with _BUNDLES_LOCK:
+            _BUNDLES.pop(path, None)
+            _REBUILDS.discard(path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle précalculé du dashboard défense Israël")
+    parser.add_argument('-o', '--output', default=os.environ.get(BUNDLE_ENV, BUNDLE_PATH))
+    parser.add_argument('--check', action='store_true', help="Vérifie seulement que le bundle est à jour")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.check:
+        from data_sources import source_from_env
+        if not os.path.exists(args.output):
+            print(f"Aucun bundle : {args.output}", file=sys.stderr)
+            return 1
+        a_jour = SnapshotBundle(args.output).content_hash == content_hash(source_from_env())
+        print(f"{args.output} : {'à jour' if a_jour else 'périmé'}")
+        return 0 if a_jour else 1
+
+    debut = time.perf_counter()
+    entrees, ignorees = bake(args.output, lambda i, n: print(f"\r[bake] {i}/{n} combinaisons", end='', file=sys.stderr))
+    print(f"\n[bake] {entrees} entrées ({ignorees} sections ignorées), "
+          f"{os.path.getsize(args.output) / 2**20:.1f} Mo en {time.perf_counter() - debut:.1f}s -> {args.output}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
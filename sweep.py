@@ -0,0 +1,187 @@
+# sweep.py
+"""Balayage parallèle sélections x scénarios x grille de paramètres.
+
+Chaque combinaison est évaluée (séries déterministes + bandes Monte Carlo)
+dans un pool de processus, par paquets, puis l'ensemble est écrit dans un
+unique fichier colonnaire (``.npz`` ou ``.parquet``).
+
+    python sweep.py -o sweep.npz --budget-scale 0.8 1.0 1.2 --workers 8
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from defense_core import DefenseIsraelModel
+from scenario_engine import SCENARIOS, ScenarioEngine
+from simulation_engine import SimulationEngine, config_defaults
+
+ANNEES = list(range(2000, 2028))
+
+# Paramètres de configuration balayables -> option CLI
+PARAMETRES_GRILLE = {
+    'budget_base': '--budget-scale',
+    'personnel_base': '--personnel-scale',
+    'exercices_base': '--exercices-scale',
+}
+
+PERCENTILES = (5, 50, 95)
+
+
+def build_grid(configs, scenarios, echelles):
+    """Combinaisons ``(selection, scenario, facteurs, config)`` à évaluer.
+
+    ``configs`` associe chaque sélection à sa configuration ; ``echelles``
+    associe un paramètre de configuration à ses facteurs multiplicatifs.
+    """
+    defaults = config_defaults()
+    parametres = list(echelles)
+    combos = []
+    for selection, config in configs.items():
+        for scenario in scenarios:
+            for facteurs in itertools.product(*(echelles[p] for p in parametres)):
+                cfg = dict(config)
+                for parametre, facteur in zip(parametres, facteurs):
+                    cfg[parametre] = cfg.get(parametre, defaults[parametre]) * facteur
+                combos.append({
+                    'run_id': len(combos),
+                    'selection': selection,
+                    'scenario': scenario,
+                    'facteurs': dict(zip(parametres, facteurs)),
+                    'config': cfg,
+                })
+    return combos
+
+
+def _evaluate_chunk(chunk, annees, n_trajectories, seed):
+    """Évalue un paquet de combinaisons (exécuté dans un processus du pool)"""
+    engine = SimulationEngine()
+    # Même graine pour toutes les combinaisons : nombres aléatoires communs
+    scenario_engine = ScenarioEngine(n_trajectories=n_trajectories, seed=seed)
+    lignes = []
+    for combo in chunk:
+        store = engine.run(annees, combo['config'])
+        t = store.index
+        bands = scenario_engine.bands(t, combo['config'], combo['scenario'], PERCENTILES)
+        colonnes = dict(store.items())
+        for nom in bands.columns.drop('Annee'):
+            colonnes[f'MC_{nom}'] = bands[nom].to_numpy()
+        lignes.append((combo, t, colonnes))
+    return lignes
+
+
+def _chunks(combos, chunksize):
+    for debut in range(0, len(combos), chunksize):
+        yield combos[debut:debut + chunksize]
+
+
+def run_sweep(combos, annees=ANNEES, workers=None, chunksize=None,
+              n_trajectories=2_000, seed=2027, progress=None):
+    """Évalue toutes les combinaisons et retourne un dict colonne -> tableau.
+
+    Le tableau de sortie a une ligne par (combinaison, année), triée par
+    ``run_id`` ; les séries absentes d'une sélection valent NaN.
+    """
+    workers = workers or os.cpu_count() or 1
+    # ~4 paquets par processus pour lisser la charge sans multiplier les échanges
+    chunksize = chunksize or max(1, len(combos) // (workers * 4))
+    paquets = list(_chunks(combos, chunksize))
+
+    resultats = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_evaluate_chunk, paquet, annees, n_trajectories, seed) for paquet in paquets]
+        for termines, future in enumerate(as_completed(futures), start=1):
+            resultats.extend(future.result())
+            if progress is not None:
+                progress(termines, len(paquets))
+
+    resultats.sort(key=lambda ligne: ligne[0]['run_id'])
+    return _to_columns(resultats)
+
+
+def _to_columns(resultats):
+    """Assemble les résultats par combinaison en colonnes contiguës"""
+    n_annees = len(resultats[0][1]) if resultats else 0
+    n_lignes = len(resultats) * n_annees
+    series = list(dict.fromkeys(nom for _, _, colonnes in resultats for nom in colonnes))
+    parametres = list(dict.fromkeys(p for combo, _, _ in resultats for p in combo['facteurs']))
+
+    sortie = {
+        'run_id': np.repeat([combo['run_id'] for combo, _, _ in resultats], n_annees),
+        'selection': np.repeat([combo['selection'] for combo, _, _ in resultats], n_annees),
+        'scenario': np.repeat([combo['scenario'] for combo, _, _ in resultats], n_annees),
+    }
+    for parametre in parametres:
+        sortie[f'echelle_{parametre}'] = np.repeat(
+            [combo['facteurs'].get(parametre, 1.0) for combo, _, _ in resultats], n_annees)
+    sortie['Annee'] = np.concatenate([t for _, t, _ in resultats]) if resultats else np.empty(0)
+    for nom in series:
+        colonne = np.full(n_lignes, np.nan)
+        for i, (_, _, colonnes) in enumerate(resultats):
+            if nom in colonnes:
+                colonne[i * n_annees:(i + 1) * n_annees] = colonnes[nom]
+        sortie[nom] = colonne
+    return sortie
+
+
+def save_results(colonnes, path):
+    """Écrit les colonnes en ``.npz`` (NumPy) ou ``.parquet`` (pyarrow requis)"""
+    if path.endswith('.parquet'):
+        import pandas as pd
+        pd.DataFrame(colonnes).to_parquet(path, index=False)
+    else:
+        np.savez_compressed(path, **colonnes)
+
+
+class ProgressReporter:
+    """Affiche l'avancement du balayage (paquets terminés) sur stderr"""
+
+    def __init__(self, stream=sys.stderr):
+        self.stream = stream
+        self.debut = time.perf_counter()
+
+    def __call__(self, termines, total):
+        ecoule = time.perf_counter() - self.debut
+        print(f"\r[sweep] {termines}/{total} paquets ({100 * termines / total:.0f}%) - {ecoule:.1f}s",
+              end='\n' if termines == total else '', file=self.stream, flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage parallèle des scénarios de défense")
+    parser.add_argument('-o', '--output', default='sweep.npz', help="Fichier de sortie (.npz ou .parquet)")
+    parser.add_argument('--selections', nargs='*', help="Sélections (défaut : toutes)")
+    parser.add_argument('--scenarios', nargs='*', default=list(SCENARIOS), help="Scénarios (défaut : tous)")
+    for parametre, option in PARAMETRES_GRILLE.items():
+        parser.add_argument(option, nargs='+', type=float, default=[1.0],
+                            help=f"Facteurs multiplicatifs de {parametre}")
+    parser.add_argument('--workers', type=int, default=None, help="Processus (défaut : nombre de coeurs)")
+    parser.add_argument('--chunksize', type=int, default=None, help="Combinaisons par paquet")
+    parser.add_argument('--trajectories', type=int, default=2_000, help="Trajectoires Monte Carlo par combinaison")
+    parser.add_argument('--seed', type=int, default=2027)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    model = DefenseIsraelModel()
+    selections = args.selections or list(dict.fromkeys(
+        model.branches_options + model.programmes_options + ["Scénarios Sécuritaires"]))
+    configs = {selection: model.get_advanced_config(selection) for selection in selections}
+    echelles = {parametre: getattr(args, option.lstrip('-').replace('-', '_'))
+                for parametre, option in PARAMETRES_GRILLE.items()}
+
+    combos = build_grid(configs, args.scenarios, echelles)
+    print(f"[sweep] {len(combos)} combinaisons, {len(ANNEES)} années", file=sys.stderr)
+    colonnes = run_sweep(combos, workers=args.workers, chunksize=args.chunksize,
+                         n_trajectories=args.trajectories, seed=args.seed,
+                         progress=ProgressReporter())
+    save_results(colonnes, args.output)
+    print(f"[sweep] {len(colonnes['run_id'])} lignes écrites dans {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# templates.py
+"""Gabarits HTML des cartes du dashboard, compilés une fois par processus.
+
+Un gabarit est normalisé à la compilation (indentation et lignes vides
+retirées : le markdown de Streamlit ne le prend plus pour un bloc de code)
+et ses champs ``str.format`` sont analysés une fois. Une carte statique est
+servie telle quelle ; une liste de cartes est rendue en un seul bloc (un
+élément et un message au lieu d'un par ligne).
+"""
+import html
+import string
+import threading
+import textwrap
+
+_FORMATTER = string.Formatter()
+
+
+def compact(source):
+    """HTML sans indentation ni lignes vides"""
+    lignes = (ligne.strip() for ligne in textwrap.dedent(source).splitlines())
+    return '\n'.join(ligne for ligne in lignes if ligne)
+
+
+def _escape(valeur):
+    return html.escape(valeur) if isinstance(valeur, str) else valeur
+
+
+class CardTemplate:
+    """Gabarit compilé : ``render`` formate une carte, ``render_many`` une liste.
+
+    Les valeurs texte sont échappées ; les nombres gardent leur format
+    (``{:.1f}``, ``{:,.0f}``...).
+    """
+
+    def __init__(self, source):
+        self.source = compact(source)
+        self.fields = [champ for _, champ, _, _ in _FORMATTER.parse(self.source) if champ is not None]
+
+    @property
+    def static(self):
+        return not self.fields
+
+    def render(self, *args, **kwargs):
+        if self.static:
+            return self.source
+        return self.source.format(*map(_escape, args), **{cle: _escape(v) for cle, v in kwargs.items()})
+
+    def render_many(self, lignes, wrapper=None):
+        """Cartes de ``lignes`` (dicts) en un bloc, dans ``wrapper`` (gabarit à un champ ``{}``)"""
+        bloc = '\n'.join(self.render(**ligne) for ligne in lignes)
+        if wrapper is not None:
+            bloc = card(wrapper).source.format(bloc)
+        return bloc
+
+
+_TEMPLATES = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def card(source):
+    """Gabarit compilé de ``source`` (une compilation par texte et par processus)"""
+    gabarit = _TEMPLATES.get(source)
+    if gabarit is None:
+        with _TEMPLATES_LOCK:
+            gabarit = _TEMPLATES.setdefault(source, CardTemplate(source))
+    return gabarit
@@ -0,0 +1,78 @@
+# timeseries_store.py
+"""Stockage colonnaire des séries simulées.
+
+Un bloc float préalloué (ordre Fortran : une colonne contiguë par série)
+indexé par un axe temporel fixe. Les simulateurs écrivent en place dans
+leur colonne ; les vues NumPy/pandas sont fournies sans copie.
+"""
+import numpy as np
+import pandas as pd
+
+
+class TimeSeriesStore:
+    """Bloc ``(T, K)`` à axe temporel fixe et registre de colonnes"""
+
+    def __init__(self, index, columns, dtype=np.float64, index_name='Annee'):
+        index = np.ascontiguousarray(index, dtype=np.float64)
+        if index.ndim != 1:
+            raise ValueError("L'axe temporel doit être unidimensionnel")
+        if index.size > 1 and not np.all(np.diff(index) > 0):
+            raise ValueError("L'axe temporel doit être strictement croissant")
+        index.flags.writeable = False
+
+        self.index = index
+        self.index_name = index_name
+        self.dtype = np.dtype(dtype)
+        self._registry = {nom: j for j, nom in enumerate(columns)}
+        if len(self._registry) != len(columns):
+            raise ValueError("Noms de colonnes dupliqués")
+        self._block = np.full((index.shape[0], len(self._registry)), np.nan, dtype=self.dtype, order='F')
+
+    def __len__(self):
+        return self.index.shape[0]
+
+    def __contains__(self, nom):
+        return nom in self._registry
+
+    @property
+    def columns(self):
+        return list(self._registry)
+
+    @property
+    def nbytes(self):
+        return self._block.nbytes + self.index.nbytes
+
+    def column(self, nom):
+        """Vue modifiable d'une colonne, pour écriture en place par un simulateur"""
+        return self._block[:, self._registry[nom]]
+
+    def write(self, nom, valeurs):
+        """Écrit une série complète après contrôle de sa longueur sur l'axe"""
+        valeurs = np.asarray(valeurs)
+        if valeurs.ndim != 0 and valeurs.shape != self.index.shape:
+            raise ValueError(f"Série '{nom}' de forme {valeurs.shape}, "
+                             f"attendu {self.index.shape} (axe {self.index_name})")
+        self.column(nom)[:] = valeurs
+
+    def __getitem__(self, nom):
+        """Vue en lecture seule d'une colonne"""
+        vue = self.column(nom).view()
+        vue.flags.writeable = False
+        return vue
+
+    def items(self):
+        for nom in self._registry:
+            yield nom, self[nom]
+
+    def to_numpy(self):
+        """Bloc ``(T, K)`` complet, sans copie"""
+        return self._block
+
+    def to_frame(self):
+        """DataFrame partageant la mémoire du bloc (axe temporel en première colonne)"""
+        df = pd.DataFrame(self._block, columns=self.columns, copy=False)
+        axe = self.index
+        if np.all(axe == np.round(axe)):
+            axe = axe.astype(np.int64)
+        df.insert(0, self.index_name, axe)
+        return df